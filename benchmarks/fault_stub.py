@@ -0,0 +1,103 @@
+"""
+Local stand-in for the Watson file host that injects faults: 429s with
+Retry-After (at random, or whenever the request rate exceeds ``capacity``),
+500s, stalled responses (to trip read timeouts) and dropped connections, plus
+genuine 404s for players without Watson data.
+"""
+import collections
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class FaultStub:
+    def __init__(self, triplets, *, p_throttle=0.0, p_error=0.0, p_stall=0.0, p_drop=0.0,
+                 stall_seconds=2.0, capacity: float = None, missing=(), seed=0):
+        self.files = {}
+        for player_id, proj, clf, meta in triplets:
+            self.files[f"projections_{player_id}"] = json.dumps(proj).encode()
+            self.files[f"classifiers_{player_id}"] = json.dumps(clf).encode()
+            self.files[f"players_{player_id}"] = json.dumps(meta).encode()
+        self.missing = {str(m) for m in missing}
+        self.faults = [("throttle", p_throttle), ("error", p_error), ("stall", p_stall), ("drop", p_drop)]
+        self.stall_seconds = stall_seconds
+        self.capacity = capacity
+        self._recent = collections.deque()
+        self.counts = {"requests": 0, "throttle": 0, "error": 0, "stall": 0, "drop": 0, "missing": 0, "ok": 0}
+        self._rnd = random.Random(seed)
+        self._lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                stub._serve(self)
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.base_url = f"http://127.0.0.1:{self.server.server_port}"
+
+    def _fault(self):
+        with self._lock:
+            self.counts["requests"] += 1
+            roll = self._rnd.random()
+            if self.capacity is not None:
+                now = time.monotonic()
+                self._recent.append(now)
+                while self._recent[0] < now - 1:
+                    self._recent.popleft()
+                if len(self._recent) > self.capacity:
+                    return "throttle"
+        for name, p in self.faults:
+            if roll < p:
+                return name
+            roll -= p
+        return None
+
+    def _record(self, name):
+        with self._lock:
+            self.counts[name] += 1
+
+    def _send(self, handler, status, body=b"", headers=None):
+        handler.send_response(status)
+        for key, value in (headers or {}).items():
+            handler.send_header(key, value)
+        handler.send_header("Content-Length", str(len(body)))
+        try:
+            handler.end_headers()
+            handler.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # the client timed out on a stalled response
+
+    def _serve(self, handler):
+        # /{projections|classifiers|players}/{kind}_{player_id}_ESPNFantasyFootball_{season}.json
+        name = handler.path.rsplit("/", 1)[-1]
+        kind, player_id = name.split("_")[:2]
+        fault = self._fault()
+        if fault:
+            self._record(fault)
+        if fault == "throttle":
+            return self._send(handler, 429, headers={"Retry-After": "0.05"})
+        if fault == "error":
+            return self._send(handler, 500)
+        if fault == "stall":
+            time.sleep(self.stall_seconds)
+        if fault == "drop":
+            handler.close_connection = True
+            handler.connection.close()
+            return
+        body = self.files.get(f"{kind}_{player_id}")
+        if body is None or player_id in self.missing:
+            self._record("missing")
+            return self._send(handler, 404)
+        self._record("ok")
+        self._send(handler, 200, body, {"Content-Type": "application/json"})
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
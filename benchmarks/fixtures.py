@@ -0,0 +1,242 @@
+"""
+Benchmark fixtures: one week of kona_player_info pages (plus the schedule and
+positional ratings views) and a season of Watson triplets.
+
+``python -m benchmarks.fixtures`` regenerates the committed fixtures from a fixed
+seed; ``python -m benchmarks.fixtures record`` captures live ESPN/Watson
+responses instead (needs network), with league-private fields stripped.
+``python -m benchmarks.fixtures recorded`` writes the recorded fixtures from the
+ESPN data the pump already stored in this repository: the rows of one raw week
+snapshot, and Watson triplets rebuilt from a season of the Watson table (one
+projection and one classifier item per model type for every stored row, stamped at
+the SET_END it was matched to; flattened, they give back every stored value).
+``benchmarks.run --fixtures recorded`` uses them.
+"""
+import datetime
+import gzip
+import json
+import os
+import random
+import sys
+
+FIXTURE_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+KONA_FIXTURE = "kona_week.json.gz"
+WATSON_FIXTURE = "watson_triplets.json.gz"
+RECORDED_WEEK_FIXTURE = "recorded_week.json.gz"
+RECORDED_WATSON_FIXTURE = "recorded_watson_triplets.json.gz"
+
+SEASON = 2024
+WEEK = 5
+N_PLAYERS = 1100
+N_WATSON_PLAYERS = 300
+SEED = 2024
+
+# eligibleSlots per position, as ESPN lists them
+_SLOTS = {
+    "QB": [0, 7, 20, 21], "RB": [2, 3, 23, 7, 20, 21], "WR": [3, 4, 5, 23, 7, 20, 21],
+    "TE": [5, 6, 23, 7, 20, 21], "K": [17, 20, 21], "D/ST": [16, 20, 21],
+}
+_STAT_IDS = ["0", "1", "3", "4", "20", "23", "24", "25", "41", "42", "43", "58", "60", "61", "155", "156", "210", "213"]
+_CLASSIFIERS = ["breakout_classifier", "bust_classifier", "play_with_injury_classifier", "play_without_injury_classifier"]
+
+
+def load_fixture(name: str):
+    with gzip.open(os.path.join(FIXTURE_DIR, name), "rt") as file:
+        return json.load(file)
+
+
+def _save_fixture(name: str, data):
+    os.makedirs(FIXTURE_DIR, exist_ok=True)
+    with gzip.open(os.path.join(FIXTURE_DIR, name), "wt", compresslevel=9) as file:
+        json.dump(data, file, separators=(",", ":"))
+
+
+def _stat_line(rnd, season, period, source, pos):
+    stats = {k: round(rnd.random() * 50, 2) for k in rnd.sample(_STAT_IDS, 8)}
+    if pos in ("RB", "WR", "TE"):
+        stats["53"] = float(rnd.randint(0, 10))
+    return {
+        "seasonId": season, "scoringPeriodId": period, "statSourceId": source, "statSplitTypeId": 1 if period else 0,
+        "proTeamId": rnd.randint(1, 30), "stats": stats,
+        "appliedTotal": round(rnd.random() * 30, 2), "appliedAverage": round(rnd.random() * 20, 2),
+    }
+
+
+def _kona_player(rnd, pid, season, week):
+    pos = rnd.choice(list(_SLOTS))
+    stats = [_stat_line(rnd, season, period, source, pos) for period in (0, week) for source in (0, 1)]
+    stats.append({"seasonId": season - 1, "scoringPeriodId": 0, "statSourceId": 0, "statSplitTypeId": 0, "stats": {}})
+    player = {
+        "id": pid, "fullName": f"Player {pid}", "proTeamId": rnd.randint(0, 30), "defaultPositionId": 1,
+        "eligibleSlots": _SLOTS[pos], "injuryStatus": "ACTIVE", "injured": False,
+        "ownership": {"percentOwned": rnd.random() * 100, "percentStarted": rnd.random() * 100,
+                      "averageDraftPosition": rnd.random() * 200},
+        "draftRanksByRankType": {"PPR": {"rank": rnd.randint(1, 500)},
+                                 "STANDARD": {"rank": rnd.randint(1, 500), "auctionValue": rnd.randint(0, 60)}},
+        "stats": stats,
+    }
+    return {"id": pid, "onTeamId": 0, "status": "FREEAGENT", "player": player}
+
+
+def synthetic_kona_week(season: int = SEASON, week: int = WEEK, n_players: int = N_PLAYERS, seed: int = SEED) -> dict:
+    rnd = random.Random(seed)
+    teams = [{"id": 0}] + [
+        {"id": t, "proGamesByScoringPeriod": {str(w): [{"homeProTeamId": t, "awayProTeamId": t % 30 + 1, "date": 1726000000000 + w * 604800000}]
+                                              for w in range(1, 19)}}
+        for t in range(1, 31)
+    ]
+    return {
+        "season": season,
+        "week": week,
+        "players": [_kona_player(rnd, 3000000 + i, season, week) for i in range(n_players)],
+        "pro_schedule": {"settings": {"proTeams": teams}},
+        "positional_ratings": {"positionAgainstOpponent": {"positionalRatings": {
+            str(p): {"ratingsByOpponent": {str(t): {"rank": rnd.randint(1, 32)} for t in range(1, 31)}} for p in range(1, 7)
+        }}},
+    }
+
+
+def _ts(season, week, day):
+    stamp = datetime.datetime(season, 9, 3) + datetime.timedelta(days=(week - 1) * 7 + day)
+    return stamp.strftime("%Y-%m-%d %H:%M:%S.%f")
+
+
+def synthetic_watson_triplets(season: int = SEASON, n_players: int = N_WATSON_PLAYERS, seed: int = SEED) -> list:
+    rnd = random.Random(seed + 1)
+    triplets = []
+    for i in range(n_players):
+        proj, clf, meta = [], [], []
+        for week in range(1, 18):
+            for day in (0, 3):
+                proj.append({"DATA_TIMESTAMP": _ts(season, week, day), "MODEL_TYPE": "point_projection",
+                             "SCORE_PROJECTION": round(rnd.random() * 25, 3), "DISTRIBUTION_NAME": "normal",
+                             "LOW_SCORE": round(rnd.random() * 5, 3), "HIGH_SCORE": round(20 + rnd.random() * 10, 3),
+                             "SIMULATION_PROJECTION": round(rnd.random() * 25, 3)})
+                for model_type in _CLASSIFIERS:
+                    clf.append({"DATA_TIMESTAMP": _ts(season, week, day), "MODEL_TYPE": model_type,
+                                "NORMALIZED_RESULT": round(rnd.random(), 4)})
+            meta.append({"SET_END": _ts(season, week, 6), "DATA_TIMESTAMP": _ts(season, week, 5), "EVENT_WEEK": week,
+                         "ACTUAL": round(rnd.random() * 30, 2), "OPPONENT_NAME": "Opponent", "OPPOSITION_RANK": rnd.randint(1, 32),
+                         "FULL_NAME": f"Player {i}", "POSITION": rnd.choice(["QB", "RB", "WR", "TE"]),
+                         "IS_ON_INJURED_RESERVE": "0", "IS_SUSPENDED": "0", "IS_ON_BYE": "0", "IS_FREE_AGENT": "0",
+                         "CURRENT_RANK": rnd.randint(1, 300), "INJURY_STATUS_DATE": None})
+        triplets.append([3000000 + i, proj, clf, meta])
+    return triplets
+
+
+# League-private values a capture must not carry: auth cookies, and who rosters whom in the league it was made with
+_PRIVATE_KEYS = {"swid", "espn_s2", "cookies", "members", "owners", "onteamid", "rostered", "lineuplocked"}
+
+
+def _strip_private(obj):
+    if isinstance(obj, dict):
+        return {k: _strip_private(v) for k, v in obj.items() if k.lower() not in _PRIVATE_KEYS}
+    if isinstance(obj, list):
+        return [_strip_private(v) for v in obj]
+    return obj
+
+
+def recorded_week(raw_root: str = "./raw", season: int = SEASON, week: int = WEEK) -> list:
+    """The rows of one stored raw projections week, as ESPN's pages were flattened when it was fetched"""
+    from src.snapshots import find_snapshot, get_snapshot_records
+
+    path = find_snapshot(f"{raw_root}/football/nfl/projections/{season}/{week}/")
+    if path is None:
+        raise FileNotFoundError(f"No raw snapshot of {season} week {week} under {raw_root}")
+    return get_snapshot_records(path)
+
+
+def recorded_watson_triplets(processed_root: str = "./processed", season: int = SEASON) -> list:
+    """Watson triplets rebuilt from a season of the stored Watson table (see the module docstring)"""
+    from src.schemas import WATSON_TABLE
+    from src.utils import get_dataframe, get_dataset, is_pandas_none
+
+    root = f"{processed_root}/football/nfl/watson"
+    legacy = f"{root}/{season}.parquet"
+    df = get_dataframe(legacy) if os.path.exists(legacy) else get_dataset(root, filters=[("season", "=", season)], table=WATSON_TABLE)
+    df = df.astype(object).where(df.notna(), None).sort_values(["player_id", "week"], kind="mergesort")
+
+    def value(row, column):
+        return None if is_pandas_none(row.get(column)) else row[column]
+
+    triplets = []
+    for player_id, rows in df.groupby("player_id", sort=False):
+        proj, clf, meta = [], [], []
+        for row in rows.to_dict("records"):
+            stamp = f"{row['set_end']} 00:00:00.000000"
+            meta.append({
+                "SET_END": stamp, "DATA_TIMESTAMP": row["data_timestamp"], "EVENT_WEEK": int(row["week"]),
+                "ACTUAL": value(row, "actual_points"), "OPPONENT_NAME": value(row, "opponent_name"),
+                "OPPOSITION_RANK": value(row, "opposition_rank"), "FULL_NAME": value(row, "full_name"),
+                "POSITION": value(row, "position"), "IS_ON_INJURED_RESERVE": value(row, "is_on_injured_reserve"),
+                "IS_SUSPENDED": value(row, "is_suspended"), "IS_ON_BYE": value(row, "is_on_bye"),
+                "IS_FREE_AGENT": value(row, "is_free_agent"), "CURRENT_RANK": value(row, "current_rank"),
+                "INJURY_STATUS_DATE": value(row, "injury_status_date"),
+            })
+            if value(row, "projection_score") is not None:
+                proj.append({
+                    "DATA_TIMESTAMP": stamp, "MODEL_TYPE": value(row, "projection_model_type"),
+                    "SCORE_PROJECTION": row["projection_score"], "DISTRIBUTION_NAME": value(row, "projection_distribution_name"),
+                    "LOW_SCORE": value(row, "projection_low_score"), "HIGH_SCORE": value(row, "projection_high_score"),
+                    "SIMULATION_PROJECTION": value(row, "projection_simulation_projection"),
+                })
+            for model_type, column in zip(_CLASSIFIERS, ["breakout_likelihood", "bust_likelihood", "play_with_injury_likelihood",
+                                                          "play_without_injury_likelihood"]):
+                if value(row, column) is not None:
+                    clf.append({"DATA_TIMESTAMP": stamp, "MODEL_TYPE": model_type, "NORMALIZED_RESULT": row[column]})
+        triplets.append([int(player_id), proj, clf, meta])
+    return triplets
+
+
+def record_kona_week(league_id: int = 2127, season: int = SEASON, week: int = WEEK) -> dict:
+    """Capture one real week of kona pages and the views the row path needs"""
+    from concurrent.futures import ThreadPoolExecutor
+
+    from src.fantasy_utils import (
+        _get_positional_ratings, _get_pro_schedule_data, _iter_kona_pages, build_espn_request, build_espn_session,
+    )
+
+    espn_request = build_espn_request(league_id, season)
+    session = build_espn_session(1)
+    players = []
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        for batch in _iter_kona_pages(espn_request, session, week, 250, pool):
+            players.extend(batch)
+    ratings = _get_positional_ratings(espn_request, session, week)
+    return _strip_private({
+        "season": season,
+        "week": week,
+        "players": players,
+        "pro_schedule": _get_pro_schedule_data(espn_request, session),
+        "positional_ratings": {"positionAgainstOpponent": {"positionalRatings": {
+            pos: {"ratingsByOpponent": {team: {"rank": rank} for team, rank in teams.items()}} for pos, teams in ratings.items()
+        }}},
+    })
+
+
+def record_watson_triplets(player_ids, season: int = SEASON) -> list:
+    """Capture real Watson triplets for ``player_ids``"""
+    from src.watson_fantasy import fetch_watson_triplets
+
+    pairs = [(season, player_id) for player_id in player_ids]
+    return [[player_id, proj, clf, meta] for _, player_id, (proj, clf, meta) in fetch_watson_triplets(pairs)]
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "recorded":
+        week_rows = recorded_week()
+        triplets = recorded_watson_triplets()
+        _save_fixture(RECORDED_WEEK_FIXTURE, _strip_private(week_rows))
+        _save_fixture(RECORDED_WATSON_FIXTURE, triplets)
+        print(f"[Bench] Wrote {len(week_rows)} recorded week rows and {len(triplets)} recorded Watson triplets → {FIXTURE_DIR}")
+        sys.exit(0)
+    if len(sys.argv) > 1 and sys.argv[1] == "record":
+        kona = record_kona_week()
+        ranked = sorted(kona["players"], key=lambda p: p["player"].get("draftRanksByRankType", {}).get("STANDARD", {}).get("rank", 3000))
+        watson = record_watson_triplets([p["id"] for p in ranked[:N_WATSON_PLAYERS]])
+    else:
+        kona = synthetic_kona_week()
+        watson = synthetic_watson_triplets()
+    _save_fixture(KONA_FIXTURE, kona)
+    _save_fixture(WATSON_FIXTURE, watson)
+    print(f"[Bench] Wrote {len(kona['players'])} kona players and {len(watson)} Watson triplets → {FIXTURE_DIR}")
@@ -0,0 +1,140 @@
+"""
+Cost of resuming a killed Watson season run against the share of it that was left.
+
+    python -m benchmarks.resume [--points N] [--output PATH]
+
+The fixture season's players are served by the local Watson stub (every player gets one of
+the recorded triplets). Each trial kills a run right after its k-th checkpointed batch
+and resumes it with an empty HTTP cache, so only the checkpoint carries work over; the resumed
+run's wall time and Watson requests are set against the share of players it had left and
+against an uninterrupted run. Resume cost should track the remaining share, not the season.
+"""
+import argparse
+import contextlib
+import datetime
+import io
+import json
+import os
+import platform
+import tempfile
+import time
+
+import numpy as np
+
+from .fault_stub import FaultStub
+from .fixtures import WATSON_FIXTURE, load_fixture
+from .run import RESULTS_DIR, _git_commit, _season_frame
+
+DEFAULT_POINTS = 5
+
+
+class _Killed(Exception):
+    pass
+
+
+class _OffSeasonLeague:
+    """Stands in for ESPN's league status call, the one request the stub does not serve"""
+
+    def __init__(self, *args):
+        pass
+
+    def is_active(self):
+        return False
+
+
+def _run_season(workdir: str, proj_df, season: int, base_url: str, kill_after: int = None, checkpoints: bool = True):
+    """One Watson season run in ``workdir`` (its own processed tables, manifests and HTTP cache)"""
+    import src.watson_pump as watson_pump
+    from espn_api_orm.consts import ESPNSportLeagueTypes
+
+    from src.checkpoint import Checkpoint
+    from src.http_cache import ResponseCache
+
+    class KilledCheckpoint(Checkpoint):
+        def save(self, *args, **kwargs):
+            super().save(*args, **kwargs)
+            if kill_after is not None and self.batches >= kill_after:
+                raise _Killed()
+
+    watson_pump.ESPNLeagueAPI = _OffSeasonLeague
+    watson_pump.Checkpoint = KilledCheckpoint
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            pump = watson_pump.WatsonPump(
+                ESPNSportLeagueTypes.FOOTBALL_NFL, "./processed", ResponseCache(tempfile.mkdtemp(dir=workdir)),
+                checkpoint_root="./checkpoints" if checkpoints else None, base_url=base_url,
+            )
+            try:
+                pump.run_season(season, proj_df)
+            finally:
+                pump.session.close()
+    finally:
+        os.chdir(cwd)
+
+
+def run_trials(points: int = DEFAULT_POINTS) -> dict:
+    from src.watson_fantasy import WatsonMissIndex, select_watson_player_ids
+    from src.watson_pump import FLATTEN_BATCH
+
+    proj_df = _season_frame()
+    season = int(proj_df.season.iloc[0])
+    # a first run probes the whole population (see select_watson_player_ids); serve all of it
+    no_misses = WatsonMissIndex(os.path.join(tempfile.mkdtemp(), "misses.json"), season, season)
+    player_ids = list(select_watson_player_ids(proj_df, misses=no_misses))
+    triplets = load_fixture(WATSON_FIXTURE)
+    stub = FaultStub([[player_id] + triplets[i % len(triplets)][1:] for i, player_id in enumerate(player_ids)])
+    batches = -(-len(player_ids) // FLATTEN_BATCH)
+
+    def timed_run(workdir, **kwargs):
+        requests = stub.counts["requests"]
+        start = time.perf_counter()
+        _run_season(workdir, proj_df, season, stub.base_url, **kwargs)
+        return time.perf_counter() - start, stub.counts["requests"] - requests
+
+    full_s, full_requests = timed_run(tempfile.mkdtemp(), checkpoints=False)
+    print(f"[Bench] resume: {len(player_ids)} players in {batches} batches, uninterrupted run {full_s:.2f}s, {full_requests} requests")
+
+    trials = []
+    for kill_after in sorted({int(k) for k in np.linspace(0, batches - 1, points)}):
+        workdir = tempfile.mkdtemp()
+        if kill_after:
+            try:
+                _run_season(workdir, proj_df, season, stub.base_url, kill_after=kill_after)
+            except _Killed:
+                pass
+        resume_s, requests = timed_run(workdir)
+        remaining = 1 - min(kill_after * FLATTEN_BATCH, len(player_ids)) / len(player_ids)
+        trials.append({
+            "killed_after_batches": kill_after,
+            "remaining_share": round(remaining, 3),
+            "resume_s": round(resume_s, 3),
+            "resume_share": round(resume_s / full_s, 3),
+            "requests": requests,
+        })
+        print(f"[Bench] resume after {kill_after} batches: {remaining:.0%} left → {resume_s:.2f}s "
+              f"({resume_s / full_s:.0%} of a full run), {requests} requests")
+    return {"players": len(player_ids), "batch": FLATTEN_BATCH, "full_s": round(full_s, 3),
+            "full_requests": full_requests, "trials": trials}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark resuming a killed Watson run")
+    parser.add_argument("--points", type=int, default=DEFAULT_POINTS, help="kill points, spread over the season's batches")
+    parser.add_argument("--output", help="results file (default: benchmarks/results/resume-<commit>.json)")
+    args = parser.parse_args()
+
+    results = run_trials(args.points)
+    commit = _git_commit()
+    output = args.output or os.path.join(RESULTS_DIR, f"resume-{commit}.json")
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w") as file:
+        json.dump({
+            "commit": commit,
+            "timestamp": datetime.datetime.now().isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            **results,
+        }, file, indent=2)
+    print(f"[Bench] Wrote {output}")
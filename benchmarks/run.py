@@ -0,0 +1,330 @@
+"""
+Benchmark the pump's hot paths against the committed fixtures.
+
+    python -m benchmarks.run [--only CASE ...] [--fixtures synthetic|recorded] [--repeat N] [--output PATH] [--compare PATH]
+
+Each case runs in its own process (so peak RSS is per case): one warm-up call,
+then ``repeat`` timed calls. Results go to benchmarks/results/<commit>.json
+(<commit>-recorded.json for the recorded fixtures). The recorded fixtures hold
+rows, not kona pages, so the page-parsing cases only run on the synthetic ones.
+"""
+import argparse
+import contextlib
+import datetime
+import io
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import subprocess
+import tempfile
+import time
+import types
+
+import numpy as np
+
+from .fixtures import KONA_FIXTURE, RECORDED_WATSON_FIXTURE, RECORDED_WEEK_FIXTURE, WATSON_FIXTURE, load_fixture
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+DEFAULT_REPEAT = 20
+FIXTURE_SETS = ("synthetic", "recorded")
+KONA_CASES = {"process_week_data_rows", "process_week_data_frame"}  # need kona pages: synthetic only
+
+_fixture_set = "synthetic"
+
+
+class FixtureResponse:
+    def __init__(self, content: bytes, url: str):
+        self.status_code = 200
+        self.content = content
+        self.headers = {}
+        self.url = url
+
+    def json(self):
+        return json.loads(self.content)
+
+
+class FixtureSession:
+    """Stands in for the ESPN session under ``_league_get``: serves the recorded views and kona pages"""
+
+    def __init__(self, kona: dict):
+        self.kona = kona
+        self.views = {
+            "proTeamSchedules_wl": json.dumps(kona["pro_schedule"]).encode(),
+            "mPositionalRatings": json.dumps(kona["positional_ratings"]).encode(),
+        }
+        self.pages = {}
+
+    def get(self, url, params=None, headers=None, cookies=None, timeout=None):
+        view = (params or {}).get("view")
+        if view != "kona_player_info":
+            return FixtureResponse(self.views[view], url)
+        page = json.loads(headers["x-fantasy-filter"])["players"]
+        key = (page["offset"], page["limit"])
+        if key not in self.pages:
+            players = self.kona["players"][page["offset"]:page["offset"] + page["limit"]]
+            self.pages[key] = json.dumps({"players": players}).encode()
+        return FixtureResponse(self.pages[key], url)
+
+    def close(self):
+        pass
+
+
+def _week_frame():
+    import pandas as pd
+
+    from src.fantasy_utils import flatten_week_payloads
+
+    if _fixture_set == "recorded":
+        return pd.DataFrame(load_fixture(RECORDED_WEEK_FIXTURE))
+    kona = load_fixture(KONA_FIXTURE)
+    return flatten_week_payloads(kona["players"], kona["season"], kona["week"], last_updated="2024-10-01T00:00:00")
+
+
+def _season_frame():
+    import pandas as pd
+
+    week_df = _week_frame()
+    return pd.concat([week_df.assign(week=week) for week in range(1, 19)], ignore_index=True)
+
+
+def _watson_triplets():
+    return load_fixture(RECORDED_WATSON_FIXTURE if _fixture_set == "recorded" else WATSON_FIXTURE)
+
+
+def _process_week(as_frame: bool):
+    def setup():
+        from concurrent.futures import ThreadPoolExecutor
+
+        from src.consts import LEAGUE_ID
+        from src.fantasy_utils import build_espn_request, process_week_data
+
+        kona = load_fixture(KONA_FIXTURE)
+        session = FixtureSession(kona)
+        league = types.SimpleNamespace(espn_request=build_espn_request(LEAGUE_ID, kona["season"]))
+        pool = ThreadPoolExecutor(max_workers=1)
+
+        def run():
+            process_week_data(
+                LEAGUE_ID, kona["season"], kona["week"], league=league, session=session, pool=pool,
+                pro_schedule_data=kona["pro_schedule"], as_frame=as_frame,
+            )
+        return run, len(kona["players"])
+    return setup
+
+
+def _flatten_watson_each():
+    from src.watson_fantasy import flatten_watson_triplet
+
+    # one as-of join per player; a slice keeps the suite quick
+    triplets = _watson_triplets()[:30]
+    return lambda: [flatten_watson_triplet(*t) for t in triplets], len(triplets)
+
+
+def _flatten_watson_batch():
+    from src.watson_fantasy import flatten_watson_triplets
+
+    triplets = _watson_triplets()
+    return lambda: flatten_watson_triplets(triplets), len(triplets)
+
+
+def _flatten_watson_since():
+    from src.watson_fantasy import WatsonWatermarks, flatten_watson_triplets
+
+    # a daily refresh: watermarks as of a week before the season's last meta row, then the whole season flattened from them
+    triplets = _watson_triplets()
+    cut = max(m["DATA_TIMESTAMP"] for _, _, _, meta in triplets for m in meta)
+    cut = str(np.datetime64(cut[:10]) - np.timedelta64(7, "D"))
+    earlier = [
+        (player_id, [p for p in proj if p["DATA_TIMESTAMP"][:10] <= cut], [c for c in clf if c["DATA_TIMESTAMP"][:10] <= cut],
+         [m for m in meta if m["DATA_TIMESTAMP"][:10] <= cut])
+        for player_id, proj, clf, meta in triplets
+    ]
+    watermarks = WatsonWatermarks(os.path.join(tempfile.mkdtemp(), "watermarks.json"))
+    watermarks.advance(earlier)
+    watermarks.commit()
+    return lambda: flatten_watson_triplets(triplets, since=watermarks.since(triplets)), len(triplets)
+
+
+def _select_watson_players():
+    from src.watson_fantasy import select_watson_player_ids
+
+    proj_df = _season_frame()
+    return lambda: select_watson_player_ids(proj_df), len(proj_df)
+
+
+def _dataframe_round_trip():
+    from src.utils import get_dataframe, put_dataframe
+
+    df = _season_frame()
+    path = os.path.join(tempfile.mkdtemp(), "season.parquet")
+
+    def run():
+        put_dataframe(df.copy(), path)
+        get_dataframe(path)
+    return run, len(df)
+
+
+def _dataset_round_trip():
+    from src.utils import get_dataset, put_dataset
+
+    df = _season_frame()
+    root = tempfile.mkdtemp()
+
+    def run():
+        put_dataset(df, root, table="projections")
+        get_dataset(root, filters=[("season", "=", int(df.season.iloc[0]))], table="projections")
+    return run, len(df)
+
+
+def _projections_upsert():
+    from src.manifest import upsert_partition
+
+    week_df = _week_frame()
+    updates = week_df.copy()
+    changed = np.arange(len(updates)) % 20 == 0
+    updates.loc[changed, "projected_points"] = updates.loc[changed, "projected_points"].fillna(0) + 1
+    partition = {"season": int(week_df.season.iloc[0]), "week": int(week_df.week.iloc[0])}
+    return lambda: upsert_partition(week_df, updates, partition, keys=["season", "week", "player_id"]), len(week_df)
+
+
+def _watson_merge():
+    import pandas as pd
+
+    from src.watson_fantasy import flatten_watson_triplets
+
+    season_df = pd.DataFrame(flatten_watson_triplets(_watson_triplets())).assign(season=2024)
+    stored_df = season_df[season_df.week <= 12]
+    new_df = season_df[season_df.week >= 10]
+
+    def run():
+        pd.concat([stored_df, new_df], ignore_index=True).drop_duplicates(subset=["season", "week", "player_id"], keep="last")
+    return run, len(season_df)
+
+
+def _watson_fetch_faults():
+    from src.watson_fantasy import build_watson_transport, fetch_watson_triplets
+
+    from .fault_stub import FaultStub
+
+    # 1 in 10 requests faulted: throttled, 500, dropped or stalled past the read timeout
+    triplets = _watson_triplets()[:50]
+    stub = FaultStub(triplets, p_throttle=0.03, p_error=0.04, p_drop=0.02, p_stall=0.01, stall_seconds=1.5)
+    pairs = [(2024, t[0]) for t in triplets]
+
+    def run():
+        fetched = list(fetch_watson_triplets(pairs, session=build_watson_transport(8), base_url=stub.base_url,
+                                             max_workers=8, timeout=(1, 1)))
+        if len(fetched) != len(pairs):
+            raise RuntimeError(f"{len(pairs) - len(fetched)} players lost to injected faults")
+    return run, len(pairs)
+
+
+CASES = {
+    "process_week_data_rows": _process_week(as_frame=False),
+    "process_week_data_frame": _process_week(as_frame=True),
+    "flatten_watson_triplet": _flatten_watson_each,
+    "flatten_watson_triplets": _flatten_watson_batch,
+    "flatten_watson_since": _flatten_watson_since,
+    "select_watson_player_ids": _select_watson_players,
+    "dataframe_round_trip": _dataframe_round_trip,
+    "dataset_round_trip": _dataset_round_trip,
+    "projections_upsert": _projections_upsert,
+    "watson_merge": _watson_merge,
+    "watson_fetch_faults": _watson_fetch_faults,
+}
+
+
+def _run_case(name: str, repeat: int, queue, fixture_set: str = "synthetic"):
+    global _fixture_set
+    _fixture_set = fixture_set
+    with contextlib.redirect_stdout(io.StringIO()):
+        run, items = CASES[name]()
+        run()  # warm-up
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            run()
+            timings.append(time.perf_counter() - start)
+    timings = np.asarray(timings)
+    queue.put({
+        "iterations": repeat,
+        "items": items,
+        "p50_ms": round(float(np.percentile(timings, 50)) * 1000, 3),
+        "p95_ms": round(float(np.percentile(timings, 95)) * 1000, 3),
+        "mean_ms": round(float(timings.mean()) * 1000, 3),
+        "throughput_per_s": round(items / float(np.percentile(timings, 50)), 1),
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    })
+
+
+def run_benchmarks(cases=None, repeat: int = DEFAULT_REPEAT, fixture_set: str = "synthetic") -> dict:
+    ctx = multiprocessing.get_context("spawn")
+    results = {}
+    for name in cases or CASES:
+        if fixture_set != "synthetic" and name in KONA_CASES:
+            print(f"[Bench] {name}: skipped, the {fixture_set} fixtures have no kona pages")
+            continue
+        queue = ctx.Queue()
+        process = ctx.Process(target=_run_case, args=(name, repeat, queue, fixture_set))
+        process.start()
+        process.join()
+        if process.exitcode != 0:
+            raise RuntimeError(f"Benchmark case {name} failed (exit code {process.exitcode})")
+        results[name] = queue.get()
+        print(f"[Bench] {name}: p50={results[name]['p50_ms']}ms p95={results[name]['p95_ms']}ms "
+              f"{results[name]['throughput_per_s']}/s rss={results[name]['peak_rss_mb']}MB")
+    return results
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short=12", "HEAD"], text=True, stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def _compare(results: dict, baseline_path: str):
+    with open(baseline_path, "r") as file:
+        baseline = json.load(file)
+    for name, result in results.items():
+        base = baseline["cases"].get(name)
+        if base:
+            print(f"[Bench] {name}: p50 {base['p50_ms']}ms → {result['p50_ms']}ms ({result['p50_ms'] / base['p50_ms']:.2f}x)")
+
+
+if __name__ == "__main__":
+    import pandas as pd
+    import pyarrow as pa
+
+    parser = argparse.ArgumentParser(description="Benchmark the pump's hot paths")
+    parser.add_argument("--only", nargs="+", choices=list(CASES), help="cases to run (default: all)")
+    parser.add_argument("--fixtures", choices=FIXTURE_SETS, default="synthetic",
+                        help="synthetic (seeded, default) or recorded (from the repository's stored ESPN data)")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="timed calls per case")
+    parser.add_argument("--output", help="results file (default: benchmarks/results/<commit>.json)")
+    parser.add_argument("--compare", help="earlier results file to compare p50 against")
+    args = parser.parse_args()
+
+    commit = _git_commit()
+    report = {
+        "commit": commit,
+        "timestamp": datetime.datetime.now().isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "pandas": pd.__version__,
+        "pyarrow": pa.__version__,
+        "repeat": args.repeat,
+        "fixtures": args.fixtures,
+        "cases": run_benchmarks(args.only, args.repeat, args.fixtures),
+    }
+    suffix = "" if args.fixtures == "synthetic" else f"-{args.fixtures}"
+    output = args.output or os.path.join(RESULTS_DIR, f"{commit}{suffix}.json")
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w") as file:
+        json.dump(report, file, indent=2)
+    print(f"[Bench] Wrote {output}")
+    if args.compare:
+        _compare(report["cases"], args.compare)
@@ -0,0 +1,81 @@
+"""
+Cold-start time of the CLI's commands that fetch nothing.
+
+    python -m benchmarks.startup [--repeat N] [--output PATH]
+
+Every call is a fresh interpreter run from the repo root, so imports are paid each time
+(the OS file cache stays warm after the first call). ``import_pump`` is the cost of
+importing the pump itself, which every command that runs it pays before its first request.
+``dry-run`` reads the cached season calendar; without one it is fetched first.
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+from .run import RESULTS_DIR, _git_commit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_REPEAT = 10
+BUDGET_S = 1.0  # non-fetching commands must answer within this
+
+COMMANDS = {
+    "help": ["fantasy_pump.py", "--help"],
+    "status": ["fantasy_pump.py", "status"],
+    "dry_run": ["fantasy_pump.py", "dry-run"],
+    "import_pump": ["-c", "import src.orchestrator"],
+}
+BUDGETED = ("help", "status", "dry_run")
+
+
+def time_command(args, repeat: int) -> dict:
+    timings = []
+    for _ in range(repeat + 1):  # the first call warms the OS file cache and is dropped
+        start = time.perf_counter()
+        subprocess.run([sys.executable, *args], cwd=ROOT, check=True, stdout=subprocess.DEVNULL)
+        timings.append(time.perf_counter() - start)
+    timings = np.asarray(timings[1:])
+    return {
+        "iterations": repeat,
+        "p50_ms": round(float(np.percentile(timings, 50)) * 1000, 1),
+        "p95_ms": round(float(np.percentile(timings, 95)) * 1000, 1),
+        "max_ms": round(float(timings.max()) * 1000, 1),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark CLI cold start")
+    parser.add_argument("--only", nargs="+", choices=list(COMMANDS), help="commands to time (default: all)")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="timed runs per command")
+    parser.add_argument("--output", help="results file (default: benchmarks/results/startup-<commit>.json)")
+    args = parser.parse_args()
+
+    results = {}
+    for name in args.only or COMMANDS:
+        results[name] = time_command(COMMANDS[name], args.repeat)
+        print(f"[Bench] startup {name}: p50={results[name]['p50_ms']}ms p95={results[name]['p95_ms']}ms")
+
+    commit = _git_commit()
+    output = args.output or os.path.join(RESULTS_DIR, f"startup-{commit}.json")
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w") as file:
+        json.dump({
+            "commit": commit,
+            "timestamp": datetime.datetime.now().isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "budget_ms": BUDGET_S * 1000,
+            "commands": results,
+        }, file, indent=2)
+    print(f"[Bench] Wrote {output}")
+
+    over = [name for name in BUDGETED if name in results and results[name]["p95_ms"] > BUDGET_S * 1000]
+    if over:
+        print(f"[Bench] Over the {BUDGET_S:.0f}s startup budget: {', '.join(over)}")
+        sys.exit(1)
@@ -0,0 +1,154 @@
+import argparse
+
+from espn_api_orm.consts import ESPNSportLeagueTypes
+
+from src.plan import PROJECTIONS_STAGE, PUMP_STAGES, WATSON_STAGE
+
+# One entry point for the pump. Each command imports what it needs when it runs, so
+# `status` and `dry-run` answer from local files in a fraction of a second, without
+# pandas/pyarrow, espn_api or any request (`dry-run` reports the current season's weeks
+# as unknown until a run has cached its calendar):
+#   python fantasy_pump.py run [--only projections|watson ...] [--distributions] [--fresh]   (projections → Watson)
+#   python fantasy_pump.py projections [--fresh]
+#   python fantasy_pump.py watson [--distributions] [--fresh]
+#   python fantasy_pump.py migrate                               (legacy season files → partitioned tables, offline)
+#   python fantasy_pump.py rebuild [season ...]                  (processed projections from raw, offline)
+#   python fantasy_pump.py features [--full]                     (projection features from processed, offline)
+#   python fantasy_pump.py join [--full]                         (projections ⋈ Watson from processed, offline)
+#   python fantasy_pump.py status
+#   python fantasy_pump.py dry-run [--only projections|watson ...]
+
+SPORT_LEAGUES = [
+    ESPNSportLeagueTypes.FOOTBALL_NFL,
+    # add others as you enable them
+]
+
+
+def run(args, stages):
+    from src.orchestrator import run_pump
+
+    for sport_league in args.sport_leagues:
+        run_pump(sport_league, stages=stages, watson_distributions=getattr(args, "distributions", False), resume=not args.fresh)
+
+
+def migrate(args):
+    from src.utils import migrate_processed_tables
+
+    for sport_league in args.sport_leagues:
+        migrated = migrate_processed_tables(sport_league)
+        print(f"[Dataset] {sport_league.value}: {migrated} legacy season files migrated")
+
+
+def rebuild(args):
+    import time
+
+    from src.rebuild import REBUILD_MAX_WORKERS, rebuild_projections
+    from src.utils import migrate_processed_tables
+
+    for sport_league in args.sport_leagues:
+        migrate_processed_tables(sport_league)
+        sport_str, league_str = sport_league.value.split("/")
+        raw_proj_path = f"./raw/{sport_str}/{league_str}/projections/"
+        processed_proj_path = f"./processed/{sport_str}/{league_str}/projections/"
+
+        start = time.perf_counter()
+        report = rebuild_projections(raw_proj_path, processed_proj_path, args.seasons or None, max_workers=REBUILD_MAX_WORKERS)
+        total_rows = sum(r["rows"] for r in report.values())
+        print(f"[Rebuild] {sport_league.value}: {len(report)} seasons, {total_rows} rows in {time.perf_counter() - start:.1f}s → {processed_proj_path}")
+
+
+def features(args):
+    from src.features import get_features_path, update_features
+
+    for sport_league in args.sport_leagues:
+        stats = update_features(sport_league, full=args.full)
+        print(f"[Features] {sport_league.value}: {stats['weeks']} weeks ({stats['rows']} rows) written, "
+              f"{stats['dropped']} dropped → {get_features_path(sport_league)}")
+
+
+def join(args):
+    from src.joined import get_joined_path, update_joined
+
+    for sport_league in args.sport_leagues:
+        stats = update_joined(sport_league, full=args.full)
+        print(f"[Joined] {sport_league.value}: {stats['weeks']} weeks ({stats['rows']} rows) written, "
+              f"{stats['dropped']} dropped → {get_joined_path(sport_league)}")
+
+
+def status(args):
+    from src.plan import format_weeks, pump_status
+
+    for sport_league in args.sport_leagues:
+        state = pump_status(sport_league)
+        print(f"[Status] {sport_league.value} (current season {state['current_season']}, changelog seq {state['changelog_seq']})")
+        print(f"  {'season':>6}  {'raw':<8} {'projections':<12} {'digests':<8} {'watson':<12} {'misses':>6} {'marks':>6}")
+        for season, s in state["seasons"].items():
+            projections = "legacy" if s["projections_legacy"] else format_weeks(s["projections_weeks"])
+            watson = "legacy" if s["watson_legacy"] else format_weeks(s["watson_weeks"])
+            print(f"  {season:>6}  {format_weeks(s['raw_weeks']):<8} {projections:<12} "
+                  f"{format_weeks(s['manifest_weeks']):<8} {watson:<12} {s['watson_misses']:>6} {s['watson_watermarks']:>6}")
+        for runner, report in state["reports"].items():
+            print(f"  last {runner} run: finished {report['finished_at']} in {report['wall_s']}s, {report['requests']} requests")
+
+
+def dry_run(args):
+    from src.plan import format_weeks, plan_run
+
+    for sport_league in args.sport_leagues:
+        plans = plan_run(sport_league, stages=args.only or PUMP_STAGES)
+        for season, plan in plans.get(PROJECTIONS_STAGE, {}).items():
+            weeks = "weeks unknown (no cached season calendar)" if plan["unknown"] else f"weeks {format_weeks(plan['weeks'])}"
+            print(f"[Plan] {sport_league.value} projections {season}: fetch {weeks}")
+        for season, plan in plans.get(WATSON_STAGE, {}).items():
+            if plan["unknown"]:
+                kept = "stored weeks to keep unknown (no cached season calendar)"
+            elif plan["keep_through_week"] is None:
+                kept = "keep every stored week"
+            else:
+                kept = f"keep stored weeks ≤ {plan['keep_through_week']}"
+            print(f"[Plan] {sport_league.value} watson {season}: refetch selected players (flatten what changed since their watermarks), {kept}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog="fantasy-pump", description="Fantasy data pump")
+    parser.add_argument("--sport-league", action="append", choices=[s.value for s in SPORT_LEAGUES],
+                        help="e.g. football/nfl (repeatable; default: all enabled)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="projections → Watson in one process")
+    run_parser.add_argument("--only", nargs="+", choices=list(PUMP_STAGES), help="stages to run (default: all)")
+    run_parser.set_defaults(func=lambda args: run(args, args.only or PUMP_STAGES))
+    projections_parser = commands.add_parser("projections", help="ESPN projections only")
+    projections_parser.set_defaults(func=lambda args: run(args, [PROJECTIONS_STAGE]))
+    watson_parser = commands.add_parser("watson", help="Watson only, players picked from stored projections")
+    watson_parser.set_defaults(func=lambda args: run(args, [WATSON_STAGE]))
+    for stage_parser in (run_parser, watson_parser):
+        stage_parser.add_argument("--distributions", action="store_true",
+                                  help="also keep Watson score distributions (processed/.../watson_distributions/)")
+    for stage_parser in (run_parser, projections_parser, watson_parser):
+        stage_parser.add_argument("--fresh", action="store_true",
+                                  help="start over: discard checkpoints of a killed run (.cache/checkpoints/) and Watson watermarks")
+
+    commands.add_parser("migrate", help="convert legacy {season}.parquet tables to the partitioned layout (no network)").set_defaults(func=migrate)
+
+    rebuild_parser = commands.add_parser("rebuild", help="rebuild processed projections from the raw snapshots (no network)")
+    rebuild_parser.add_argument("seasons", type=int, nargs="*", help="seasons to rebuild (default: all)")
+    rebuild_parser.set_defaults(func=rebuild)
+
+    features_parser = commands.add_parser("features", help="update the projection features from processed projections (no network)")
+    features_parser.add_argument("--full", action="store_true", help="recompute every season")
+    features_parser.set_defaults(func=features)
+
+    join_parser = commands.add_parser("join", help="update the projections ⋈ Watson table from processed tables (no network)")
+    join_parser.add_argument("--full", action="store_true", help="rejoin every week")
+    join_parser.set_defaults(func=join)
+
+    commands.add_parser("status", help="what is stored, from local files and manifests only").set_defaults(func=status)
+
+    dry_run_parser = commands.add_parser("dry-run", help="seasons and weeks a run would refresh, from local files only (no requests)")
+    dry_run_parser.add_argument("--only", nargs="+", choices=list(PUMP_STAGES), help="stages to plan (default: all)")
+    dry_run_parser.set_defaults(func=dry_run)
+
+    args = parser.parse_args()
+    args.sport_leagues = [ESPNSportLeagueTypes(s) for s in args.sport_league] if args.sport_league else SPORT_LEAGUES
+    args.func(args)
@@ -0,0 +1,62 @@
+import argparse
+
+import pandas as pd
+from espn_api_orm.consts import ESPNSportLeagueTypes
+
+from src.changelog import changes_since, get_changelog_path
+from src.query import ProcessedQuery
+from src.schemas import JOINED_TABLE, PROJECTIONS_TABLE, WATSON_TABLE
+
+# Lookups over the processed tables that read only the partition files and columns they need:
+#   python fantasy_query.py player 4362628 [--seasons 2023 2024] [--columns projected_points points]
+#   python fantasy_query.py leaderboard 2024 10 --position WR [-n 24] [--by projected_points]
+#   python fantasy_query.py as-of 2024 10 [--players 4362628 3117251]
+#   python fantasy_query.py changes [--since 41]   (changelog rows of the runs after 41)
+#   (--table watson for the Watson table, --table projections_watson for the two joined, --csv for CSV output)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Query processed fantasy data")
+    parser.add_argument("--table", choices=[PROJECTIONS_TABLE, WATSON_TABLE, JOINED_TABLE], default=PROJECTIONS_TABLE)
+    parser.add_argument("--sport-league", default=ESPNSportLeagueTypes.FOOTBALL_NFL.value, help="e.g. football/nfl")
+    parser.add_argument("--csv", action="store_true", help="print CSV instead of a table")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    player = commands.add_parser("player", help="one player's rows across seasons")
+    player.add_argument("player_id", type=int)
+    player.add_argument("--seasons", type=int, nargs="+")
+    player.add_argument("--columns", nargs="+")
+
+    leaderboard = commands.add_parser("leaderboard", help="top players of a week")
+    leaderboard.add_argument("season", type=int)
+    leaderboard.add_argument("week", type=int)
+    leaderboard.add_argument("--position")
+    leaderboard.add_argument("-n", type=int, default=24)
+    leaderboard.add_argument("--by", help="column to rank by (default: projected points)")
+    leaderboard.add_argument("--columns", nargs="+")
+
+    as_of = commands.add_parser("as-of", help="each player's latest row at or before a week")
+    as_of.add_argument("season", type=int)
+    as_of.add_argument("week", type=int)
+    as_of.add_argument("--players", type=int, nargs="+")
+    as_of.add_argument("--columns", nargs="+")
+
+    changes = commands.add_parser("changes", help="rows inserted/updated/deleted by the runs after --since")
+    changes.add_argument("--since", type=int, default=0, help="last run sequence number already applied")
+
+    args = parser.parse_args()
+    if args.command == "changes":
+        df = changes_since(get_changelog_path(ESPNSportLeagueTypes(args.sport_league)), args.since, tables=[args.table])
+    else:
+        query = ProcessedQuery(f"./processed/{args.sport_league}/{args.table}/", args.table)
+        if args.command == "player":
+            df = query.player_history(args.player_id, seasons=args.seasons, columns=args.columns)
+        elif args.command == "leaderboard":
+            df = query.week_leaderboard(args.season, args.week, position=args.position, n=args.n, by=args.by, columns=args.columns)
+        else:
+            df = query.as_of(args.season, args.week, player_ids=args.players, columns=args.columns)
+
+    if args.csv:
+        print(df.to_csv(index=False), end="")
+    else:
+        with pd.option_context("display.max_rows", None, "display.width", 200):
+            print(df.to_string(index=False))
@@ -0,0 +1,21 @@
+import sys
+from espn_api_orm.consts import ESPNSportLeagueTypes
+
+from src.snapshots import DEFAULT_SNAPSHOT_FORMAT, migrate_snapshots
+
+# One-shot conversion of raw weekly snapshots (players.json) to a compact format:
+#   python fantasy_runner_migrate_raw.py [ndjson.zst|arrow|json]
+
+if __name__ == "__main__":
+    root_path = "./raw"
+    fmt = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_SNAPSHOT_FORMAT
+    sport_league_pairs = [
+        ESPNSportLeagueTypes.FOOTBALL_NFL,
+    ]
+
+    for sport_league in sport_league_pairs:
+        raw_proj_path = f"{root_path}/{sport_league.value}/projections/"
+        stats = migrate_snapshots(raw_proj_path, fmt)
+        before_mb, after_mb = stats["bytes_before"] / 1024 ** 2, stats["bytes_after"] / 1024 ** 2
+        ratio = stats["bytes_before"] / stats["bytes_after"] if stats["bytes_after"] else 0
+        print(f"[Snapshots] {sport_league.value}: migrated {stats['weeks']} weeks to {fmt}: {before_mb:.1f} MB → {after_mb:.1f} MB ({ratio:.1f}x)")
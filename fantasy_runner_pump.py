@@ -0,0 +1,21 @@
+import argparse
+
+from espn_api_orm.consts import ESPNSportLeagueTypes
+
+from src.orchestrator import PUMP_STAGES, run_pump
+
+# Projections → Watson in one process; Watson starts on a season as soon as its projections are in:
+#   python fantasy_runner_pump.py [--only projections|watson ...]
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the fantasy data pump")
+    parser.add_argument("--only", nargs="+", choices=list(PUMP_STAGES), help="stages to run (default: all)")
+    args = parser.parse_args()
+
+    sport_league_pairs = [
+        ESPNSportLeagueTypes.FOOTBALL_NFL,
+        # add others as you enable them
+    ]
+
+    for sport_league in sport_league_pairs:
+        run_pump(sport_league, stages=args.only or PUMP_STAGES)
@@ -0,0 +1,11 @@
+import argparse
+import sys
+
+from fantasy_pump import SPORT_LEAGUES, rebuild
+
+# Offline rebuild of processed projections from the raw week snapshots (no network);
+# the same as `python fantasy_pump.py rebuild [season ...]`:
+#   python fantasy_runner_rebuild.py [season ...]
+
+if __name__ == "__main__":
+    rebuild(argparse.Namespace(sport_leagues=SPORT_LEAGUES, seasons=[int(s) for s in sys.argv[1:]]))
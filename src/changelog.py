@@ -0,0 +1,126 @@
+import datetime
+import threading
+from typing import Iterable, Optional
+
+import pandas as pd
+import pyarrow.compute as pc
+
+from .layout import get_dataset_partitions, get_manifest_path, load_manifest
+from .manifest import save_manifest
+from .telemetry import count
+from .utils import get_dataset, put_dataset
+
+CHANGELOG_PARTITION_COLS = ("seq",)
+CHANGELOG_KEYS = ["season", "week", "player_id"]
+CHANGELOG_COLUMNS = ["seq", "table", "op", "season", "week", "player_id", "columns"]
+
+
+def get_changelog_path(sport_league, root_path: str = "./processed") -> str:
+    """
+    Changelog of a sport/league's processed tables, next to them, e.g.
+    ./processed/football/nfl/changelog/seq=42/part-0.parquet.
+    """
+    sport_str, league_str = sport_league.value.split("/")
+    return f"{root_path}/{sport_str}/{league_str}/changelog/"
+
+
+def latest_sequence(root: str) -> int:
+    """Highest run sequence number in a changelog (0 if it is empty)"""
+    return max((p["seq"] for p in get_dataset_partitions(root, CHANGELOG_PARTITION_COLS)), default=0)
+
+
+class Changelog:
+    """
+    Change-data-capture for one pump run. Writers ``record`` the keys each partition write
+    inserted, updated or deleted (with the columns an update changed); ``commit`` stores them
+    all as the run's partition under the next sequence number. A run that changed nothing
+    writes nothing and takes no number, so sequence numbers are increasing but not dense.
+    """
+
+    def __init__(self, sport_league, processed_root: str = "./processed", manifest_root: str = "./manifests"):
+        self.root = get_changelog_path(sport_league, processed_root)
+        self.manifest_path = get_manifest_path(sport_league, "changelog", manifest_root)
+        self._frames = []
+        self._lock = threading.Lock()
+
+    def record(self, table: str, changes: pd.DataFrame):
+        """Add one partition write's changes (``src.manifest.partition_changes`` output) for ``table``"""
+        if changes.empty:
+            return
+        with self._lock:
+            self._frames.append(changes.assign(table=table))
+
+    def commit(self) -> Optional[int]:
+        """
+        Write everything recorded as one changelog partition.
+
+        Returns:
+            Optional[int]: The run's sequence number, or None if nothing changed.
+        """
+        with self._lock:
+            frames, self._frames = self._frames, []
+        if not frames:
+            return None
+        manifest = load_manifest(self.manifest_path)
+        # the manifest keeps numbers increasing even if old partitions are pruned; the directory covers a lost manifest
+        seq = max(manifest.get("last_seq", 0), latest_sequence(self.root)) + 1
+        df = pd.concat(frames, ignore_index=True).assign(seq=seq)
+        for column in CHANGELOG_KEYS:
+            df[column] = pd.array(df[column], dtype="Int32")
+        df = df.sort_values(["table", *CHANGELOG_KEYS], kind="mergesort")[CHANGELOG_COLUMNS]
+        put_dataset(df, self.root, partition_cols=CHANGELOG_PARTITION_COLS)
+        manifest["last_seq"] = seq
+        manifest["committed_at"] = datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds")
+        save_manifest(self.manifest_path, manifest)
+        count("changelog.rows", len(df))
+        print(f"[Changelog] seq={seq}: {len(df)} changed rows ({', '.join(f'{op}={n}' for op, n in df['op'].value_counts().sort_index().items())}) → {self.root}seq={seq}/")
+        return seq
+
+
+def changes_since(root: str, since: int = 0, tables: Iterable[str] = None) -> pd.DataFrame:
+    """
+    Every change recorded after run ``since``, oldest first; reads only the newer partitions.
+
+    A consumer keeps the highest ``seq`` it has applied and asks for what came after it.
+    A key can appear in several runs; its last row is its current state.
+
+    Args:
+        root (str): Changelog root (``get_changelog_path``).
+        since (int): Last sequence number already applied (0 for everything).
+        tables (Iterable[str]): Only these tables (default is all).
+
+    Returns:
+        pd.DataFrame: seq, table, op, season, week, player_id, columns.
+    """
+    filters = [("seq", ">", since)]
+    if tables is not None:
+        filters.append(("table", "in", list(tables)))
+    df = get_dataset(root, filters=filters, partition_cols=CHANGELOG_PARTITION_COLS)
+    if df.shape[0] == 0:
+        return pd.DataFrame(columns=CHANGELOG_COLUMNS)
+    df["columns"] = [None if c is None else list(c) for c in df["columns"]]
+    return df[CHANGELOG_COLUMNS].sort_values(["seq", "table", *CHANGELOG_KEYS], kind="mergesort").reset_index(drop=True)
+
+
+def changed_rows(changes: pd.DataFrame, table_root: str, table: str) -> pd.DataFrame:
+    """
+    Current rows of the keys ``changes`` inserted or updated in ``table``, reading only the
+    (season, week) partitions they fall in. Deleted keys have no row.
+
+    Args:
+        changes (pd.DataFrame): Output of ``changes_since``.
+        table_root (str): The table's processed root, e.g. ./processed/football/nfl/projections/.
+        table (str): Schema registry table.
+
+    Returns:
+        pd.DataFrame: One row per changed key that still exists.
+    """
+    changes = changes[changes["table"] == table].drop_duplicates(CHANGELOG_KEYS, keep="last")
+    changes = changes[changes["op"] != "delete"]
+    frames = []
+    for (season, week), keys in changes.groupby(["season", "week"], dropna=False, sort=True):
+        week_filter = pc.field("week").is_null() if pd.isna(week) else pc.field("week") == int(week)
+        expression = (pc.field("season") == int(season)) & week_filter & pc.field("player_id").isin(keys["player_id"].astype(int).tolist())
+        frames.append(get_dataset(table_root, filters=expression, table=table))
+    frames = [f for f in frames if f.shape[0] != 0]
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
@@ -0,0 +1,112 @@
+import json
+import os
+import shutil
+import time
+from typing import Iterable, Iterator, Optional
+
+from .layout import load_manifest
+from .manifest import save_manifest
+
+# In-flight progress of the pumps, next to the HTTP cache (kept out of git, carried between CI jobs with it):
+#   ./.cache/checkpoints/football/nfl/watson/2024/cursor.json
+#   ./.cache/checkpoints/football/nfl/watson/2024/batch-00003.jsonl
+CHECKPOINT_DIR = "./.cache/checkpoints"
+# Age since the last saved batch after which a checkpoint is dropped. The pump runs once a day, so a killed
+# job is resumed by the next day's run (or a later one, if that is killed too); two days leave room for a late
+# or skipped run, while a checkpoint nothing has picked up for longer is from a plan that no longer holds
+CHECKPOINT_MAX_AGE_S = 2 * 24 * 60 * 60
+
+
+def _json_default(value):
+    # numpy scalars (ids picked from a frame) are stored as the Python numbers they hold
+    if hasattr(value, "item"):
+        return value.item()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+class Checkpoint:
+    """
+    Resumable progress of one runner over one season. ``save`` appends a batch of finished
+    keys (Watson player ids, projections weeks) with the rows they produced, if any; the rows
+    go to their own file and the cursor listing every finished key is rewritten after it,
+    both as temp file + rename, so a crash at any point leaves the last complete batch.
+    A restarted run skips ``done`` keys and takes their rows from ``rows``; ``state`` keeps
+    whatever a runner needs to check a key is still done (e.g. the file key of a written
+    partition). ``clear`` drops the checkpoint once the season's results are stored.
+
+    A checkpoint written with another ``fingerprint`` (e.g. Watson with/without distributions),
+    not saved to for ``max_age_s``, or opened with ``resume=False`` is discarded.
+    """
+
+    def __init__(self, sport_league, runner: str, season: int, root: str = CHECKPOINT_DIR,
+                 fingerprint: dict = None, resume: bool = True, max_age_s: float = CHECKPOINT_MAX_AGE_S):
+        self.path = f"{root}/{sport_league.value}/{runner}/{season}"
+        self.cursor_path = f"{self.path}/cursor.json"
+        self.fingerprint = fingerprint or {}
+        cursor = load_manifest(self.cursor_path)
+        saved_at = cursor.get("saved_at", cursor.get("started_at", 0))
+        stale = time.time() - saved_at > max_age_s or cursor.get("fingerprint") != self.fingerprint
+        if cursor and (stale or not resume):
+            self.clear()
+            cursor = {}
+        self.resumed = bool(cursor)
+        self.started_at = cursor.get("started_at", time.time())
+        self.batches = cursor.get("batches", 0)
+        self.done = set(cursor.get("done", []))
+        self.state = cursor.get("state", {})
+
+    def __len__(self):
+        return len(self.done)
+
+    def _batch_path(self, batch: int) -> str:
+        return f"{self.path}/batch-{batch:05d}.jsonl"
+
+    def save(self, keys: Iterable, rows: Optional[Iterable[dict]] = None, state: dict = None):
+        """
+        Record a finished batch.
+
+        Args:
+            keys (Iterable): Keys the batch finished.
+            rows (Optional[Iterable[dict]]): JSON-serializable rows the batch produced (None: the batch's
+                results are already stored elsewhere, e.g. a written partition).
+            state (dict): Entries to add to ``state`` (JSON-serializable).
+
+        Returns:
+            None
+        """
+        os.makedirs(self.path, exist_ok=True)
+        batch = self.batches + 1
+        if rows is not None:
+            path = self._batch_path(batch)
+            with open(f"{path}.tmp", "w") as file:
+                for row in rows:
+                    file.write(json.dumps(row, default=_json_default))
+                    file.write("\n")
+            os.replace(f"{path}.tmp", path)
+        self.done.update(_json_default(k) if hasattr(k, "item") else k for k in keys)
+        self.state.update(state or {})
+        save_manifest(self.cursor_path, {
+            "started_at": self.started_at,
+            "saved_at": time.time(),
+            "fingerprint": self.fingerprint,
+            "batches": batch,
+            "done": sorted(self.done),
+            "state": self.state,
+        })
+        self.batches = batch
+
+    def rows(self) -> Iterator[dict]:
+        """Rows of every batch the cursor covers, oldest first (a batch written after the cursor is ignored)"""
+        for batch in range(1, self.batches + 1):
+            path = self._batch_path(batch)
+            if not os.path.exists(path):
+                continue
+            with open(path, "r") as file:
+                for line in file:
+                    yield json.loads(line)
+
+    def clear(self):
+        shutil.rmtree(self.path, ignore_errors=True)
+        self.batches = 0
+        self.done = set()
+        self.state = {}
@@ -58,3 +58,12 @@ START_SEASONS = {
     ESPNSportLeagueTypes.SOCCER_ENG_1: 2003,
 }
 
+
+######################################
+# Fantasy Consts
+######################################
+
+# public league the projections are read through; SWID/ESPN_S2 are only needed for a private one
+LEAGUE_ID = 2127
+SWID = None
+ESPN_S2 = None
@@ -0,0 +1,147 @@
+import json
+import os
+from typing import Iterable, Optional, Tuple
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from .layout import HIVE_NULL_PARTITION
+from .telemetry import stage
+
+# Watson score distributions, kept out of the main Watson table in a side store next to it:
+#   {processed}/{sport}/{league}/watson_distributions/season=2024/week=5/part-0.arrow
+# One Arrow IPC file per week, uncompressed and in a single record batch, so a week is
+# memory-mapped and its distributions are one float32 buffer sliced by list offsets.
+DISTRIBUTIONS_DIR = "watson_distributions"
+DISTRIBUTIONS_FILE = "part-0.arrow"
+DISTRIBUTION_SCHEMA = pa.schema([
+    ("player_id", pa.int32()),
+    ("distribution", pa.list_(pa.float32())),
+])
+
+
+def get_distributions_path(root: str, season: int, week: Optional[int]) -> str:
+    week = HIVE_NULL_PARTITION if week is None else week
+    return f"{root.rstrip('/')}/season={season}/week={week}/{DISTRIBUTIONS_FILE}"
+
+
+def distribution_values(value) -> Optional[np.ndarray]:
+    """A Watson ``SCORE_DISTRIBUTION`` (list of numbers, or the same JSON-encoded) as float32, None if absent"""
+    if isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except ValueError:
+            return None
+    if not isinstance(value, (list, tuple)) or len(value) == 0:
+        return None
+    try:
+        return np.asarray(value, dtype=np.float32)
+    except (TypeError, ValueError):
+        return None
+
+
+def distribution_table(player_ids: Iterable[int], distributions: Iterable[np.ndarray]) -> pa.Table:
+    """
+    Build a week's table from parallel player ids and float32 arrays, sorted by player_id.
+
+    Args:
+        player_ids (Iterable[int]): ESPN player ids.
+        distributions (Iterable[np.ndarray]): One distribution per player.
+
+    Returns:
+        pa.Table: ``DISTRIBUTION_SCHEMA`` table in a single chunk.
+    """
+    player_ids = np.asarray(list(player_ids), dtype=np.int32)
+    distributions = list(distributions)
+    order = np.argsort(player_ids, kind="stable")
+    lengths = np.fromiter((len(distributions[i]) for i in order), dtype=np.int32, count=len(order))
+    offsets = np.zeros(len(order) + 1, dtype=np.int32)
+    np.cumsum(lengths, out=offsets[1:])
+    values = np.concatenate([distributions[i] for i in order]) if len(order) else np.array([], dtype=np.float32)
+    column = pa.ListArray.from_arrays(pa.array(offsets), pa.array(values.astype(np.float32, copy=False)))
+    return pa.Table.from_arrays([pa.array(player_ids[order]), column], schema=DISTRIBUTION_SCHEMA)
+
+
+def get_week_distributions(root: str, season: int, week: Optional[int]) -> Optional[pa.Table]:
+    """
+    Memory-map one week's distributions; nothing is copied or parsed until a buffer is touched.
+
+    Args:
+        root (str): Distribution store root.
+        season (int): Season.
+        week (Optional[int]): Week.
+
+    Returns:
+        Optional[pa.Table]: The week's table, or None if the week has none stored.
+    """
+    path = get_distributions_path(root, season, week)
+    if not os.path.exists(path):
+        return None
+    with pa.memory_map(path, "r") as source:
+        return pa.ipc.open_file(source).read_all()
+
+
+def distribution_arrays(table: pa.Table) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Zero-copy NumPy views of a week's table: player ids, list offsets and the flat values,
+    so player ``i``'s distribution is ``values[offsets[i]:offsets[i + 1]]``. When every
+    distribution has the same length ``k``, ``values.reshape(-1, k)`` is a player × bin matrix.
+
+    Args:
+        table (pa.Table): Table from ``get_week_distributions``.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray]: (player_ids, offsets, values).
+    """
+    if table.num_rows == 0:
+        return np.array([], dtype=np.int32), np.zeros(1, dtype=np.int32), np.array([], dtype=np.float32)
+    player_ids = table.column("player_id").chunk(0)
+    column = table.column("distribution").chunk(0)
+    offsets = column.offsets.to_numpy()
+    values = column.values.to_numpy()
+    return player_ids.to_numpy(), offsets, values
+
+
+def get_player_distribution(root: str, season: int, week: Optional[int], player_id: int) -> Optional[np.ndarray]:
+    """One player's distribution for a week (a view into the mapped file), None if not stored"""
+    table = get_week_distributions(root, season, week)
+    if table is None or table.num_rows == 0:
+        return None
+    player_ids, offsets, values = distribution_arrays(table)
+    i = np.searchsorted(player_ids, player_id)
+    if i == len(player_ids) or player_ids[i] != player_id:
+        return None
+    return values[offsets[i]:offsets[i + 1]]
+
+
+def put_week_distributions(root: str, season: int, week: Optional[int], table: pa.Table) -> bool:
+    """
+    Upsert a week's distributions: players in ``table`` replace their stored rows and stored
+    players missing from it are kept. The file is only rewritten when its contents change.
+
+    Args:
+        root (str): Distribution store root.
+        season (int): Season.
+        week (Optional[int]): Week.
+        table (pa.Table): New rows (``DISTRIBUTION_SCHEMA``).
+
+    Returns:
+        bool: True if the week's file was written.
+    """
+    with stage("io.put_distributions") as span:
+        stored = get_week_distributions(root, season, week)
+        if stored is not None and stored.num_rows != 0:
+            kept = stored.filter(pc.invert(pc.is_in(stored.column("player_id"), value_set=table.column("player_id").combine_chunks())))
+            merged = pa.concat_tables([kept, table])
+            table = merged.take(pc.sort_indices(merged, sort_keys=[("player_id", "ascending")])).combine_chunks()
+            if table.equals(stored):
+                return False
+        path = get_distributions_path(root, season, week)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with pa.OSFile(tmp_path, "wb") as sink, pa.ipc.new_file(sink, DISTRIBUTION_SCHEMA) as writer:
+            writer.write_table(table, max_chunksize=max(table.num_rows, 1))
+        os.replace(tmp_path, path)
+        span.rows = table.num_rows
+        return True
@@ -2,10 +2,22 @@ import datetime
 import json
 import os
 import pandas as pd
-from typing import Any, Dict, List
+from typing import Any, Callable, Dict, Iterator, List, Tuple
 import re
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import numpy as np
+from .http_cache import ResponseCache, TTL_IMMUTABLE, cached_get
+from .schemas import PROJECTIONS_TABLE, apply_schema
+from .telemetry import count, timed
+from .transport import Transport
 from .utils import put_json_file, get_dataframe, put_dataframe, camel_to_snake
 from espn_api.football import League, BoxPlayer
+from espn_api.football.constant import POSITION_MAP, PRO_TEAM_MAP, PLAYER_STATS_MAP
+from espn_api.requests.espn_requests import EspnFantasyRequests
 
 
 def flatten_player_payload(player, payload: Dict[str, Any], season: int, week: int) -> Dict[str, Any]:
@@ -75,66 +87,391 @@ def flatten_player_payload(player, payload: Dict[str, Any], season: int, week: i
 
     return row
 
-def process_week_data(league_id: int, season: int, week: int, swid=None, espn_s2=None,chunk: int = 250):
+_STAT_COLUMNS: Dict[str, Any] = {}
+
+
+def _stat_column(stat_id: str):
+    """Interned ESPN stat id -> snake_case column suffix (None for ids espn_api cannot name)"""
+    try:
+        return _STAT_COLUMNS[stat_id]
+    except KeyError:
+        name = PLAYER_STATS_MAP.get(int(stat_id), stat_id)
+        column = None if name.isdigit() else camel_to_snake(name)
+        _STAT_COLUMNS[stat_id] = column
+        return column
+
+
+def _player_position(eligible_slots, name: str) -> str:
+    """Mirrors ``Player``: the first eligible slot that is not a combo/rookie slot"""
+    for pos in eligible_slots:
+        if (pos != 25 and '/' not in POSITION_MAP[pos]) or '/' in name:
+            return POSITION_MAP[pos]
+    return ''
+
+
+class _ColumnBlock:
+    """Preallocated column arrays for a page of players; columns are allocated the first time a row sets them"""
+
+    def __init__(self, n: int):
+        self.n = n
+        self.columns: Dict[str, np.ndarray] = {}
+
+    def __call__(self, name: str, dtype=np.float64, fill=np.nan) -> np.ndarray:
+        col = self.columns.get(name)
+        if col is None:
+            col = np.full(self.n, fill, dtype=dtype)
+            self.columns[name] = col
+        return col
+
+    def to_frame(self, n_rows: int) -> pd.DataFrame:
+        return pd.DataFrame({name: col[:n_rows] for name, col in self.columns.items()})
+
+
+def _write_breakdown(col: _ColumnBlock, i: int, prefix: str, breakdown: Dict[str, Any]):
+    """Writes a raw stat id breakdown into ``{prefix}_*`` columns; returns the receptions value if present"""
+    receptions = None
+    for stat_id, v in breakdown.items():
+        k = _stat_column(stat_id)
+        if k is None:
+            continue
+        col(f"{prefix}_{k}")[i] = v
+        if k == 'receiving_receptions':
+            receptions = v
+    return receptions
+
+
+def flatten_week_payloads(players: List[Dict[str, Any]], season: int, week: int, seen_ids: set = None,
+                          last_updated: str = None) -> pd.DataFrame:
     """
-       Pull ALL players for a given season/week from ESPN's kona_player_info, paginating until exhausted.
-       Returns a list of flattened dict records (includes season, week, player_id).
-       """
-    print(f"[ESPN] Fetching season={season} week={week}")
+    Columnar equivalent of ``BoxPlayer`` + ``flatten_player_payload`` for a page of raw kona players.
+
+    Each payload is read once and values go straight into per-column arrays; stat ids are mapped to
+    column names through an interned table instead of running ``camel_to_snake`` per player. Columns
+    and values match the row path, and ``last_updated`` is stamped once per call.
+    """
+    seen_ids = set() if seen_ids is None else seen_ids
+    col = _ColumnBlock(len(players))
+    for name in ("season", "week", "player_id"):
+        col(name, np.int64, 0)
+    for name in ("name", "position", "team"):
+        col(name, object, None)
+    for name in ("percent_owned", "percent_started", "total_points", "projected_total_points", "avg_points", "projected_avg_points"):
+        col(name)
+    col("last_updated", object, last_updated or datetime.datetime.now().isoformat())
+
+    i = 0
+    for p in players:
+        player = p['playerPoolEntry']['player'] if 'playerPoolEntry' in p else p['player']
+        pid = p.get('id', player.get('id'))
+        if pid is None or pid in seen_ids:
+            continue
+        seen_ids.add(pid)
+
+        name = player.get('fullName') or ''
+        team = PRO_TEAM_MAP.get(player.get('proTeamId'), 'None')
+        team_resolved = False
+        week_actual = week_projected = total_actual = total_projected = None
+        for stat in player.get('stats', []):
+            scoring_period = stat.get('scoringPeriodId')
+            actual = stat.get('statSourceId') == 0
+            # BoxPlayer: the team on this week's actual stat line beats the current team
+            if not team_resolved and scoring_period == week and actual and stat.get('proTeamId', 0) != 0:
+                team = PRO_TEAM_MAP.get(stat['proTeamId'], team)
+                team_resolved = True
+            if stat.get('seasonId') != season or stat.get('statSplitTypeId') == 2:
+                continue
+            # Player: the last entry per (scoring period, actual/projected) wins
+            if scoring_period == week:
+                if actual:
+                    week_actual = stat
+                else:
+                    week_projected = stat
+            elif scoring_period == 0:
+                if actual:
+                    total_actual = stat
+                else:
+                    total_projected = stat
+
+        ownership = player.get('ownership', {})
+        col("season")[i] = season
+        col("week")[i] = week
+        col("player_id")[i] = pid
+        col("name")[i] = name
+        col("position")[i] = _player_position(player.get('eligibleSlots', []), name)
+        col("team")[i] = team
+        col("percent_owned")[i] = round(ownership.get('percentOwned', -1), 2)
+        col("percent_started")[i] = round(ownership.get('percentStarted', -1), 2)
+        col("total_points")[i] = round(total_actual.get('appliedTotal', 0), 2) if total_actual else 0
+        col("projected_total_points")[i] = round(total_projected.get('appliedTotal', 0), 2) if total_projected else 0
+        col("avg_points")[i] = round(total_actual.get('appliedAverage', 0), 2) if total_actual else 0
+        col("projected_avg_points")[i] = round(total_projected.get('appliedAverage', 0), 2) if total_projected else 0
+
+        # Actual stats
+        if week_actual is not None:
+            points = round(week_actual.get('appliedTotal', 0), 2)
+            col("points")[i] = points
+            col("avg_points_week")[i] = round(week_actual.get('appliedAverage', 0), 2)
+            receptions = _write_breakdown(col, i, "actual", week_actual.get('stats', {}))
+            if receptions is not None:
+                col("points")[i] = points + receptions*0.5 # Shift from 1/2 PPR to Full to match other stats
+
+        # Projected stats
+        if week_projected is not None:
+            projected_points = round(week_projected.get('appliedTotal', 0), 2)
+            col("projected_points")[i] = projected_points
+            receptions = _write_breakdown(col, i, "projected", week_projected.get('stats', {}))
+            if receptions is not None:
+                col("projected_points")[i] = projected_points + receptions*0.5 # Shift from 1/2 PPR to Full to match other stats
 
-    league = League(league_id=league_id, year=season, swid=swid, espn_s2=espn_s2)
+        ### inject additional player stats missed from box
+        try:
+            ppr_rank_data = p['player']['draftRanksByRankType']['PPR']
+            standard_rank_data = p['player']['draftRanksByRankType']['STANDARD']
+            ranks = (ppr_rank_data.get('rank', 3000), standard_rank_data.get('rank', 3000), standard_rank_data.get('auctionValue', -1))
+        except Exception:
+            ranks = (3000, 3000, -1)
+        col("PPR_draft_rank", np.int64, 3000)[i] = 3000 if ranks[0] is None else ranks[0]
+        col("STANDARD_draft_rank", np.int64, 3000)[i] = 3000 if ranks[1] is None else ranks[1]
+        col("draft_auction_value", np.int64, -1)[i] = -1 if ranks[2] is None else ranks[2]
+        try:
+            col("community_ADP")[i] = p['player']['ownership'].get('averageDraftPosition', 3000)
+        except Exception:
+            col("community_ADP")[i] = 3000
 
-    # Needed to construct BoxPlayer objects for this week
-    pro_schedule = league._get_pro_schedule(week)
-    positional_rankings = league._get_positional_ratings(week)
+        i += 1
+    return col.to_frame(i)
 
+
+ESPN_TIMEOUT = (5, 60)  # (connect, read) seconds
+ESPN_MAX_WORKERS = 6
+ESPN_RATE = 10.0  # starting requests/second; the transport adapts it to throttling
+
+
+def build_espn_session(max_workers: int = ESPN_MAX_WORKERS) -> requests.Session:
+    """Session with a per-host connection pool sized for ``max_workers`` concurrent page fetches"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=max_workers * 2)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def build_espn_transport(max_workers: int = ESPN_MAX_WORKERS) -> Transport:
+    """Rate-limited, retrying transport over a ``build_espn_session`` pool"""
+    return Transport(build_espn_session(max_workers), rate=ESPN_RATE, burst=max_workers * 2, timeout=ESPN_TIMEOUT)
+
+
+def build_espn_request(league_id: int, season: int, swid=None, espn_s2=None) -> EspnFantasyRequests:
+    """The request helper a ``League`` would hold, without the league/teams/draft fetches ``League`` does on init"""
+    cookies = {'espn_s2': espn_s2, 'SWID': swid} if espn_s2 and swid else None
+    return EspnFantasyRequests(sport='nfl', year=season, league_id=league_id, cookies=cookies)
+
+
+def _league_get(espn_request: EspnFantasyRequests, session: requests.Session, params: dict = None, headers: dict = None,
+                cache: ResponseCache = None, ttl=TTL_IMMUTABLE):
+    """
+    Same contract as ``espn_request.league_get`` but over a shared Session
+    (espn_api opens a fresh connection per call via ``requests.get``) and an optional response cache.
+    """
+    r = cached_get(session, espn_request.LEAGUE_ENDPOINT, params=params, headers=headers, cookies=espn_request.cookies,
+                   timeout=ESPN_TIMEOUT, cache=cache, ttl=ttl)
+    alternate_response = espn_request.checkRequestStatus(r.status_code, params=params, headers=headers)
+    response = alternate_response if alternate_response else r.json()
+    return response[0] if isinstance(response, list) else response
+
+
+def _get_pro_schedule_data(espn_request: EspnFantasyRequests, session: requests.Session, cache: ResponseCache = None, ttl=TTL_IMMUTABLE):
+    """Season-wide pro schedule payload (``League._get_pro_schedule`` refetches it for every week)"""
+    r = cached_get(session, espn_request.ENDPOINT, params={"view": "proTeamSchedules_wl"}, cookies=espn_request.cookies,
+                   timeout=ESPN_TIMEOUT, cache=cache, ttl=ttl)
+    espn_request.checkRequestStatus(r.status_code)
+    return r.json()
+
+
+def _pro_schedule_for_week(pro_schedule_data, week: int):
+    """Mirrors ``BaseLeague._get_pro_schedule`` on an already fetched payload"""
+    pro_team_schedule = {}
+    for team in pro_schedule_data['settings']['proTeams']:
+        pro_game = team.get('proGamesByScoringPeriod', {})
+        if team['id'] != 0 and (str(week) in pro_game.keys() and pro_game[str(week)]):
+            game_data = pro_game[str(week)][0]
+            pro_team_schedule[team['id']] = (game_data['homeProTeamId'], game_data['date']) if team['id'] == game_data['awayProTeamId'] else (game_data['awayProTeamId'], game_data['date'])
+    return pro_team_schedule
+
+
+def _get_positional_ratings(espn_request: EspnFantasyRequests, session: requests.Session, week: int, cache: ResponseCache = None, ttl=TTL_IMMUTABLE):
+    """Mirrors ``League._get_positional_ratings`` over a shared Session"""
+    data = _league_get(espn_request, session, params={'view': 'mPositionalRatings', 'scoringPeriodId': week}, cache=cache, ttl=ttl)
+    ratings = data.get('positionAgainstOpponent', {}).get('positionalRatings', {})
+    positional_ratings = {}
+    for pos, rating in ratings.items():
+        positional_ratings[pos] = {team: team_data['rank'] for team, team_data in rating['ratingsByOpponent'].items()}
+    return positional_ratings
+
+
+def _kona_headers(week: int, chunk: int, offset: int) -> Dict[str, str]:
+    filters = {
+        "players": {
+            "filterSlotIds": {"value": [0,1,2,3,4,5,6,7,8,9,10,11,12,13,14,15,16,17,18,19,23,24]},
+            "filterRanksForScoringPeriodIds":{"value":[week]},
+            "limit": chunk,
+            "offset": offset,
+            "sortPercOwned": {"sortAsc": False, "sortPriority": 1},
+            "sortDraftRanks":{"sortPriority":100,"sortAsc":True,"value":"STANDARD"},
+            "filterRanksForRankTypes": {"value": ["PPR"]},
+            "filterRanksForSlotIds":{"value":[0,2,4,6,17,16,8,9,10,12,13,24,11,14,15]},
+        }
+    }
+    return {"x-fantasy-filter": json.dumps(filters)}
+
+
+def _iter_kona_pages(espn_request: EspnFantasyRequests, session: requests.Session, week: int, chunk: int,
+                     pool: ThreadPoolExecutor, cache: ResponseCache = None, ttl=TTL_IMMUTABLE) -> Iterator[List[Dict[str, Any]]]:
+    """Yields kona_player_info pages until an empty one, requesting the next page before yielding the current"""
     params = {
         "view": "kona_player_info",
         "scoringPeriodId": week,
     }
 
-    all_records: List[Dict[str, Any]] = []
-    seen_ids = set()  # guard against any dupes that sometimes appear in paging
+    def _fetch_page(offset: int):
+        data = _league_get(espn_request, session, params=params, headers=_kona_headers(week, chunk, offset), cache=cache, ttl=ttl)
+        return data.get("players", []) or []
 
     offset = 0
+    pending = pool.submit(_fetch_page, offset)
     while True:
-        filters = {
-            "players": {
-                "filterSlotIds": {"value": [0,1,2,3,4,5,6,7,8,9,10,11,12,13,14,15,16,17,18,19,23,24]},
-                "filterRanksForScoringPeriodIds":{"value":[week]},
-                "limit": chunk,
-                "offset": offset,
-                "sortPercOwned": {"sortAsc": False, "sortPriority": 1},
-                "sortDraftRanks":{"sortPriority":100,"sortAsc":True,"value":"STANDARD"},
-                "filterRanksForRankTypes": {"value": ["PPR"]},
-                "filterRanksForSlotIds":{"value":[0,2,4,6,17,16,8,9,10,12,13,24,11,14,15]},
-            }
-        }
-        headers = {"x-fantasy-filter": json.dumps(filters)}
-
-        data = league.espn_request.league_get(params=params, headers=headers)
-        batch = data.get("players", []) or []
+        batch = pending.result()
+        count("espn.pages")
 
         print(f"[ESPN] page offset={offset} fetched={len(batch)}")
         if not batch:
             break
 
-        # Build BoxPlayers and flatten
-        for p in batch:
-            bp = BoxPlayer(p, pro_schedule, positional_rankings, week, season)
-            rec = flatten_player_payload(p, bp.__dict__, season, week)
+        # request the next page before the caller flattens this one
+        offset += chunk
+        pending = pool.submit(_fetch_page, offset)
+        yield batch
 
-            # Only append if we have a player_id; skip any malformed rows
-            pid = rec.get("player_id")
-            if pid is None or pid in seen_ids:
-                continue
-            seen_ids.add(pid)
-            all_records.append(rec)
 
-        # next page
-        offset += chunk
+@timed("espn.process_week_data")
+def process_week_data(league_id: int, season: int, week: int, swid=None, espn_s2=None,chunk: int = 250, *,
+                      league: League = None, session: requests.Session = None, pro_schedule_data=None,
+                      pool: ThreadPoolExecutor = None, as_frame: bool = False, cache: ResponseCache = None, ttl=TTL_IMMUTABLE):
+    """
+       Pull ALL players for a given season/week from ESPN's kona_player_info, paginating until exhausted.
+       Returns a list of flattened dict records (includes season, week, player_id), or with ``as_frame``
+       a DataFrame built by the columnar ``flatten_week_payloads`` (no League or BoxPlayer needed).
+
+       ``league``/``session``/``pro_schedule_data`` let a season-level caller share one League and
+       connection pool across weeks; ``pool`` is used to request the next page while the current
+       one is being flattened. Requests go through ``cache`` (if given) with freshness ``ttl``.
+       """
+    print(f"[ESPN] Fetching season={season} week={week}")
+
+    if as_frame:
+        espn_request = league.espn_request if league is not None else build_espn_request(league_id, season, swid, espn_s2)
+    else:
+        if league is None:
+            league = League(league_id=league_id, year=season, swid=swid, espn_s2=espn_s2)
+        espn_request = league.espn_request
+    own_session = session is None
+    if own_session:
+        session = build_espn_transport(1)
+    own_pool = pool is None
+    if own_pool:
+        pool = ThreadPoolExecutor(max_workers=1)
+
+    seen_ids = set()  # guard against any dupes that sometimes appear in paging
+    try:
+        if as_frame:
+            last_updated = datetime.datetime.now().isoformat()
+            frames = [
+                flatten_week_payloads(batch, season, week, seen_ids=seen_ids, last_updated=last_updated)
+                for batch in _iter_kona_pages(espn_request, session, week, chunk, pool, cache, ttl)
+            ]
+            week_df = apply_schema(pd.concat(frames, ignore_index=True), PROJECTIONS_TABLE) if frames else pd.DataFrame()
+            if week_df.shape[0] == 0:
+                count("espn.weeks.empty")
+            print(f"[ESPN] Done season={season} week={week} total_players={len(week_df)}")
+            return week_df
+
+        # Needed to construct BoxPlayer objects for this week
+        if pro_schedule_data is None:
+            pro_schedule_data = _get_pro_schedule_data(espn_request, session, cache, ttl)
+        pro_schedule = _pro_schedule_for_week(pro_schedule_data, week)
+        positional_rankings = _get_positional_ratings(espn_request, session, week, cache, ttl)
+
+        all_records: List[Dict[str, Any]] = []
+        for batch in _iter_kona_pages(espn_request, session, week, chunk, pool, cache, ttl):
+            # Build BoxPlayers and flatten
+            for p in batch:
+                bp = BoxPlayer(p, pro_schedule, positional_rankings, week, season)
+                rec = flatten_player_payload(p, bp.__dict__, season, week)
 
+                # Only append if we have a player_id; skip any malformed rows
+                pid = rec.get("player_id")
+                if pid is None or pid in seen_ids:
+                    continue
+                seen_ids.add(pid)
+                all_records.append(rec)
+    finally:
+        if own_pool:
+            pool.shutdown(wait=True)
+        if own_session:
+            session.close()
+
+    if not all_records:
+        count("espn.weeks.empty")
     print(f"[ESPN] Done season={season} week={week} total_players={len(all_records)}")
     return all_records
 
 
+def process_season_data(league_id: int, season: int, weeks: List[int], swid=None, espn_s2=None, chunk: int = 250,
+                        max_workers: int = ESPN_MAX_WORKERS, as_frame: bool = False, cache: ResponseCache = None,
+                        ttl_for_week: Callable[[int], Any] = None) -> Iterator[Tuple[int, Any]]:
+    """
+    Pull every requested week of a season concurrently.
+
+    The League (or, with ``as_frame``, just its request helper), HTTP session and season pro schedule
+    are built once and shared by all weeks; weeks run on a ``max_workers`` pool and their pages are
+    fetched on a separate pool so a week waiting on its next page never starves page fetches.
+    At most ``max_workers`` weeks are in flight and a new one starts only as a finished one is
+    yielded, so a slow consumer bounds how many weeks are held in memory.
+
+    ``ttl_for_week`` maps a week to the cache freshness used for its requests (default: immutable).
+
+    Yields:
+        (week, records) as each week finishes, records as returned by ``process_week_data``.
+    """
+    ttl_for_week = ttl_for_week or (lambda week: TTL_IMMUTABLE)
+    session = build_espn_transport(max_workers)
+    try:
+        if as_frame:
+            league = None
+            week_kwargs = {"as_frame": True}
+        else:
+            league = League(league_id=league_id, year=season, swid=swid, espn_s2=espn_s2)
+            week_kwargs = {"pro_schedule_data": _get_pro_schedule_data(league.espn_request, session, cache, ttl_for_week(max(weeks)))}
+        with ThreadPoolExecutor(max_workers=max_workers) as page_pool, \
+                ThreadPoolExecutor(max_workers=max_workers) as week_pool:
+            pending = iter(weeks)
+            in_flight = {}
+
+            def _submit_next():
+                week = next(pending, None)
+                if week is not None:
+                    in_flight[week_pool.submit(
+                        process_week_data, league_id, season, week, swid, espn_s2, chunk,
+                        league=league, session=session, pool=page_pool, cache=cache, ttl=ttl_for_week(week), **week_kwargs,
+                    )] = week
+
+            for _ in range(max_workers):
+                _submit_next()
+            while in_flight:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    week = in_flight.pop(future)
+                    _submit_next()
+                    yield week, future.result()
+    finally:
+        session.close()
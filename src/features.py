@@ -0,0 +1,185 @@
+from typing import Dict, Iterable, Set
+
+import numpy as np
+import pandas as pd
+
+from .layout import get_dataset_partitions, get_manifest_path
+from .manifest import advance_input_keys, load_input_keys
+from .query import changed_weeks, dataset_file_keys
+from .schemas import FEATURES_TABLE, PROJECTIONS_TABLE
+from .telemetry import count, stage
+from .utils import drop_dataset_partition, get_dataset, put_dataset
+
+# Rolling features derived from the projections table, stored next to it with the same layout:
+#   {processed}/{sport}/{league}/projection_features/season=2024/week=5/part-0.parquet
+# A week's row for a player summarizes that player's earlier weeks of the same season (what was
+# known before the week was played), so a stored week never depends on a later one.
+FEATURES_DIR = "projection_features"
+FEATURE_WINDOWS = (3, 5)  # trailing windows, in the player's own weeks of the season
+FEATURE_INPUT_COLUMNS = ["points", "projected_points", "percent_owned", "avg_points_week"]
+# bump when a feature's definition changes: every season is recomputed on the next update
+FEATURES_VERSION = 1
+
+
+def get_features_path(sport_league, root_path: str = "./processed") -> str:
+    sport_str, league_str = sport_league.value.split("/")
+    return f"{root_path}/{sport_str}/{league_str}/{FEATURES_DIR}/"
+
+
+def _values(df: pd.DataFrame, column: str) -> np.ndarray:
+    if column not in df.columns:
+        return np.full(len(df), np.nan)
+    return df[column].to_numpy(dtype="float64", na_value=np.nan)
+
+
+def _prefix(values: np.ndarray):
+    """Running sums of the non-null values and of their count, with a leading 0 (``sums[i]`` covers rows < i)"""
+    valid = ~np.isnan(values)
+    sums = np.concatenate([[0.0], np.cumsum(np.where(valid, values, 0.0))])
+    counts = np.concatenate([[0], np.cumsum(valid)])
+    return sums, counts
+
+
+def _window_mean(prefix, rows: np.ndarray, lo: np.ndarray) -> np.ndarray:
+    """Mean of the non-null values in rows [lo, row) for each row (NaN when there are none)"""
+    sums, counts = prefix
+    n = counts[rows] - counts[lo]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(n > 0, (sums[rows] - sums[lo]) / np.maximum(n, 1), np.nan)
+
+
+def _player_order(df: pd.DataFrame) -> pd.DataFrame:
+    """Season rows in (player_id, week) order with each row's position in its player's run"""
+    df = df[df["week"].notna()].sort_values(["player_id", "week"], kind="mergesort").reset_index(drop=True)
+    return df.assign(_pos=df.groupby("player_id", sort=False).cumcount().to_numpy())
+
+
+def affected_weeks(df: pd.DataFrame, dirty_weeks: Iterable[int]) -> Set[int]:
+    """
+    Weeks of a season whose features can change when ``dirty_weeks`` change: a row depends on its
+    own week and on the weeks its widest window reaches back to, so a row is affected when a dirty
+    week falls anywhere in that span (which also covers a player's row added to or removed from it).
+
+    Args:
+        df (pd.DataFrame): The season's projections (week, player_id) as now stored.
+        dirty_weeks (Iterable[int]): Weeks whose projections were written or removed.
+
+    Returns:
+        Set[int]: Weeks to recompute (only weeks present in ``df``).
+    """
+    dirty = np.asarray(sorted(set(dirty_weeks)), dtype="int64")
+    if len(dirty) == 0 or len(df) == 0:
+        return set()
+    df = _player_order(df)
+    weeks = df["week"].to_numpy(dtype="int64")
+    rows = np.arange(len(df))
+    back = rows - max(FEATURE_WINDOWS)
+    # a window cut short by the start of the season reaches back to week 0
+    reach = np.where(df["_pos"].to_numpy() >= max(FEATURE_WINDOWS), weeks[np.maximum(back, 0)], 0)
+    first_dirty = np.searchsorted(dirty, reach, side="left")
+    hit = (first_dirty < len(dirty)) & (dirty[np.minimum(first_dirty, len(dirty) - 1)] <= weeks)
+    return set(np.unique(weeks[hit]).tolist())
+
+
+def compute_features(df: pd.DataFrame, weeks: Iterable[int] = None) -> pd.DataFrame:
+    """
+    Rolling features of one season's projections, computed for every player at once: running sums
+    over the (player_id, week) ordered season turn each trailing window into two lookups.
+
+    Args:
+        df (pd.DataFrame): The whole season (season, week, player_id and ``FEATURE_INPUT_COLUMNS``);
+            earlier weeks are needed as window context even when only later ``weeks`` are wanted.
+        weeks (Iterable[int]): Only compute rows of these weeks (default is every week).
+
+    Returns:
+        pd.DataFrame: One row per (week, player_id) asked for, ``FEATURES_TABLE`` columns.
+    """
+    df = _player_order(df)
+    rows = np.arange(len(df))
+    if weeks is not None:
+        rows = rows[df["week"].isin(list(weeks)).to_numpy()]
+    pos = df["_pos"].to_numpy()[rows]
+    start = rows - pos  # first row of each row's player
+
+    points, projected = _values(df, "points"), _values(df, "projected_points")
+    owned, avg_week = _values(df, "percent_owned"), _values(df, "avg_points_week")
+    error = points - projected
+    prefixes = {
+        "points_mean": _prefix(points),
+        "projected_points_mean": _prefix(projected),
+        "projection_error_mean": _prefix(error),
+        "abs_projection_error_mean": _prefix(np.abs(error)),
+        "avg_points_week_mean": _prefix(avg_week),
+    }
+
+    out = {
+        "season": df["season"].to_numpy()[rows],
+        "week": df["week"].to_numpy()[rows],
+        "player_id": df["player_id"].to_numpy()[rows],
+        "projection_error": error[rows],
+        "percent_owned_delta": np.where(pos >= 1, owned[rows] - owned[np.maximum(rows - 1, 0)], np.nan),
+    }
+    for window in FEATURE_WINDOWS:
+        lo = np.maximum(start, rows - window)
+        for name, prefix in prefixes.items():
+            out[f"{name}_{window}"] = _window_mean(prefix, rows, lo)
+        out[f"percent_owned_delta_{window}"] = np.where(pos >= window, owned[rows] - owned[np.maximum(rows - window, 0)], np.nan)
+    return pd.DataFrame(out)
+
+
+def update_features(sport_league, processed_root: str = "./processed", manifest_root: str = "./manifests",
+                    full: bool = False) -> Dict[str, int]:
+    """
+    Bring the feature table in line with the projections table. Each projections partition's
+    file key (see ``src.query``) is kept in the ``features`` manifest; only seasons with a new,
+    rewritten or removed week are read, and only the weeks whose windows reach one are recomputed
+    and rewritten. The first update (or a ``FEATURES_VERSION`` bump, or ``full``) builds every season.
+
+    Args:
+        sport_league (ESPNSportLeagueTypes): Sport/league.
+        processed_root (str): Processed dataset root.
+        manifest_root (str): Manifest root.
+        full (bool): Recompute every season regardless of the manifest.
+
+    Returns:
+        Dict[str, int]: {"seasons": seasons read, "weeks": week partitions written, "rows": rows written,
+        "dropped": week partitions removed}.
+    """
+    sport_str, league_str = sport_league.value.split("/")
+    proj_root = f"{processed_root}/{sport_str}/{league_str}/{PROJECTIONS_TABLE}"
+    features_root = get_features_path(sport_league, processed_root)
+    manifest_path = get_manifest_path(sport_league, "features", manifest_root)
+    stored = load_input_keys(manifest_path, FEATURES_VERSION, full).get("files", {})
+
+    keys = dataset_file_keys(proj_root)
+    dirty = changed_weeks(proj_root, keys, stored)
+    # weeks the table lost but the features still have, e.g. after a manual delete
+    proj_weeks = {(p["season"], p["week"]) for p in get_dataset_partitions(proj_root)}
+    for p in get_dataset_partitions(features_root):
+        if p["week"] is not None and (p["season"], p["week"]) not in proj_weeks:
+            dirty.setdefault(p["season"], set()).add(p["week"])
+
+    stats = {"seasons": 0, "weeks": 0, "rows": 0, "dropped": 0}
+    with stage("features.update") as span:
+        for season in sorted(dirty):
+            df = get_dataset(proj_root, columns=["season", "week", "player_id", *FEATURE_INPUT_COLUMNS],
+                             filters=[("season", "=", season)], table=PROJECTIONS_TABLE)
+            present = set(df["week"].dropna().astype(int).tolist()) if len(df) else set()
+            weeks = present if full or not stored else affected_weeks(df, dirty[season])
+            for week in sorted(dirty[season] - present):
+                drop_dataset_partition(features_root, {"season": season, "week": week})
+                stats["dropped"] += 1
+            stats["seasons"] += 1
+            if not weeks:
+                continue
+            features = compute_features(df, weeks)
+            put_dataset(features, features_root, table=FEATURES_TABLE)
+            stats["weeks"] += len(weeks)
+            stats["rows"] += len(features)
+            print(f"[Features] {sport_league.value} {season}: recomputed {len(weeks)} weeks ({len(features)} rows) "
+                  f"for {len(dirty[season])} changed projection weeks")
+        span.rows = stats["rows"]
+    count("features.rows", stats["rows"])
+
+    advance_input_keys(manifest_path, FEATURES_VERSION, {"files": keys})
+    return stats
@@ -0,0 +1,231 @@
+import hashlib
+import json
+import os
+import threading
+import time
+import zlib
+from typing import Callable, Dict, Optional
+
+import requests
+
+from .telemetry import record_request
+
+DEFAULT_CACHE_DIR = "./.cache/http"
+DEFAULT_MAX_BYTES = 2 * 1024 ** 3
+
+# Freshness windows in seconds; None means the response never expires
+TTL_IMMUTABLE = None
+TTL_CURRENT_WEEK = 60 * 60
+TTL_CURRENT_SEASON = 12 * 60 * 60
+
+CACHEABLE_STATUS = {200, 404}
+
+
+def cache_ttl(season: int, current_season: int, week: int = None, current_week: int = None):
+    """
+    Freshness window for a response about ``season``/``week``.
+
+    Completed seasons never change, so they are cached forever. In the current
+    season, weeks that closed more than a week ago are refreshed twice a day and
+    everything else (the live week, Watson season files) hourly.
+    """
+    if season < current_season:
+        return TTL_IMMUTABLE
+    if week is not None and current_week is not None and week < current_week - 1:
+        return TTL_CURRENT_SEASON
+    return TTL_CURRENT_WEEK
+
+
+class CachedResponse:
+    """The parts of a ``requests.Response`` the pump uses, backed by a cache entry"""
+
+    def __init__(self, status_code: int, content: bytes, headers: Dict[str, str], from_cache: bool):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers
+        self.from_cache = from_cache
+
+    def json(self):
+        return json.loads(self.content)
+
+
+class ResponseCache:
+    """
+    On-disk HTTP response cache.
+
+    Entries are keyed by the full request URL plus the ``x-fantasy-filter`` header
+    (ESPN encodes paging in it). Bodies are stored zlib-compressed under their
+    content hash, so identical payloads (e.g. empty Watson files) are stored once.
+    Entries are evicted least-recently-used once the blobs exceed ``max_bytes``.
+    """
+
+    def __init__(self, root: str = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+        self.evicted = 0
+        self._lock = threading.Lock()
+        os.makedirs(f"{root}/entries", exist_ok=True)
+        os.makedirs(f"{root}/blobs", exist_ok=True)
+        self._size = sum(os.path.getsize(f"{root}/blobs/{f}") for f in os.listdir(f"{root}/blobs"))
+
+    @staticmethod
+    def request_key(url: str, params: dict = None, headers: dict = None) -> str:
+        full_url = requests.Request("GET", url, params=params).prepare().url
+        fantasy_filter = (headers or {}).get("x-fantasy-filter", "")
+        return hashlib.sha256(f"{full_url}\n{fantasy_filter}".encode()).hexdigest()
+
+    def _entry_path(self, key: str) -> str:
+        return f"{self.root}/entries/{key}.json"
+
+    def _blob_path(self, digest: str) -> str:
+        return f"{self.root}/blobs/{digest}"
+
+    def get(self, key: str) -> Optional[dict]:
+        path = self._entry_path(key)
+        try:
+            with open(path, "r") as file:
+                entry = json.load(file)
+            with open(self._blob_path(entry["digest"]), "rb") as file:
+                entry["content"] = zlib.decompress(file.read())
+        except (OSError, ValueError, KeyError, zlib.error):
+            return None
+        os.utime(path)  # mtime doubles as the LRU clock
+        return entry
+
+    def put(self, key: str, url: str, status_code: int, content: bytes, headers: Dict[str, str], ttl):
+        digest = hashlib.sha256(content).hexdigest()
+        blob_path = self._blob_path(digest)
+        if not os.path.exists(blob_path):
+            blob = zlib.compress(content)
+            _atomic_write(blob_path, blob)
+            with self._lock:
+                self._size += len(blob)
+        entry = {
+            "url": url,
+            "status_code": status_code,
+            "digest": digest,
+            "etag": headers.get("ETag"),
+            "last_modified": headers.get("Last-Modified"),
+            "fetched_at": time.time(),
+            "ttl": ttl,
+        }
+        _atomic_write(self._entry_path(key), json.dumps(entry).encode())
+        if self._size > self.max_bytes:
+            self.evict()
+
+    def touch(self, key: str, entry: dict, ttl):
+        """Mark a revalidated (304) entry fresh again"""
+        entry = {k: v for k, v in entry.items() if k != "content"}
+        entry["fetched_at"] = time.time()
+        entry["ttl"] = ttl
+        _atomic_write(self._entry_path(key), json.dumps(entry).encode())
+
+    def evict(self):
+        """Drop least recently used entries until blobs fit in ``max_bytes``, then sweep unreferenced blobs"""
+        with self._lock:
+            entries_dir = f"{self.root}/entries"
+            entries = sorted(
+                (os.path.getmtime(f"{entries_dir}/{f}"), f) for f in os.listdir(entries_dir) if f.endswith(".json")
+            )
+            target = self.max_bytes * 0.9
+            referenced = {}
+            for _, f in entries:
+                try:
+                    with open(f"{entries_dir}/{f}", "r") as file:
+                        referenced[f] = json.load(file)["digest"]
+                except (OSError, ValueError, KeyError):
+                    referenced[f] = None
+            live = set(referenced.values())
+            blob_sizes = {d: os.path.getsize(self._blob_path(d)) for d in live if d and os.path.exists(self._blob_path(d))}
+            size = sum(blob_sizes.values())
+            for _, f in entries:
+                if size <= target:
+                    break
+                os.remove(f"{entries_dir}/{f}")
+                self.evicted += 1
+                digest = referenced.pop(f)
+                if digest and digest not in referenced.values():
+                    size -= blob_sizes.pop(digest, 0)
+            keep = set(referenced.values())
+            for blob in os.listdir(f"{self.root}/blobs"):
+                if blob not in keep:
+                    os.remove(self._blob_path(blob))
+            self._size = size
+
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "revalidated": self.revalidated,
+            "evicted": self.evicted,
+            "bytes": self._size,
+        }
+
+    def record(self, name: str):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+
+def _atomic_write(path: str, data: bytes):
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "wb") as file:
+        file.write(data)
+    os.replace(tmp_path, path)
+
+
+def _timed_get(session: requests.Session, url: str, **kwargs):
+    """``session.get``, recorded in the run telemetry (a request that raises is recorded as an error)"""
+    start = time.perf_counter()
+    try:
+        resp = session.get(url, **kwargs)
+    except Exception:
+        record_request(url, None, time.perf_counter() - start)
+        raise
+    record_request(url, resp.status_code, time.perf_counter() - start, len(resp.content or b""))
+    return resp
+
+
+def cached_get(session: requests.Session, url: str, *, params: dict = None, headers: dict = None, cookies=None,
+               timeout=None, cache: ResponseCache = None, ttl=TTL_IMMUTABLE, valid: Callable[[bytes], bool] = None):
+    """
+    GET through ``cache``: fresh entries are served without touching the network, stale
+    ones are revalidated with If-None-Match / If-Modified-Since when the server sent
+    validators, and anything else is fetched and stored. A 200 body ``valid`` rejects
+    (e.g. an HTML error page) is neither stored nor served from the cache, so it is
+    fetched again next time. Without a cache this is a plain ``session.get``.
+    """
+    if cache is None:
+        return _timed_get(session, url, params=params, headers=headers, cookies=cookies, timeout=timeout)
+
+    key = cache.request_key(url, params, headers)
+    entry = cache.get(key)
+    if entry is not None and valid is not None and entry["status_code"] == 200 and not valid(entry["content"]):
+        entry = None  # stored before it was checked
+    if entry is not None:
+        # an entry only counts as immutable if it was stored that way; one cached while the
+        # season was live is refetched once before it is kept forever
+        if (ttl is None and entry["ttl"] is None) or (ttl is not None and time.time() - entry["fetched_at"] < ttl):
+            cache.record("hits")
+            record_request(url, entry["status_code"], cached=True)
+            return CachedResponse(entry["status_code"], entry["content"], {}, from_cache=True)
+
+    request_headers = dict(headers or {})
+    if entry is not None:
+        if entry.get("etag"):
+            request_headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            request_headers["If-Modified-Since"] = entry["last_modified"]
+
+    resp = _timed_get(session, url, params=params, headers=request_headers, cookies=cookies, timeout=timeout)
+    if resp.status_code == 304 and entry is not None:
+        cache.record("revalidated")
+        cache.touch(key, entry, ttl)
+        return CachedResponse(entry["status_code"], entry["content"], dict(resp.headers), from_cache=True)
+
+    cache.record("misses")
+    if resp.status_code in CACHEABLE_STATUS and (valid is None or resp.status_code != 200 or valid(resp.content)):
+        cache.put(key, resp.url, resp.status_code, resp.content, resp.headers, ttl)
+    return resp
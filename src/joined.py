@@ -0,0 +1,129 @@
+from typing import Dict, Set, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .layout import get_dataset_partitions, get_manifest_path
+from .manifest import advance_input_keys, load_input_keys
+from .query import changed_weeks, dataset_file_keys
+from .schemas import JOIN_KEYS, JOINED_TABLE, PROJECTIONS_TABLE, WATSON_PREFIX, WATSON_TABLE
+from .telemetry import count, stage
+from .utils import drop_dataset_partition, get_dataset, put_dataset
+
+# ESPN projections ⋈ Watson, materialized next to both tables with the same layout:
+#   {processed}/{sport}/{league}/projections_watson/season=2024/week=5/part-0.parquet
+# An inner join on (season, week, player_id): one row per player Watson covered that week.
+JOINED_DIR = JOINED_TABLE
+# bump when the join's columns or rules change: every week is rebuilt on the next update
+JOINED_VERSION = 1
+
+
+def get_joined_path(sport_league, root_path: str = "./processed") -> str:
+    sport_str, league_str = sport_league.value.split("/")
+    return f"{root_path}/{sport_str}/{league_str}/{JOINED_DIR}/"
+
+
+def _join_key(df: pd.DataFrame) -> np.ndarray:
+    """(week, player_id) packed into one int64 that sorts the same way (player ids fit in 32 bits)"""
+    weeks = df["week"].to_numpy(dtype="int64", na_value=-1)
+    return (weeks << 32) + (df["player_id"].to_numpy(dtype="int64") + (1 << 31))
+
+
+def _in_key_order(df: pd.DataFrame) -> Tuple[pd.DataFrame, np.ndarray]:
+    """Rows ordered by (week, player_id), one per key (the last, as an upsert keeps it), and their keys"""
+    key = _join_key(df)
+    if len(key) > 1 and not (key[1:] > key[:-1]).all():
+        # each stored week is already in player_id order, so this only interleaves sorted runs
+        order = np.argsort(key, kind="stable")
+        last = np.append(key[order][1:] != key[order][:-1], True)
+        df, key = df.iloc[order[last]], key[order[last]]
+    return df.reset_index(drop=True), key
+
+
+def merge_join(projections: pd.DataFrame, watson: pd.DataFrame) -> pd.DataFrame:
+    """
+    Inner join of projections and Watson rows of one season on (week, player_id). Stored
+    partitions are already in player_id order, so both sides are walked once in step
+    (``searchsorted`` of one sorted key column into the other) instead of hashing either frame.
+
+    Args:
+        projections (pd.DataFrame): Projections rows of a season (any subset of its weeks).
+        watson (pd.DataFrame): Watson rows of the same season.
+
+    Returns:
+        pd.DataFrame: ``JOINED_TABLE`` rows in (week, player_id) order, Watson columns prefixed.
+    """
+    projections, left = _in_key_order(projections)
+    watson, right = _in_key_order(watson)
+    at = np.searchsorted(right, left)
+    matched = np.flatnonzero(at < len(right))
+    matched = matched[right[at[matched]] == left[matched]]
+    watson = watson.drop(columns=[c for c in JOIN_KEYS if c in watson.columns]).add_prefix(WATSON_PREFIX)
+    return pd.concat([
+        projections.iloc[matched].reset_index(drop=True),
+        watson.iloc[at[matched]].reset_index(drop=True),
+    ], axis=1)
+
+
+def update_joined(sport_league, processed_root: str = "./processed", manifest_root: str = "./manifests",
+                  full: bool = False) -> Dict[str, int]:
+    """
+    Bring the joined table in line with the projections and Watson tables. Both tables'
+    partition file keys (see ``src.query``) are kept in the ``joined`` manifest, and only weeks
+    rewritten, added or removed on either side are joined again; a week missing from either
+    side (or with no player in common) has no joined partition.
+
+    Args:
+        sport_league (ESPNSportLeagueTypes): Sport/league.
+        processed_root (str): Processed dataset root.
+        manifest_root (str): Manifest root.
+        full (bool): Rejoin every week regardless of the manifest.
+
+    Returns:
+        Dict[str, int]: {"weeks": week partitions written, "rows": rows written, "dropped": week partitions removed}.
+    """
+    sport_str, league_str = sport_league.value.split("/")
+    roots = {table: f"{processed_root}/{sport_str}/{league_str}/{table}" for table in (PROJECTIONS_TABLE, WATSON_TABLE)}
+    joined_root = get_joined_path(sport_league, processed_root)
+    manifest_path = get_manifest_path(sport_league, "joined", manifest_root)
+    stored = load_input_keys(manifest_path, JOINED_VERSION, full)
+
+    keys = {table: dataset_file_keys(root) for table, root in roots.items()}
+    dirty: Dict[int, Set[int]] = {}
+    for table, root in roots.items():
+        for season, weeks in changed_weeks(root, keys[table], stored.get(table, {})).items():
+            dirty.setdefault(season, set()).update(weeks)
+    # joined weeks that lost a side, e.g. after a manual delete
+    both = set.intersection(*({(p["season"], p["week"]) for p in get_dataset_partitions(root)} for root in roots.values()))
+    joined_weeks = {(p["season"], p["week"]) for p in get_dataset_partitions(joined_root) if p["week"] is not None}
+    for season, week in joined_weeks - both:
+        dirty.setdefault(season, set()).add(week)
+
+    stats = {"weeks": 0, "rows": 0, "dropped": 0}
+    with stage("joined.update") as span:
+        for season in sorted(dirty):
+            weeks = sorted(week for week in dirty[season] if (season, week) in both)
+            joined = pd.DataFrame()
+            if weeks:
+                # a season's changed weeks are read, joined and written in one go
+                filters = [("season", "=", season), ("week", "in", weeks)]
+                joined = merge_join(get_dataset(roots[PROJECTIONS_TABLE], filters=filters, table=PROJECTIONS_TABLE),
+                                    get_dataset(roots[WATSON_TABLE], filters=filters, table=WATSON_TABLE))
+            written = set(joined["week"].astype(int).unique().tolist()) if len(joined) else set()
+            for week in sorted(dirty[season] - written):
+                # gone from either side, or no player in common
+                if (season, week) in joined_weeks:
+                    drop_dataset_partition(joined_root, {"season": season, "week": week})
+                    stats["dropped"] += 1
+            if written:
+                put_dataset(joined, joined_root, table=JOINED_TABLE)
+                stats["weeks"] += len(written)
+                stats["rows"] += len(joined)
+        span.rows = stats["rows"]
+    count("joined.rows", stats["rows"])
+    if dirty:
+        print(f"[Joined] {sport_league.value}: {sum(len(w) for w in dirty.values())} changed weeks → "
+              f"{stats['weeks']} joined ({stats['rows']} rows), {stats['dropped']} dropped")
+
+    advance_input_keys(manifest_path, JOINED_VERSION, keys)
+    return stats
@@ -0,0 +1,143 @@
+"""
+Where the pump keeps its data and what is already there, answered from file names
+and small JSON manifests alone. Only the standard library is imported, so the CLI can
+plan and report on a run without loading pandas/pyarrow or touching the network.
+"""
+import datetime
+import glob
+import json
+import os
+from typing import List
+
+from espn_api_orm.consts import ESPNSportLeagueTypes
+
+from src.consts import SEASON_START_MONTH, START_SEASONS
+
+DATASET_PARTITION_COLS = ("season", "week")
+HIVE_NULL_PARTITION = "__HIVE_DEFAULT_PARTITION__"
+
+
+def get_manifest_path(sport_league, name: str, root_path: str = "./manifests") -> str:
+    """
+    Path of a manifest file for a sport/league (e.g. projections week digests).
+
+    Args:
+        sport_league (ESPNSportLeagueTypes): Sport/league the manifest describes.
+        name (str): Manifest name.
+        root_path (str): Root directory for manifests.
+
+    Returns:
+        str: Path to the manifest json file.
+    """
+    return f"{root_path}/{sport_league.value}/{name}.json"
+
+
+def load_manifest(path: str) -> dict:
+    """
+    Read a manifest, returning an empty one if it does not exist yet.
+
+    Args:
+        path (str): Path to the manifest json file.
+
+    Returns:
+        dict: Manifest contents.
+    """
+    try:
+        with open(path, "r") as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return {}
+
+
+def _dataset_files(root: str, partition_cols) -> List[str]:
+    root = root.rstrip('/')
+    return sorted(glob.glob(f"{root}/" + "/".join(f"{c}=*" for c in partition_cols) + "/*.parquet"))
+
+
+def get_dataset_partitions(root: str, partition_cols=DATASET_PARTITION_COLS) -> List[dict]:
+    """
+    List the partitions present in a dataset without opening any file.
+
+    Args:
+        root (str): Dataset root directory.
+
+    Returns:
+        List[dict]: Partition column -> int value, one per partition directory.
+    """
+    partitions = []
+    for path in _dataset_files(root, partition_cols):
+        parts = os.path.relpath(os.path.dirname(path), root).split(os.sep)
+        partition = dict(part.split('=', 1) for part in parts)
+        partitions.append({c: int(v) if v.lstrip('-').isdigit() else None for c, v in partition.items()})
+    return [dict(t) for t in dict.fromkeys(tuple(p.items()) for p in partitions)]
+
+
+def get_legacy_seasons(root: str) -> List[int]:
+    """Seasons still stored as a legacy ``{root}/{season}.parquet`` file (migrated by the next pump run or ``fantasy_pump.py migrate``)"""
+    if not os.path.isdir(root):
+        return []
+    return sorted(int(f.split('.')[0]) for f in os.listdir(root) if f.endswith('.parquet') and f.split('.')[0].isdigit())
+
+
+def get_latest_week_for_season(root: str, season: int) -> int:
+    """Get the latest week that has been processed for a season (read from partition names only)"""
+    weeks = [p['week'] for p in get_dataset_partitions(root) if p['season'] == season and p['week'] is not None]
+    return max(weeks) if weeks else 0
+
+
+def find_year_for_season(league: ESPNSportLeagueTypes, date: datetime.datetime = None):
+    """
+    Find the year for a specific season based on the league and date.
+
+    Args:
+        league (ESPNSportTypes): Type of sport.
+        date (datetime.datetime): Date for the sport (default is None).
+
+    Returns:
+        int: Year for the season.
+    """
+    if date is None:
+        today = datetime.datetime.utcnow()
+    else:
+        today = date
+    if league not in SEASON_START_MONTH:
+        raise ValueError(f'"{league}" league cannot be found!')
+    start = SEASON_START_MONTH[league]['start']
+    wrap = SEASON_START_MONTH[league]['wrap']
+    if wrap and start - 1 <= today.month <= 12:
+        return today.year + 1
+    elif not wrap and start == 1 and today.month == 12:
+        return today.year + 1
+    elif not wrap and not start - 1 <= today.month <= 12:
+        return today.year - 1
+    else:
+        return today.year
+
+
+def get_seasons_to_update(root_path, sport, suffix="projections"):
+    """
+    Get a list of seasons to update based on the root path and sport.
+
+    Args:
+        root_path (str): Root path for the sport data.
+        sport (ESPNSportTypes): Type of sport.
+
+    Returns:
+        List: List of seasons to update.
+    """
+    current_season = find_year_for_season(sport)
+    if os.path.exists(f'{root_path}/{sport.value}'):
+        seasons = os.listdir(f'{root_path}/{sport.value}/{suffix}')
+        fs_season = -1
+        for season_week in seasons:
+            season = season_week.split('/')[0].split('=')[-1].split('.')[0]
+            if not season.isdigit():
+                continue
+            temp = int(season)
+            if temp > fs_season:
+                fs_season = temp
+        if fs_season == -1:
+            fs_season = START_SEASONS[sport]
+    else:
+        fs_season = START_SEASONS[sport]
+    return list(range(fs_season, current_season + 1))
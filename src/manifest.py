@@ -0,0 +1,194 @@
+import hashlib
+import json
+import os
+from typing import Dict, Iterable, List
+
+import numpy as np
+import pandas as pd
+
+from .layout import get_manifest_path, load_manifest  # re-exported; reading a manifest needs no pandas
+
+VOLATILE_COLUMNS = ("last_updated",)
+
+
+def save_manifest(path: str, manifest: dict):
+    """
+    Write a manifest atomically (temp file + rename) so a crash never leaves it half written.
+
+    Args:
+        path (str): Path to the manifest json file.
+        manifest (dict): Manifest contents.
+
+    Returns:
+        None
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as file:
+        json.dump(manifest, file, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def load_input_keys(path: str, version: int, full: bool = False) -> Dict[str, Dict[str, str]]:
+    """
+    Input file keys a derived table was last built from, per input (see ``advance_input_keys``).
+
+    Args:
+        path (str): Path to the derived table's manifest.
+        version (int): Current version of the derived table's definition.
+        full (bool): Ignore the stored keys, so everything is rebuilt.
+
+    Returns:
+        Dict[str, Dict[str, str]]: Input name -> {relative file path: file key}; empty when
+        ``full``, when there is no manifest yet, or when it was written by another version.
+    """
+    manifest = load_manifest(path)
+    if full or manifest.get("version") != version:
+        return {}
+    return {name: files for name, files in manifest.items() if name != "version"}
+
+
+def advance_input_keys(path: str, version: int, keys: Dict[str, Dict[str, str]]):
+    """
+    Record the input file keys a derived table is now built from. Call it only once every
+    affected partition is written, so an interrupted update is redone on the next run.
+
+    Args:
+        path (str): Path to the derived table's manifest.
+        version (int): Current version of the derived table's definition.
+        keys (Dict[str, Dict[str, str]]): Input name -> {relative file path: file key}.
+
+    Returns:
+        None
+    """
+    save_manifest(path, {"version": version, **{name: {rel: files[rel] for rel in sorted(files)} for name, files in keys.items()}})
+
+
+def frame_digest(df: pd.DataFrame, keys: List[str] = ("player_id",), ignore: Iterable[str] = VOLATILE_COLUMNS) -> str:
+    """
+    Content hash of a partition that is stable across runs: volatile columns are
+    ignored, and rows/columns are put in a canonical order first.
+
+    Args:
+        df (pd.DataFrame): Partition to hash.
+        keys (List[str]): Columns that order the rows.
+        ignore (Iterable[str]): Columns left out of the hash.
+
+    Returns:
+        str: Hex digest.
+    """
+    columns = sorted(c for c in df.columns if c not in set(ignore))
+    canonical = df[columns].sort_values(list(keys), kind="mergesort").reset_index(drop=True)
+    digest = hashlib.sha256("\x1f".join(columns).encode())
+    digest.update(pd.util.hash_pandas_object(canonical, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def _changed_rows(base: pd.DataFrame, updates: pd.DataFrame, keys: List[str], ignore: Iterable[str]) -> np.ndarray:
+    """Boolean mask over ``updates``: True where the row is new or differs from ``base`` outside ``ignore``"""
+    ignore = set(ignore)
+    merged = updates[keys].merge(
+        base.assign(_in_base=True), on=keys, how="left", suffixes=("", "_base")
+    )
+    changed = merged["_in_base"].isna().to_numpy()
+    for column in updates.columns:
+        if column in keys or column in ignore:
+            continue
+        new = updates[column].reset_index(drop=True)
+        if column not in base.columns:
+            changed |= new.notna().to_numpy()
+            continue
+        old = merged[column]
+        same = (new.astype(object) == old.astype(object)).fillna(False).to_numpy(dtype=bool)
+        changed |= ~(same | (new.isna().to_numpy() & old.isna().to_numpy()))
+    for column in base.columns:
+        if column not in updates.columns and column not in keys and column not in ignore:
+            changed |= merged[column].notna().to_numpy()
+    return changed
+
+
+def upsert_partition(base: pd.DataFrame, updates: pd.DataFrame, partition: dict, keys: List[str],
+                     ignore: Iterable[str] = VOLATILE_COLUMNS, drop_empty: bool = False) -> pd.DataFrame:
+    """
+    Replace one partition (e.g. a season/week) of ``base`` with ``updates`` touching only rows that moved.
+
+    Rows whose content is unchanged keep their stored values (including volatile columns such as
+    ``last_updated``), changed or new rows are taken from ``updates``, and rows of the partition that
+    no longer appear upstream are dropped. Empty ``updates`` (a failed or not yet published fetch)
+    leave the partition as stored; it is emptied only when ``drop_empty`` says so.
+
+    Args:
+        base (pd.DataFrame): Previously stored rows.
+        updates (pd.DataFrame): Freshly fetched rows for the partition.
+        partition (dict): Column -> value identifying the partition in ``base``.
+        keys (List[str]): Row key columns.
+        ignore (Iterable[str]): Columns that never count as a change.
+        drop_empty (bool): Whether empty ``updates`` drop the partition's stored rows.
+
+    Returns:
+        pd.DataFrame: ``base`` with the partition upserted.
+    """
+    if base.empty:
+        return updates
+    if updates.empty and not drop_empty:
+        return base
+    in_partition = np.ones(len(base), dtype=bool)
+    for column, value in partition.items():
+        if value is None:
+            in_partition &= base[column].isna().to_numpy(dtype=bool)
+        else:
+            in_partition &= (base[column] == value).fillna(False).to_numpy(dtype=bool)
+    stored = base.loc[in_partition]
+    if updates.empty:
+        return base.loc[~in_partition].reset_index(drop=True)
+    changed = _changed_rows(stored, updates, list(keys), ignore)
+    if not changed.any() and len(stored) == len(updates):
+        return base
+
+    keep = stored.merge(updates.loc[~changed, list(keys)], on=list(keys), how="inner")
+    return pd.concat([base.loc[~in_partition], keep, updates.loc[changed]], ignore_index=True)
+
+
+def partition_changes(before: pd.DataFrame, after: pd.DataFrame, keys: List[str],
+                      ignore: Iterable[str] = VOLATILE_COLUMNS) -> pd.DataFrame:
+    """
+    Row-level diff of one partition as stored before and after a write.
+
+    Args:
+        before (pd.DataFrame): Rows stored before (empty for a new partition).
+        after (pd.DataFrame): Rows stored after (empty for a dropped partition).
+        keys (List[str]): Row key columns.
+        ignore (Iterable[str]): Columns that never count as a change.
+
+    Returns:
+        pd.DataFrame: ``keys`` plus ``op`` ("insert", "update" or "delete") and ``columns``
+        (the changed columns of an update, sorted; None otherwise), one row per changed key.
+    """
+    keys = list(keys)
+    if before.empty and after.empty:
+        return pd.DataFrame(columns=[*keys, "op", "columns"])
+    if before.empty or after.empty:
+        # a new partition is all inserts, a dropped one all deletes
+        rows = after if before.empty else before
+        return rows[keys].reset_index(drop=True).assign(op="insert" if before.empty else "delete", columns=None)
+    value_columns = sorted((set(before.columns) | set(after.columns)) - set(keys) - set(ignore))
+    old = before[keys + [c for c in value_columns if c in before.columns]]
+    old = old.rename(columns={c: f"{c}\x1fbefore" for c in old.columns if c not in keys})
+    merged = after[keys + [c for c in value_columns if c in after.columns]].merge(old, on=keys, how="outer", indicator=True)
+
+    both = (merged["_merge"] == "both").to_numpy()
+    changed = np.zeros((len(merged), len(value_columns)), dtype=bool)
+    for i, column in enumerate(value_columns):
+        new = merged[column] if column in after.columns else pd.Series(None, index=merged.index, dtype=object)
+        prev = merged[f"{column}\x1fbefore"] if column in before.columns else pd.Series(None, index=merged.index, dtype=object)
+        same = (new.astype(object) == prev.astype(object)).fillna(False).to_numpy(dtype=bool)
+        changed[:, i] = both & ~(same | (new.isna().to_numpy() & prev.isna().to_numpy()))
+
+    op = np.where(merged["_merge"] == "left_only", "insert", np.where(merged["_merge"] == "right_only", "delete", "update"))
+    rows = (op != "update") | changed.any(axis=1)
+    names = np.asarray(value_columns, dtype=object)
+    columns = [list(names[mask]) if o == "update" else None for o, mask in zip(op[rows], changed[rows])]
+    out = merged.loc[rows, keys].reset_index(drop=True)
+    out["op"] = op[rows]
+    out["columns"] = columns
+    return out
@@ -0,0 +1,97 @@
+from typing import Iterator, Optional, Sequence, Tuple
+
+import pandas as pd
+from espn_api_orm.consts import ESPNSportLeagueTypes
+
+from .changelog import Changelog
+from .features import update_features
+from .http_cache import ResponseCache
+from .joined import update_joined
+from .pipeline import run_pipeline
+from .plan import PROJECTIONS_STAGE, PUMP_STAGES, WATSON_STAGE
+from .projections_pump import ProjectionsPump
+from .telemetry import get_report_path, reset_telemetry, summarize, write_report
+from .utils import migrate_processed_tables
+from .watson_fantasy import WATSON_SELECTION_COLUMNS
+from .watson_pump import WatsonPump
+
+
+def _season_dag(projections, watson) -> Iterator[Tuple[int, Optional[pd.DataFrame]]]:
+    """
+    Walks the seasons either pump updates in order. A season's projections are refreshed
+    first and handed to Watson in memory; seasons only Watson updates are handed over
+    with no projections (Watson reads them from disk, nothing is rewriting them).
+    """
+    proj_seasons = set(projections.seasons()) if projections is not None else set()
+    watson_seasons = set(watson.seasons()) if watson is not None else set()
+    for season in sorted(proj_seasons | watson_seasons):
+        proj_df = None
+        if season in proj_seasons:
+            proj_df = projections.run_season(season, columns=WATSON_SELECTION_COLUMNS if season in watson_seasons else None)
+        if season in watson_seasons:
+            yield season, proj_df
+
+
+def run_pump(sport_league: ESPNSportLeagueTypes, stages: Sequence[str] = PUMP_STAGES, raw_root: str = "./raw",
+             processed_root: str = "./processed", watson_distributions: bool = False, resume: bool = True) -> dict:
+    """
+    Run the projections → Watson DAG for one sport/league in this process.
+
+    Projections walk the seasons on one thread; as soon as a season's projections are
+    in memory they are handed to Watson on a second thread, while projections move on
+    to the next season. Both pumps share one HTTP cache. With a single stage the other
+    is skipped and the stage behaves as its standalone runner did. The rows either pump
+    inserted, updated or deleted are logged as one changelog partition for the run; then
+    the projection features (src/features.py) and the projections ⋈ Watson table
+    (src/joined.py) are brought up to date for the weeks that changed.
+
+    Args:
+        sport_league (ESPNSportLeagueTypes): Sport/league to pump.
+        stages (Sequence[str]): Stages to run, any of ``PUMP_STAGES``.
+        raw_root (str): Raw snapshot root.
+        processed_root (str): Processed dataset root.
+        watson_distributions (bool): Also keep Watson's score distributions (see src/distributions.py).
+        resume (bool): Pick up a killed run's checkpoints (see src/checkpoint.py); False discards them.
+
+    Returns:
+        dict: The run report (also written under ``{processed_root}/{sport}/{league}/reports/``).
+    """
+    unknown = set(stages) - set(PUMP_STAGES)
+    if unknown:
+        raise ValueError(f"Unknown pump stages: {sorted(unknown)} (expected {list(PUMP_STAGES)})")
+    reset_telemetry()
+    # once per run, before any pump reads a table (a no-op once the tables are partitioned)
+    migrate_processed_tables(sport_league, processed_root)
+    response_cache = ResponseCache()
+    changelog = Changelog(sport_league, processed_root)
+    projections = ProjectionsPump(sport_league, raw_root, processed_root, response_cache, changelog=changelog,
+                                  resume=resume) if PROJECTIONS_STAGE in stages else None
+    watson = WatsonPump(sport_league, processed_root, response_cache, keep_distributions=watson_distributions,
+                        changelog=changelog, resume=resume) if WATSON_STAGE in stages else None
+    print(f"[Pump] {sport_league.value}: running {' → '.join(s for s in PUMP_STAGES if s in stages)}")
+
+    try:
+        if watson is None:
+            for season in projections.seasons():
+                projections.run_season(season)
+        else:
+            # Watson works on season N while projections fetch season N+1; at most one season waits in between
+            for _ in run_pipeline(_season_dag(projections, watson), [lambda item: watson.run_season(*item)], maxsize=1):
+                pass
+    finally:
+        # whatever reached the tables is logged, also when a later season failed
+        seq = changelog.commit()
+        if projections is not None:
+            projections.close()
+        if watson is not None:
+            watson.close()
+
+    name = PROJECTIONS_STAGE if watson is None else WATSON_STAGE if projections is None else "pump"
+    report_path = get_report_path(sport_league, name, processed_root)
+    extra = {stage: pump.stats() for stage, pump in ((PROJECTIONS_STAGE, projections), (WATSON_STAGE, watson)) if pump is not None}
+    if projections is not None:
+        extra["features"] = update_features(sport_league, processed_root)
+    extra["joined"] = update_joined(sport_league, processed_root)
+    report = write_report(report_path, runner=name, sport_league=sport_league.value, pump_stages=list(stages), changelog_seq=seq, **extra)
+    print(f"[Pump] Run report → {report_path}: {summarize(report)}")
+    return report
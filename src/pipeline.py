@@ -0,0 +1,98 @@
+import queue
+import threading
+from typing import Any, Callable, Iterable, Iterator, List
+
+PIPELINE_QUEUE_SIZE = 2  # items buffered between two stages
+
+_DONE = object()
+
+
+class _Failure:
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+def _put(q: queue.Queue, item, stop: threading.Event) -> bool:
+    """Blocking put that gives up once the pipeline is stopped"""
+    while not stop.is_set():
+        try:
+            q.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _produce(source: Iterable, out_q: queue.Queue, stop: threading.Event):
+    try:
+        for item in source:
+            if not _put(out_q, item, stop):
+                return
+    except BaseException as e:
+        _put(out_q, _Failure(e), stop)
+        return
+    _put(out_q, _DONE, stop)
+
+
+def _work(stage: Callable[[Any], Any], in_q: queue.Queue, out_q: queue.Queue, stop: threading.Event):
+    while True:
+        item = in_q.get()
+        if item is _DONE or isinstance(item, _Failure):
+            _put(out_q, item, stop)
+            return
+        try:
+            result = stage(item)
+        except BaseException as e:
+            _put(out_q, _Failure(e), stop)
+            return
+        if result is not None and not _put(out_q, result, stop):
+            return
+
+
+def run_pipeline(source: Iterable, stages: List[Callable[[Any], Any]], maxsize: int = PIPELINE_QUEUE_SIZE) -> Iterator:
+    """
+    Stream ``source`` through ``stages``, each on its own thread, connected by queues of
+    at most ``maxsize`` items. A slow stage holds back the ones before it instead of
+    letting items pile up, so only a handful are alive at once while every stage overlaps
+    with the others (e.g. disk writes with the next network fetch).
+
+    Args:
+        source (Iterable): Items to process; iterated on its own thread.
+        stages (List[Callable]): Applied in order; a stage returning None drops the item.
+        maxsize (int): Capacity of each queue between stages.
+
+    Yields:
+        Items coming out of the last stage, in source order. The first exception raised by
+        the source or a stage is re-raised here and the pipeline is shut down.
+    """
+    stop = threading.Event()
+    queues = [queue.Queue(maxsize=maxsize) for _ in range(len(stages) + 1)]
+    threads = [threading.Thread(target=_produce, args=(source, queues[0], stop), daemon=True)]
+    threads += [
+        threading.Thread(target=_work, args=(stage, queues[i], queues[i + 1], stop), daemon=True)
+        for i, stage in enumerate(stages)
+    ]
+    for thread in threads:
+        thread.start()
+    try:
+        while True:
+            item = queues[-1].get()
+            if item is _DONE:
+                return
+            if isinstance(item, _Failure):
+                raise item.error
+            yield item
+    finally:
+        stop.set()
+        for q in queues:
+            # unblock any stage waiting on a full or empty queue
+            while True:
+                try:
+                    q.get_nowait()
+                except queue.Empty:
+                    break
+        for q in queues[:-1]:
+            try:
+                q.put_nowait(_DONE)
+            except queue.Full:
+                pass
@@ -0,0 +1,182 @@
+"""
+What a pump run would touch and what is already stored, for the CLI's ``dry-run`` and
+``status`` commands. Everything here reads directory listings, manifests and the cached
+season calendar only: no pandas/pyarrow, no ESPN or Watson requests. Without a cached
+calendar (a fresh clone: ``.cache/`` is not committed) season lengths follow the 17/18-week
+rule and the current week is unknown.
+"""
+import json
+import os
+from typing import Dict, List, Optional
+
+from espn_api_orm.consts import ESPNSportLeagueTypes
+
+from .layout import (
+    find_year_for_season,
+    get_dataset_partitions,
+    get_legacy_seasons,
+    get_manifest_path,
+    get_seasons_to_update,
+    load_manifest,
+)
+from .season_calendar import get_current_week, get_regular_season_weeks
+
+PROJECTIONS_STAGE = "projections"
+WATSON_STAGE = "watson"
+PUMP_STAGES = (PROJECTIONS_STAGE, WATSON_STAGE)  # in dependency order: Watson picks its players from projections
+
+
+def projection_update_weeks(sport_league: ESPNSportLeagueTypes, season: int, current_season: int,
+                            current_week: int = None, has_processed: bool = True, offline: bool = False) -> Optional[List[int]]:
+    """
+    Weeks of a season the projections pump refetches: every regular-season week of a past
+    season; in the current season, the last complete week onwards (from week 1 if nothing
+    is stored yet), since ESPN keeps revising projections until a week is played.
+
+    Args:
+        sport_league (ESPNSportLeagueTypes): Sport/league.
+        season (int): Season to refresh.
+        current_season (int): Season in progress.
+        current_week (int): Week in progress (looked up when needed and not given).
+        has_processed (bool): Whether the season already has processed partitions.
+        offline (bool): Use the cached season calendar only (see ``src.season_calendar``).
+
+    Returns:
+        Optional[List[int]]: Week numbers, ascending; None when ``offline`` and the current week is unknown.
+    """
+    last_week = get_regular_season_weeks(sport_league, season, offline=offline)
+    if season != current_season or not has_processed:
+        return list(range(1, last_week + 1))
+    current_week = current_week or get_current_week(sport_league, offline=offline)
+    if current_week is None:
+        return None
+    return list(range(1 if current_week == 1 else current_week - 1, last_week + 1))
+
+
+def watson_kept_through_week(sport_league: ESPNSportLeagueTypes, season: int, current_season: int,
+                             current_week: int = None) -> Optional[int]:
+    """Last stored Watson week a run keeps as is; later weeks of the current season are dropped and refetched"""
+    if season != current_season:
+        return None
+    current_week = current_week or get_current_week(sport_league)
+    return 1 if current_week == 1 else current_week - 1
+
+
+def _weeks(partitions: List[dict], season: int) -> List[int]:
+    return sorted(p["week"] for p in partitions if p["season"] == season and p["week"] is not None)
+
+
+def format_weeks(weeks: List[int]) -> str:
+    """[1, 2, 3, 5, 7, 8] -> "1-3,5,7-8" """
+    runs = []
+    for week in sorted(weeks):
+        if runs and week == runs[-1][1] + 1:
+            runs[-1][1] = week
+        else:
+            runs.append([week, week])
+    return ",".join(str(a) if a == b else f"{a}-{b}" for a, b in runs) or "-"
+
+
+def plan_run(sport_league: ESPNSportLeagueTypes, stages=PUMP_STAGES, raw_root: str = "./raw",
+             processed_root: str = "./processed") -> Dict[str, Dict[int, dict]]:
+    """
+    Seasons and weeks a pump run would refresh, stage by stage, without running it.
+
+    Args:
+        sport_league (ESPNSportLeagueTypes): Sport/league.
+        stages: Stages to plan, any of ``PUMP_STAGES``.
+        raw_root (str): Raw snapshot root.
+        processed_root (str): Processed dataset root.
+
+    Returns:
+        Dict[str, Dict[int, dict]]: stage -> season -> plan. Projections plans list the weeks to
+        fetch; Watson plans give the last stored week kept (None: every stored week is kept). Plans
+        that depend on the current week have ``"unknown": True`` (and no weeks) when no calendar is cached.
+    """
+    sport_str, league_str = sport_league.value.split("/")
+    current_season = find_year_for_season(sport_league)
+    current_week = get_current_week(sport_league, offline=True)
+    plans = {}
+    if PROJECTIONS_STAGE in stages:
+        processed_proj_path = f"{processed_root}/{sport_str}/{league_str}/projections/"
+        stored = {p["season"] for p in get_dataset_partitions(processed_proj_path)} | set(get_legacy_seasons(processed_proj_path))
+        plans[PROJECTIONS_STAGE] = {}
+        for season in get_seasons_to_update(raw_root, sport_league):
+            weeks = projection_update_weeks(sport_league, season, current_season, current_week,
+                                            has_processed=season in stored, offline=True)
+            plans[PROJECTIONS_STAGE][season] = {"weeks": weeks or [], "unknown": weeks is None}
+    if WATSON_STAGE in stages:
+        unknown = current_week is None
+        plans[WATSON_STAGE] = {
+            season: {"keep_through_week": None if season == current_season and unknown
+                     else watson_kept_through_week(sport_league, season, current_season, current_week),
+                     "unknown": season == current_season and unknown}
+            for season in get_seasons_to_update(processed_root, sport_league, suffix="watson")
+        }
+    return plans
+
+
+def pump_status(sport_league: ESPNSportLeagueTypes, raw_root: str = "./raw", processed_root: str = "./processed",
+                manifest_root: str = "./manifests") -> dict:
+    """
+    What is stored for a sport/league, per season: raw snapshot weeks, processed week
+    partitions (or a legacy season file), projections week digests, Watson miss-index entries
+    and watermarked players, plus a summary of the last report of each runner and the last changelog sequence number.
+
+    Args:
+        sport_league (ESPNSportLeagueTypes): Sport/league.
+        raw_root (str): Raw snapshot root.
+        processed_root (str): Processed dataset root.
+        manifest_root (str): Manifest root.
+
+    Returns:
+        dict: {"current_season", "seasons": {season: {...}}, "reports": {runner: {...}}, "changelog_seq"}.
+    """
+    sport_str, league_str = sport_league.value.split("/")
+    raw_proj_path = f"{raw_root}/{sport_str}/{league_str}/projections/"
+    processed_path = f"{processed_root}/{sport_str}/{league_str}"
+    proj_partitions = get_dataset_partitions(f"{processed_path}/projections/")
+    watson_partitions = get_dataset_partitions(f"{processed_path}/watson/")
+    legacy = {
+        table: set(get_legacy_seasons(f"{processed_path}/{table}/")) for table in (PROJECTIONS_STAGE, WATSON_STAGE)
+    }
+    week_manifest = load_manifest(get_manifest_path(sport_league, "projections_weeks", manifest_root))
+
+    raw_seasons = [int(s) for s in os.listdir(raw_proj_path) if s.isdigit()] if os.path.isdir(raw_proj_path) else []
+    seasons = sorted(set(raw_seasons) | {p["season"] for p in proj_partitions + watson_partitions} | legacy[PROJECTIONS_STAGE] | legacy[WATSON_STAGE])
+    status = {}
+    for season in seasons:
+        season_raw_path = f"{raw_proj_path}{season}/"
+        raw_weeks = sorted(int(w) for w in os.listdir(season_raw_path) if w.isdigit()) if os.path.isdir(season_raw_path) else []
+        misses = load_manifest(get_manifest_path(sport_league, f"watson_misses/{season}", manifest_root))
+        watermarks = load_manifest(get_manifest_path(sport_league, f"watson_watermarks/{season}", manifest_root))
+        status[season] = {
+            "raw_weeks": raw_weeks,
+            "projections_weeks": _weeks(proj_partitions, season),
+            "projections_legacy": season in legacy[PROJECTIONS_STAGE],
+            "manifest_weeks": sorted(int(w) for w in week_manifest.get(str(season), {})),
+            "watson_weeks": _weeks(watson_partitions, season),
+            "watson_legacy": season in legacy[WATSON_STAGE],
+            "watson_misses": len(misses),
+            "watson_watermarks": len(watermarks.get("players", {})),
+        }
+
+    reports = {}
+    reports_path = f"{processed_path}/reports"
+    for file_name in sorted(os.listdir(reports_path)) if os.path.isdir(reports_path) else []:
+        if not file_name.endswith(".json"):
+            continue
+        try:
+            with open(f"{reports_path}/{file_name}", "r") as file:
+                report = json.load(file)
+        except (OSError, ValueError):
+            continue
+        reports[file_name[:-len(".json")]] = {
+            "finished_at": report.get("finished_at"),
+            "wall_s": report.get("wall_s"),
+            "requests": sum(s.get("requests", 0) for s in report.get("requests", {}).values()),
+            "counters": report.get("counters", {}),
+        }
+    changelog = load_manifest(get_manifest_path(sport_league, "changelog", manifest_root))
+    return {"current_season": find_year_for_season(sport_league), "seasons": status, "reports": reports,
+            "changelog_seq": changelog.get("last_seq", 0)}
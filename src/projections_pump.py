@@ -0,0 +1,190 @@
+import os
+from typing import List, Optional
+
+import pandas as pd
+from espn_api_orm.consts import ESPNSportLeagueTypes
+from espn_api_orm.league.api import ESPNLeagueAPI
+
+from .changelog import Changelog
+from .checkpoint import CHECKPOINT_DIR, Checkpoint
+from .consts import ESPN_S2, LEAGUE_ID, SWID
+from .fantasy_utils import ESPN_MAX_WORKERS, process_season_data
+from .http_cache import ResponseCache, cache_ttl
+from .manifest import frame_digest, get_manifest_path, load_manifest, partition_changes, save_manifest, upsert_partition
+from .pipeline import run_pipeline
+from .plan import projection_update_weeks
+from .query import partition_file_key
+from .schemas import PROJECTIONS_TABLE, apply_schema
+from .snapshots import find_snapshot, put_snapshot
+from .telemetry import count, timed
+from .utils import (
+    find_year_for_season,
+    get_current_week,
+    get_dataset,
+    get_dataset_partitions,
+    get_seasons_to_update,
+    put_dataset,
+)
+
+class ProjectionsPump:
+    """
+    ESPN projections for one sport/league, a season at a time: weeks are fetched,
+    snapshotted under ``raw_root`` and upserted into the processed week partitions. Row
+    changes of every partition written are recorded in ``changelog`` when one is given.
+    Finished weeks are checkpointed under ``checkpoint_root`` (None: not at all), so a run
+    that dies mid-season refetches only the weeks it had not stored; ``resume=False`` starts over.
+    """
+
+    def __init__(self, sport_league: ESPNSportLeagueTypes, raw_root: str = "./raw", processed_root: str = "./processed",
+                 response_cache: ResponseCache = None, changelog: Changelog = None,
+                 checkpoint_root: Optional[str] = CHECKPOINT_DIR, resume: bool = True):
+        self.sport_league = sport_league
+        sport_str, league_str = sport_league.value.split("/")
+        self.raw_root = raw_root
+        self.raw_proj_path = f"{raw_root}/{sport_str}/{league_str}/projections/"
+        self.processed_proj_path = f"{processed_root}/{sport_str}/{league_str}/projections/"
+        os.makedirs(self.raw_proj_path, exist_ok=True)
+        os.makedirs(self.processed_proj_path, exist_ok=True)
+
+        league_api = ESPNLeagueAPI(sport_str, league_str)
+        if not league_api.is_active():
+            print("Running in OffSeason")
+
+        self.current_season = find_year_for_season(sport_league)
+        self.response_cache = response_cache or ResponseCache()
+        self.changelog = changelog
+        self.checkpoint_root = checkpoint_root
+        self.resume = resume
+        self.manifest_path = get_manifest_path(sport_league, "projections_weeks")
+        self.week_manifest = load_manifest(self.manifest_path)
+
+    def seasons(self) -> List[int]:
+        update_seasons = get_seasons_to_update(self.raw_root, self.sport_league)
+        print(f"Running Projections Pump for: {self.sport_league.value} from {min(update_seasons)}-{max(update_seasons)}")
+        return update_seasons
+
+    def run_season(self, update_season: int, columns: List[str] = None) -> Optional[pd.DataFrame]:
+        """
+        Refresh one season's projections.
+
+        Args:
+            update_season (int): Season to refresh.
+            columns (List[str]): Columns of the season's rows to hand back (default: none).
+
+        Returns:
+            Optional[pd.DataFrame]: With ``columns``, the season's projections as now stored, ordered by
+            week: weeks fetched in this run come from memory, only the weeks not refetched are read from disk.
+        """
+        sport_league = self.sport_league
+        processed_proj_path = self.processed_proj_path
+        season_raw_proj_path = f"{self.raw_proj_path}{update_season}/"
+        os.makedirs(season_raw_proj_path, exist_ok=True)
+
+        has_processed = any(p["season"] == update_season for p in get_dataset_partitions(processed_proj_path))
+        season_manifest = self.week_manifest.setdefault(str(update_season), {})
+
+        # determine weeks to (re)build
+        current_week = get_current_week(sport_league) if update_season == self.current_season else None
+        update_weeks = projection_update_weeks(sport_league, update_season, self.current_season, current_week, has_processed)
+        # weeks a killed run already stored are not refetched; a checkpoint planned for other weeks is stale
+        checkpoint = None
+        fetch_weeks = update_weeks
+        if self.checkpoint_root is not None:
+            checkpoint = Checkpoint(sport_league, PROJECTIONS_TABLE, update_season, self.checkpoint_root,
+                                    fingerprint={"weeks": update_weeks}, resume=self.resume)
+            # a week counts as stored only while its partition is the one this run wrote: the workflow commits a
+            # killed job's partitions, and a checkout that lacks them (or holds other ones) refetches the week
+            stored = [week for week in update_weeks if week in checkpoint.done and checkpoint.state.get(str(week)) ==
+                      partition_file_key(processed_proj_path, {"season": update_season, "week": week})]
+            fetch_weeks = [week for week in update_weeks if week not in stored]
+            if checkpoint.resumed:
+                count("projections.weeks.resumed", len(update_weeks) - len(fetch_weeks))
+                print(f"[Projections] {sport_league.value} {update_season}: resuming, {len(update_weeks) - len(fetch_weeks)} weeks already stored")
+
+        @timed("projections.write_raw", rows=None)
+        def _write_raw(item):
+            # stage 2: snapshot weeks whose rows differ from the manifest; matching weeks pass through untouched
+            update_week, week_df = item
+            week_path = f"{season_raw_proj_path}{update_week}/"
+            if week_df.shape[0] == 0:
+                # nothing came back (an outage or a week not out yet): the stored snapshot and rows stand
+                count("projections.weeks.empty")
+                print(f"[Projections] {sport_league.value} {update_season} week {update_week}: empty fetch, stored week kept.")
+                return update_week, week_df, None, False
+            digest = frame_digest(week_df)
+            if digest == season_manifest.get(str(update_week)) and find_snapshot(week_path) is not None:
+                return update_week, week_df, digest, False
+            put_snapshot(week_path, week_df)
+            return update_week, week_df, digest, True
+
+        @timed("projections.write_dataset", rows=None)
+        def _write_dataset(item):
+            # stage 3: upsert the week into its own partition; untouched weeks are never read or rewritten
+            update_week, week_df, digest, changed = item
+            if not changed:
+                return update_week, week_df, digest, False, False
+            partition = {"season": update_season, "week": update_week}
+            stored_df = get_dataset(
+                processed_proj_path, filters=[("season", "=", update_season), ("week", "=", update_week)], table=PROJECTIONS_TABLE
+            )
+            upserted = upsert_partition(stored_df, week_df, partition, keys=["season", "week", "player_id"])
+            if upserted is stored_df and not stored_df.empty:
+                return update_week, week_df, digest, True, False
+            put_dataset(upserted, processed_proj_path, table=PROJECTIONS_TABLE)
+            self._record_changes(stored_df, upserted)
+            return update_week, week_df, digest, True, True
+
+        # stage 1 fetches weeks while earlier ones are still being written; each queue holds a couple of weeks
+        weeks = process_season_data(
+            LEAGUE_ID, update_season, fetch_weeks, swid=SWID, espn_s2=ESPN_S2, max_workers=ESPN_MAX_WORKERS,
+            as_frame=True, cache=self.response_cache,
+            ttl_for_week=lambda week: cache_ttl(update_season, self.current_season, week, current_week),
+        )
+        changed, written = 0, 0
+        handoff = {}
+        for update_week, week_df, digest, week_changed, wrote in run_pipeline(weeks, [_write_raw, _write_dataset]):
+            if columns is not None and week_df.shape[0] != 0:
+                handoff[update_week] = week_df[[c for c in columns if c in week_df.columns]]
+            if week_changed:
+                changed += 1
+                written += wrote
+                # only record a digest once its rows are safely in the dataset
+                season_manifest[str(update_week)] = digest
+                save_manifest(self.manifest_path, self.week_manifest)
+            if checkpoint is not None:
+                key = partition_file_key(processed_proj_path, {"season": update_season, "week": update_week})
+                checkpoint.save([update_week], state={str(update_week): key})
+        count("projections.weeks.changed", changed)
+        count("projections.partitions.written", written)
+
+        if not changed:
+            print(f"[Projections] {sport_league.value} {update_season}: No weeks changed upstream.")
+        else:
+            print(f"[Projections] Wrote {written} processed week partitions for {update_season} ({changed} changed weeks) → {processed_proj_path}season={update_season}/")
+        if checkpoint is not None:
+            checkpoint.clear()
+
+        if columns is None:
+            return None
+        # weeks before the refetched window (or stored before a resume) are read back, only those partitions and columns
+        kept_weeks = sorted(p["week"] for p in get_dataset_partitions(processed_proj_path)
+                            if p["season"] == update_season and p["week"] is not None and p["week"] not in handoff)
+        frames = []
+        if kept_weeks:
+            frames.append(get_dataset(processed_proj_path, columns=columns,
+                                      filters=[("season", "=", update_season), ("week", "in", kept_weeks)], table=PROJECTIONS_TABLE))
+        frames += [handoff[week] for week in sorted(handoff)]
+        frames = [f for f in frames if f.shape[0] != 0]
+        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+    def _record_changes(self, stored_df: pd.DataFrame, written_df: pd.DataFrame):
+        # compared as stored: the written rows are cast to the registry types like the stored ones were
+        if self.changelog is not None:
+            written_df = apply_schema(written_df, PROJECTIONS_TABLE)
+            self.changelog.record(PROJECTIONS_TABLE, partition_changes(stored_df, written_df, keys=["season", "week", "player_id"]))
+
+    def stats(self) -> dict:
+        return {"http_cache": self.response_cache.stats()}
+
+    def close(self):
+        print(f"[Projections] HTTP cache: {self.response_cache.stats()}")
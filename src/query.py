@@ -0,0 +1,278 @@
+import hashlib
+import json
+import os
+import struct
+import zlib
+from typing import Dict, Iterable, List, Optional, Set
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from .schemas import JOINED_TABLE, PROJECTIONS_TABLE, WATSON_TABLE, apply_schema
+from .telemetry import timed
+from .utils import DATASET_PARTITION_COLS, HIVE_NULL_PARTITION, _NULLABLE_TYPES, _dataset_files, get_dataset
+
+# A local cache rebuilt from the partition files on demand, so it never travels with the data:
+#   ./.cache/player_index/projections-3f2a9c81d04e.parquet
+PLAYER_INDEX_DIR = "./.cache/player_index"
+
+# Column a week leaderboard ranks by when none is given
+LEADERBOARD_COLUMNS = {
+    PROJECTIONS_TABLE: "projected_points",
+    WATSON_TABLE: "projection_score",
+    JOINED_TABLE: "projected_points",
+}
+
+
+def _file_key(path: str) -> str:
+    """
+    Identity of a partition file that survives a git checkout (which resets mtimes):
+    its size plus a CRC of the parquet footer, which holds every column chunk's
+    offsets and statistics and so changes whenever the rows do.
+    """
+    size = os.path.getsize(path)
+    with open(path, "rb") as file:
+        file.seek(size - 8)
+        footer_len = struct.unpack("<i", file.read(4))[0]
+        file.seek(size - 8 - footer_len)
+        footer = file.read(footer_len)
+    return f"{size}:{zlib.crc32(footer):08x}"
+
+
+def _partition_of(root: str, path: str) -> Dict[str, Optional[int]]:
+    parts = os.path.relpath(os.path.dirname(path), root).split(os.sep)
+    partition = dict(part.split("=", 1) for part in parts)
+    return {c: int(v) if v.lstrip("-").isdigit() else None for c, v in partition.items()}
+
+
+def dataset_file_keys(root: str, partition_cols=DATASET_PARTITION_COLS) -> Dict[str, str]:
+    """``_file_key`` of every partition file of a dataset, by path relative to its root"""
+    root = root.rstrip("/")
+    return {os.path.relpath(p, root): _file_key(p) for p in _dataset_files(root, partition_cols)}
+
+
+def partition_file_key(root: str, partition: dict) -> Optional[str]:
+    """``_file_key`` of one partition's file(s), e.g. {"season": 2024, "week": 5}; None if the partition is absent"""
+    path = f"{root.rstrip('/')}/" + "/".join(f"{c}={HIVE_NULL_PARTITION if v is None else v}" for c, v in partition.items())
+    if not os.path.isdir(path):
+        return None
+    files = sorted(name for name in os.listdir(path) if name.endswith(".parquet"))
+    return ",".join(_file_key(f"{path}/{name}") for name in files) or None
+
+
+def changed_weeks(root: str, keys: Dict[str, str], stored: Dict[str, str]) -> Dict[int, Set[int]]:
+    """
+    Season -> weeks whose partition file is new, rewritten or gone, comparing a dataset's current
+    ``dataset_file_keys`` with the ones a derived table was last built from.
+
+    Args:
+        root (str): Dataset root.
+        keys (Dict[str, str]): Current file keys.
+        stored (Dict[str, str]): File keys kept from the last build.
+
+    Returns:
+        Dict[int, Set[int]]: Changed weeks per season (season-level partitions are skipped).
+    """
+    weeks: Dict[int, Set[int]] = {}
+    for rel in set(keys) | set(stored):
+        if keys.get(rel) == stored.get(rel):
+            continue
+        partition = _partition_of(root.rstrip("/"), os.path.join(root.rstrip("/"), rel))
+        if partition.get("week") is not None:
+            weeks.setdefault(partition["season"], set()).add(partition["week"])
+    return weeks
+
+
+class PlayerIndex:
+    """
+    Persisted player_id → (season, week, row group) index over a partitioned dataset, kept
+    under ``index_dir`` (one file per dataset root) rather than next to the data it indexes.
+
+    ``refresh`` re-indexes only the partition files whose footer changed since the index
+    was written (reading just their player_id column) and forgets removed ones, so it
+    is cheap to call before every query and after every pump run.
+    """
+
+    def __init__(self, root: str, partition_cols=DATASET_PARTITION_COLS, index_dir: str = PLAYER_INDEX_DIR):
+        self.root = root.rstrip("/")
+        self.partition_cols = tuple(partition_cols)
+        digest = hashlib.sha1(os.path.abspath(self.root).encode()).hexdigest()[:12]
+        self.path = f"{index_dir}/{os.path.basename(self.root)}-{digest}.parquet"
+        self.files: Dict[str, str] = {}  # relative path -> _file_key
+        self.entries = pd.DataFrame({
+            "player_id": pd.Series([], dtype="int64"),
+            "file": pd.Series([], dtype="object"),
+            "row_group": pd.Series([], dtype="int32"),
+            **{c: pd.Series([], dtype="Int32") for c in self.partition_cols},
+        })
+        if os.path.exists(self.path):
+            table = pq.read_table(self.path)
+            self.files = json.loads(table.schema.metadata[b"files"])
+            self.entries = table.replace_schema_metadata(None).to_pandas(types_mapper=_NULLABLE_TYPES.get)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def _index_file(self, path: str) -> pd.DataFrame:
+        parquet_file = pq.ParquetFile(path)
+        row_groups = [parquet_file.metadata.row_group(i).num_rows for i in range(parquet_file.metadata.num_row_groups)]
+        player_ids = parquet_file.read(columns=["player_id"]).column("player_id").to_numpy(zero_copy_only=False)
+        partition = _partition_of(self.root, path)
+        frame = pd.DataFrame({
+            "player_id": player_ids.astype("int64"),
+            "file": os.path.relpath(path, self.root),
+            "row_group": np.repeat(np.arange(len(row_groups), dtype="int32"), row_groups),
+        })
+        for c in self.partition_cols:
+            frame[c] = pd.array([partition.get(c)] * len(frame), dtype="Int32")
+        return frame.drop_duplicates(["player_id", "row_group"])
+
+    @timed("query.refresh_index", rows=None)
+    def refresh(self) -> bool:
+        """
+        Bring the index in line with the partition files on disk.
+
+        Returns:
+            bool: True if anything changed (the index file was rewritten).
+        """
+        on_disk = {os.path.relpath(p, self.root): p for p in _dataset_files(self.root, self.partition_cols)}
+        keys = dataset_file_keys(self.root, self.partition_cols)
+        stale = {rel for rel, key in self.files.items() if keys.get(rel) != key}
+        fresh = [rel for rel, key in keys.items() if self.files.get(rel) != key]
+        if not stale and not fresh:
+            return False
+        kept = self.entries[~self.entries["file"].isin(stale)]
+        self.entries = pd.concat([kept] + [self._index_file(on_disk[rel]) for rel in fresh], ignore_index=True)
+        self.entries = self.entries.sort_values(["player_id", *self.partition_cols], kind="mergesort").reset_index(drop=True)
+        self.files = {rel: keys[rel] for rel in sorted(keys)}
+        self.save()
+        return True
+
+    def save(self):
+        table = pa.Table.from_pandas(self.entries, preserve_index=False)
+        table = table.replace_schema_metadata({"files": json.dumps(self.files, sort_keys=True)})
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        pq.write_table(table, tmp_path, compression="zstd")
+        os.replace(tmp_path, self.path)
+
+    def lookup(self, player_ids: Iterable[int]) -> pd.DataFrame:
+        """Index entries (player_id, file, row_group, season, week) for the given players"""
+        ids = np.asarray(list(player_ids), dtype="int64")
+        values = self.entries["player_id"].to_numpy()
+        # entries are sorted by player_id: each id is a contiguous run
+        lo, hi = np.searchsorted(values, ids, side="left"), np.searchsorted(values, ids, side="right")
+        positions = np.concatenate([np.arange(a, b) for a, b in zip(lo, hi)]) if len(ids) else np.array([], dtype="int64")
+        return self.entries.iloc[positions]
+
+
+class ProcessedQuery:
+    """
+    Read API over a processed table (``PROJECTIONS_TABLE``, ``WATSON_TABLE`` or ``JOINED_TABLE``) that
+    opens only the partition files and columns a question needs.
+
+        q = ProcessedQuery("./processed/football/nfl/projections/", PROJECTIONS_TABLE)
+        q.player_history(4362628)
+        q.week_leaderboard(2024, 10, position="WR", n=24)
+        q.as_of(2024, 10, player_ids=[4362628, 3117251])
+    """
+
+    def __init__(self, root: str, table: str, refresh: bool = True, index_dir: str = PLAYER_INDEX_DIR):
+        self.root = root.rstrip("/")
+        self.table = table
+        self.index = PlayerIndex(self.root, index_dir=index_dir)
+        if refresh:
+            self.index.refresh()
+
+    def _read(self, entries: pd.DataFrame, columns: List[str] = None) -> pd.DataFrame:
+        """Rows of ``entries``' players, reading only their files' listed row groups"""
+        tables = []
+        for rel, group in entries.groupby("file", sort=True):
+            parquet_file = pq.ParquetFile(f"{self.root}/{rel}")
+            physical = parquet_file.schema_arrow.names
+            read_columns = None if columns is None else [c for c in physical if c in set(columns) | {"player_id"}]
+            table = parquet_file.read_row_groups(sorted(group["row_group"].unique().tolist()), columns=read_columns)
+            player_ids = pa.array(group["player_id"].unique(), type=table.schema.field("player_id").type)
+            table = table.filter(pc.is_in(table.column("player_id"), value_set=player_ids))
+            for i, c in enumerate(self.index.partition_cols):
+                table = table.add_column(i, c, pa.array([group[c].iloc[0]] * table.num_rows, type=pa.int32()))
+            tables.append(table)
+        tables = [t for t in tables if t.num_rows != 0]
+        if not tables:
+            return pd.DataFrame()
+        # partitions may carry different stat columns; one concat and one conversion for all of them
+        table = pa.concat_tables(tables, promote_options="permissive")
+        df = apply_schema(table.to_pandas(types_mapper=_NULLABLE_TYPES.get), self.table)
+        if columns is not None:
+            keep = dict.fromkeys([*self.index.partition_cols, "player_id", *columns])
+            df = df[[c for c in keep if c in df.columns]]
+        return df.sort_values([*self.index.partition_cols, "player_id"], kind="mergesort").reset_index(drop=True)
+
+    @timed("query.player_history")
+    def player_history(self, player_id: int, seasons: List[int] = None, columns: List[str] = None) -> pd.DataFrame:
+        """
+        Every stored row of one player, oldest first.
+
+        Args:
+            player_id (int): ESPN player id.
+            seasons (List[int]): Only these seasons (default is all).
+            columns (List[str]): Columns to read besides season/week/player_id (default is all).
+
+        Returns:
+            pd.DataFrame: One row per (season, week) the player appears in.
+        """
+        entries = self.index.lookup([player_id])
+        if seasons is not None:
+            entries = entries[entries["season"].isin(seasons)]
+        return self._read(entries, columns)
+
+    @timed("query.week_leaderboard")
+    def week_leaderboard(self, season: int, week: int, position: str = None, n: int = 24, by: str = None,
+                         columns: List[str] = None) -> pd.DataFrame:
+        """
+        Top ``n`` players of one week by ``by`` (default: projected points), e.g. the top-24 WRs.
+
+        Args:
+            season (int): Season.
+            week (int): Week.
+            position (str): Only this position (default is all).
+            n (int): Rows to return.
+            by (str): Column to rank by, descending.
+            columns (List[str]): Extra columns to return.
+
+        Returns:
+            pd.DataFrame: Leaderboard, best first.
+        """
+        by = by or LEADERBOARD_COLUMNS[self.table]
+        name = "full_name" if self.table == WATSON_TABLE else "name"
+        wanted = list(dict.fromkeys(["player_id", name, "position", "team", by, *(columns or [])]))
+        filters = [("season", "=", season), ("week", "=", week)]
+        if position is not None:
+            filters.append(("position", "=", position))
+        df = get_dataset(self.root, columns=["season", "week", *wanted], filters=filters, table=self.table)
+        if df.shape[0] == 0:
+            return df
+        return df.sort_values(by, ascending=False, kind="mergesort", na_position="last").head(n).reset_index(drop=True)
+
+    @timed("query.as_of")
+    def as_of(self, season: int, week: int, player_ids: Iterable[int] = None, columns: List[str] = None) -> pd.DataFrame:
+        """
+        Each player's latest row in ``season`` at or before ``week``.
+
+        Args:
+            season (int): Season.
+            week (int): Week the snapshot is taken at.
+            player_ids (Iterable[int]): Only these players (default is everyone in the season).
+            columns (List[str]): Columns to read besides season/week/player_id (default is all).
+
+        Returns:
+            pd.DataFrame: One row per player.
+        """
+        entries = self.index.entries if player_ids is None else self.index.lookup(player_ids)
+        entries = entries[(entries["season"] == season) & (entries["week"] <= week)]
+        # the index already knows each player's latest week, so only those weeks' files are read
+        latest = entries.sort_values(["player_id", "week"], kind="mergesort").drop_duplicates(["player_id"], keep="last")
+        return self._read(latest, columns)
@@ -0,0 +1,113 @@
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Dict, Iterator, List, Tuple
+
+import pandas as pd
+
+from .schemas import PROJECTIONS_TABLE, apply_schema
+from .snapshots import find_snapshot, get_snapshot
+from .utils import drop_dataset_partition, get_dataset_partitions, put_dataset
+
+REBUILD_MAX_WORKERS = os.cpu_count() or 2
+
+
+def iter_raw_weeks(raw_root: str, seasons: List[int] = None) -> Iterator[Tuple[int, int, str]]:
+    """
+    Walk a raw projections tree ({season}/{week}/players.*) in season/week order.
+
+    Args:
+        raw_root (str): Raw projections root, e.g. ./raw/football/nfl/projections/.
+        seasons (List[int]): Only these seasons (default is every season on disk).
+
+    Returns:
+        Iterator[Tuple[int, int, str]]: (season, week, snapshot path) per week with a snapshot.
+    """
+    if not os.path.isdir(raw_root):
+        return
+    season_dirs = sorted(int(s) for s in os.listdir(raw_root) if s.isdigit())
+    for season in season_dirs:
+        if seasons is not None and season not in seasons:
+            continue
+        season_path = f"{raw_root.rstrip('/')}/{season}"
+        for week in sorted(int(w) for w in os.listdir(season_path) if w.isdigit()):
+            path = find_snapshot(f"{season_path}/{week}")
+            if path is not None:
+                yield season, week, path
+
+
+def snapshot_to_week_frame(path: str, season: int, week: int) -> pd.DataFrame:
+    """
+    Processed rows for one week from its raw snapshot. Snapshots hold the flattened
+    player rows with null cells omitted, so this is the place to re-apply any row-level fix.
+    """
+    df = get_snapshot(path)
+    if df.shape[0] == 0:
+        return df
+    df["season"] = season
+    df["week"] = week
+    return apply_schema(df, PROJECTIONS_TABLE)
+
+
+def _rebuild_week(path: str, season: int, week: int, processed_root: str) -> Tuple[int, int, int]:
+    """Worker: transform one week and write its partition, so only row counts travel back to the parent"""
+    df = snapshot_to_week_frame(path, season, week)
+    if df.shape[0] == 0:
+        drop_dataset_partition(processed_root, {"season": season, "week": week})
+    else:
+        put_dataset(df, processed_root, table=PROJECTIONS_TABLE)
+    return season, week, df.shape[0]
+
+
+def rebuild_projections(raw_root: str, processed_root: str, seasons: List[int] = None,
+                        max_workers: int = REBUILD_MAX_WORKERS) -> Dict[int, dict]:
+    """
+    Regenerate the processed projections dataset from raw week snapshots, without network.
+
+    Weeks of every season go through one process pool; at most ``2 * max_workers`` weeks are
+    in flight so memory stays bounded however many seasons are rebuilt. Processed partitions
+    of a rebuilt season with no raw snapshot are dropped. Legacy season files are not touched;
+    the entry points migrate them first (``migrate_processed_tables``).
+
+    Args:
+        raw_root (str): Raw projections root, e.g. ./raw/football/nfl/projections/.
+        processed_root (str): Processed projections dataset root.
+        seasons (List[int]): Only rebuild these seasons (default is every season on disk).
+        max_workers (int): Worker processes.
+
+    Returns:
+        Dict[int, dict]: Per season: weeks, rows and wall seconds from first submit to last write.
+    """
+    weeks = list(iter_raw_weeks(raw_root, seasons))
+    remaining = {}
+    for season, _, _ in weeks:
+        remaining[season] = remaining.get(season, 0) + 1
+    report = {season: {"weeks": 0, "rows": 0, "seconds": 0.0} for season in remaining}
+    started = {}
+
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        pending = set()
+        queue = iter(weeks)
+        while True:
+            for season, week, path in queue:
+                started.setdefault(season, time.perf_counter())
+                pending.add(pool.submit(_rebuild_week, path, season, week, processed_root))
+                if len(pending) >= 2 * max_workers:
+                    break
+            if not pending:
+                break
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                season, week, rows = future.result()
+                report[season]["weeks"] += 1
+                report[season]["rows"] += rows
+                remaining[season] -= 1
+                if remaining[season] == 0:
+                    report[season]["seconds"] = round(time.perf_counter() - started[season], 3)
+                    print(f"[Rebuild] {season}: {report[season]['weeks']} weeks, {report[season]['rows']} rows in {report[season]['seconds']}s")
+
+    rebuilt = {(season, week) for season, week, _ in weeks}
+    for partition in get_dataset_partitions(processed_root):
+        if partition["season"] in report and (partition["season"], partition["week"]) not in rebuilt:
+            drop_dataset_partition(processed_root, partition)
+    return report
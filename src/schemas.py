@@ -0,0 +1,287 @@
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+PROJECTIONS_TABLE = "projections"
+WATSON_TABLE = "watson"
+FEATURES_TABLE = "projection_features"
+JOINED_TABLE = "projections_watson"
+JOIN_KEYS = ["season", "week", "player_id"]
+WATSON_PREFIX = "watson_"
+
+# Logical column types: low-cardinality strings are dictionary encoded, stats are float32,
+# ids/weeks/ranks int32 and Watson's "0"/"1" flags booleans; all nullable
+CATEGORY = "category"
+FLOAT32 = "float32"
+INT32 = "int32"
+BOOL = "bool"
+
+_PANDAS_TYPES = {
+    CATEGORY: "category",
+    FLOAT32: pd.Float32Dtype(),
+    INT32: pd.Int32Dtype(),
+    BOOL: pd.BooleanDtype(),
+}
+# Dictionary columns are stored as plain strings (parquet dictionary-encodes each file's
+# column chunks itself, whereas an Arrow dictionary would carry the whole frame's values
+# into every partition file) and read back as dictionaries
+_ARROW_TYPES = {
+    CATEGORY: pa.dictionary(pa.int32(), pa.string()),
+    FLOAT32: pa.float32(),
+    INT32: pa.int32(),
+    BOOL: pa.bool_(),
+}
+_STORAGE_TYPES = dict(_ARROW_TYPES, **{CATEGORY: pa.string()})
+_TRUE = {"1", "true", "t", "yes", "y"}
+_FALSE = {"0", "false", "f", "no", "n"}
+
+TABLE_SCHEMAS: Dict[str, Dict[str, str]] = {
+    PROJECTIONS_TABLE: {
+        "season": INT32,
+        "week": INT32,
+        "player_id": INT32,
+        "name": CATEGORY,
+        "position": CATEGORY,
+        "team": CATEGORY,
+        "percent_owned": FLOAT32,
+        "percent_started": FLOAT32,
+        "total_points": FLOAT32,
+        "projected_total_points": FLOAT32,
+        "avg_points": FLOAT32,
+        "projected_avg_points": FLOAT32,
+        "last_updated": CATEGORY,
+        "points": FLOAT32,
+        "avg_points_week": FLOAT32,
+        "projected_points": FLOAT32,
+        "PPR_draft_rank": INT32,
+        "STANDARD_draft_rank": INT32,
+        "draft_auction_value": INT32,
+        "community_ADP": FLOAT32,
+    },
+    WATSON_TABLE: {
+        "season": INT32,
+        "week": INT32,
+        "player_id": INT32,
+        "actual_points": FLOAT32,
+        "set_end": CATEGORY,
+        "data_timestamp": CATEGORY,
+        "opponent_name": CATEGORY,
+        "opposition_rank": FLOAT32,
+        "full_name": CATEGORY,
+        "position": CATEGORY,
+        "is_on_injured_reserve": BOOL,
+        "is_suspended": BOOL,
+        "is_on_bye": BOOL,
+        "is_free_agent": BOOL,
+        "current_rank": INT32,
+        "injury_status_date": CATEGORY,
+        "projection_model_type": CATEGORY,
+        "projection_score": FLOAT32,
+        "projection_distribution_name": CATEGORY,
+        "projection_low_score": FLOAT32,
+        "projection_high_score": FLOAT32,
+        "projection_simulation_projection": FLOAT32,
+        "breakout_likelihood": FLOAT32,
+        "bust_likelihood": FLOAT32,
+        "play_with_injury_likelihood": FLOAT32,
+        "play_without_injury_likelihood": FLOAT32,
+    },
+    FEATURES_TABLE: {
+        "season": INT32,
+        "week": INT32,
+        "player_id": INT32,
+        "projection_error": FLOAT32,
+        "percent_owned_delta": FLOAT32,
+        "points_mean_3": FLOAT32,
+        "projected_points_mean_3": FLOAT32,
+        "projection_error_mean_3": FLOAT32,
+        "abs_projection_error_mean_3": FLOAT32,
+        "avg_points_week_mean_3": FLOAT32,
+        "percent_owned_delta_3": FLOAT32,
+        "points_mean_5": FLOAT32,
+        "projected_points_mean_5": FLOAT32,
+        "projection_error_mean_5": FLOAT32,
+        "abs_projection_error_mean_5": FLOAT32,
+        "avg_points_week_mean_5": FLOAT32,
+        "percent_owned_delta_5": FLOAT32,
+    },
+}
+
+# ESPN projections ⋈ Watson on JOIN_KEYS: the projections' columns as they are, then Watson's
+# prefixed (both sides carry a position, and names/teams differ in spelling)
+TABLE_SCHEMAS[JOINED_TABLE] = {
+    **TABLE_SCHEMAS[PROJECTIONS_TABLE],
+    **{f"{WATSON_PREFIX}{c}": t for c, t in TABLE_SCHEMAS[WATSON_TABLE].items() if c not in JOIN_KEYS},
+}
+
+# Row order within a stored partition: the same rows always make the same file (stable digests and
+# git diffs), and joins walk two partitions in step (see ``src.joined.merge_join``)
+TABLE_SORT_KEYS: Dict[str, List[str]] = {
+    PROJECTIONS_TABLE: ["player_id"],
+    WATSON_TABLE: ["player_id"],
+    FEATURES_TABLE: ["player_id"],
+    JOINED_TABLE: ["player_id"],
+}
+
+
+def _drift_type(column: str, kind: str) -> str:
+    """
+    Logical type of a column the registry does not list (e.g. a new ESPN breakdown stat),
+    decided from its name and value kind only so every partition agrees on it.
+    """
+    if column.startswith(("actual_", "projected_")) or kind in ("f", "i", "u"):
+        return FLOAT32
+    if kind == "b":
+        return BOOL
+    return CATEGORY
+
+
+def _arrow_kind(type_: pa.DataType) -> str:
+    if pa.types.is_dictionary(type_):
+        return "O"
+    if pa.types.is_floating(type_):
+        return "f"
+    if pa.types.is_integer(type_):
+        return "i"
+    if pa.types.is_boolean(type_):
+        return "b"
+    return "O"
+
+
+def column_types(table: str, columns: Dict[str, str]) -> Dict[str, str]:
+    """
+    Logical type per column in the table's canonical order.
+
+    Args:
+        table (str): Registry table name.
+        columns (Dict[str, str]): Column -> numpy kind ("f", "i", "u", "b" or "O") of the values at hand.
+
+    Returns:
+        Dict[str, str]: Registry columns present first, in registry order, then drifted columns sorted by name.
+    """
+    schema = TABLE_SCHEMAS[table]
+    known = {c: t for c, t in schema.items() if c in columns}
+    drift = {c: _drift_type(c, columns[c]) for c in sorted(c for c in columns if c not in schema)}
+    return {**known, **drift}
+
+
+def _to_boolean(series: pd.Series) -> pd.Series:
+    if series.dtype == pd.BooleanDtype():
+        return series
+    if pd.api.types.is_bool_dtype(series.dtype):
+        return series.astype(pd.BooleanDtype())
+    text = series.astype("string").str.strip().str.lower()
+    out = pd.Series(pd.NA, index=series.index, dtype=pd.BooleanDtype())
+    out[text.isin(_TRUE).fillna(False).to_numpy(dtype=bool)] = True
+    out[text.isin(_FALSE).fillna(False).to_numpy(dtype=bool)] = False
+    return out
+
+
+def _to_category(series: pd.Series) -> pd.Series:
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        categories = series.cat.categories
+        if categories.dtype == object and all(isinstance(c, str) for c in categories):
+            return series
+    values = series.astype(object)
+    if pd.api.types.infer_dtype(values, skipna=True) not in ("string", "empty"):
+        values = values.where(series.notna(), None).map(lambda v: v if v is None or isinstance(v, str) else str(v))
+    return values.astype("category")
+
+
+def _to_int32(series: pd.Series) -> pd.Series:
+    """Nullable int32, rounding float values (Watson ranks and weeks can arrive as ``3.5`` or ``"5.0"``)"""
+    values = pd.to_numeric(series, errors="coerce")
+    if values.dtype.kind == "f":
+        values = np.round(values.to_numpy(dtype="float64", na_value=np.nan))
+        values[~np.isfinite(values)] = np.nan
+        values = pd.Series(values, index=series.index)
+    return values.astype(pd.Int32Dtype())
+
+
+def _frame_kinds(df: pd.DataFrame) -> Dict[str, str]:
+    return {c: "O" if isinstance(df[c].dtype, pd.CategoricalDtype) else df[c].dtype.kind for c in df.columns}
+
+
+def apply_schema(df: pd.DataFrame, table: str) -> pd.DataFrame:
+    """
+    Cast a frame to its table's registry dtypes: dictionary-encoded strings, float32 stats,
+    int32 ids/weeks and boolean flags, columns in canonical order. Columns the registry does
+    not know get a type from their name and values (see ``column_types``), so schema drift
+    resolves the same way in every week.
+
+    Args:
+        df (pd.DataFrame): Frame to cast (not modified).
+        table (str): Registry table name (e.g. ``PROJECTIONS_TABLE``).
+
+    Returns:
+        pd.DataFrame: Cast frame.
+    """
+    if df.shape[1] == 0:
+        return df
+    # a drifted column without a single value says nothing about its type; leave it out
+    kinds = {c: k for c, k in _frame_kinds(df).items() if c in TABLE_SCHEMAS[table] or df[c].notna().any()}
+    types = column_types(table, kinds)
+    casts = {}
+    for column, logical in types.items():
+        series = df[column]
+        if logical == CATEGORY:
+            cast = _to_category(series)
+        elif logical == BOOL:
+            cast = _to_boolean(series)
+        elif series.dtype == _PANDAS_TYPES[logical]:
+            continue
+        elif logical == INT32:
+            cast = _to_int32(series)
+        elif series.dtype.kind == "O":
+            cast = pd.to_numeric(series, errors="coerce").astype(_PANDAS_TYPES[logical])
+        else:
+            cast = series.astype(_PANDAS_TYPES[logical])
+        if cast is not series:
+            casts[column] = cast
+    if 2 * len(casts) > len(types):
+        # freshly built rows: nearly every column changes, so assemble the frame once
+        return pd.DataFrame({c: casts.get(c, df[c]) for c in types}, index=df.index)
+    # stored rows come back mostly typed: share the columns that are, replace the rest
+    out = (df if list(types) == list(df.columns) else df[list(types)]).copy(deep=False)
+    for column, cast in casts.items():
+        out[column] = cast
+    return out
+
+
+def arrow_schema(table: str, fields: List[pa.Field]) -> pa.Schema:
+    """
+    Arrow schema the table is stored with, for a set of stored/incoming fields.
+
+    Args:
+        table (str): Registry table name.
+        fields (List[pa.Field]): Fields as they are (their names and value kinds are used).
+
+    Returns:
+        pa.Schema: Registry-typed schema in canonical column order.
+    """
+    kinds = {}
+    for field in fields:
+        # an all-null column (arrow null type) only keeps the name; a typed fragment decides the kind
+        if kinds.get(field.name) is None:
+            kinds[field.name] = None if pa.types.is_null(field.type) else _arrow_kind(field.type)
+    return pa.schema([(c, _ARROW_TYPES[t]) for c, t in column_types(table, kinds).items()])
+
+
+def to_arrow(df: pd.DataFrame, table: str) -> pa.Table:
+    """
+    Registry-typed Arrow table for a frame, without pandas metadata.
+
+    Args:
+        df (pd.DataFrame): Frame to convert.
+        table (str): Registry table name.
+
+    Returns:
+        pa.Table: Table in the registry's storage types (dictionary columns as strings), rows in the table's sort order.
+    """
+    df = apply_schema(df, table)
+    schema = pa.schema([(c, _STORAGE_TYPES[t]) for c, t in column_types(table, _frame_kinds(df)).items()])
+    arrow_table = pa.Table.from_pandas(df, schema=schema, preserve_index=False).replace_schema_metadata(None)
+    sort_keys = [c for c in TABLE_SORT_KEYS.get(table, []) if c in arrow_table.column_names]
+    return arrow_table.sort_by([(c, "ascending") for c in sort_keys]) if sort_keys else arrow_table
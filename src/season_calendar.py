@@ -0,0 +1,149 @@
+import bisect
+import datetime
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from espn_api_orm.consts import ESPNSportLeagueTypes
+
+from .layout import find_year_for_season
+
+CALENDAR_DIR = "./.cache/calendar"
+CALENDAR_TTL = 24 * 60 * 60  # the current season's table is refetched daily; past seasons never
+CALENDAR_RETRY_S = 15 * 60  # after a failed refetch the stale table is served from memory this long
+CALENDAR_MAX_WORKERS = 8
+SEASON_TYPES = (2, 3)  # regular season, postseason
+POSTSEASON_WEEK = 18
+NFL_EXPANSION_SEASON = 2021  # first 18-week regular season; season lengths without a calendar follow it
+ESPN_DATE_FORMAT = "%Y-%m-%dT%H:%MZ"
+
+_tables: Dict[Tuple[str, int], dict] = {}
+_lock = threading.Lock()
+
+
+def get_calendar_path(sport_league: ESPNSportLeagueTypes, season: int, root_path: str = CALENDAR_DIR) -> str:
+    return f"{root_path}/{sport_league.value}/{season}.json"
+
+
+def fetch_week_table(sport_league: ESPNSportLeagueTypes, season: int) -> List[dict]:
+    """
+    Start/end dates of every regular and postseason week of a season, in calendar order.
+    Week details are requested concurrently instead of one by one.
+
+    Args:
+        sport_league (ESPNSportLeagueTypes): Sport/league.
+        season (int): Season year.
+
+    Returns:
+        List[dict]: {"season_type", "week", "start", "end"} per week, dates as ESPN formats them.
+    """
+    from espn_api_orm.calendar.api import ESPNCalendarAPI  # only needed when the cached table is missing or stale
+
+    sport, league = sport_league.value.split('/')
+    calendar_api = ESPNCalendarAPI(sport, league, season=season)
+    base_url = f"{calendar_api._core_url}/{calendar_api.sport.value}/leagues/{calendar_api.league}/seasons/{season}"
+    keys = [(season_type, week) for season_type in SEASON_TYPES for week in (calendar_api.get_weeks(season_type) or [])]
+    with ThreadPoolExecutor(max_workers=CALENDAR_MAX_WORKERS) as pool:
+        details = list(pool.map(lambda key: calendar_api.api_request(f"{base_url}/types/{key[0]}/weeks/{key[1]}"), keys))
+    return [
+        {"season_type": season_type, "week": week, "start": res["startDate"], "end": res["endDate"]}
+        for (season_type, week), res in zip(keys, details)
+        if res is not None
+    ]
+
+
+def _load_table(sport_league: ESPNSportLeagueTypes, season: int, root_path: str = CALENDAR_DIR,
+                offline: bool = False) -> Optional[dict]:
+    """
+    Week table from memory, then disk, then ESPN; persisted after every successful fetch.
+    ``offline`` never fetches: a stored table is used however old, and None means none is cached.
+    """
+    key = (sport_league.value, season)
+    with _lock:
+        table = _tables.get(key)
+        if table is not None and (offline or table["immutable"] or time.time() - table["fetched_at"] < CALENDAR_TTL
+                                  or time.time() < table.get("retry_at", 0)):
+            return table
+
+        path = get_calendar_path(sport_league, season, root_path)
+        try:
+            with open(path, "r") as file:
+                stored = json.load(file)
+        except (OSError, ValueError):
+            stored = None
+        if stored is not None and (offline or stored["immutable"] or time.time() - stored["fetched_at"] < CALENDAR_TTL):
+            table = stored
+        elif offline:
+            return None
+        else:
+            weeks = fetch_week_table(sport_league, season)
+            if weeks:
+                table = {
+                    "season": season,
+                    "fetched_at": time.time(),
+                    "immutable": season < find_year_for_season(sport_league),
+                    "weeks": weeks,
+                }
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                tmp_path = f"{path}.tmp"
+                with open(tmp_path, "w") as file:
+                    json.dump(table, file, indent=2)
+                os.replace(tmp_path, path)
+            elif stored is None:
+                raise RuntimeError(f"Could not fetch the {sport_league.value} {season} calendar")
+            else:
+                # ESPN unavailable: a stale table beats none, but it stays stale on disk so the next run
+                # refetches it, and this process retries after a short back-off rather than a full TTL
+                print(f"[Calendar] {sport_league.value} {season}: refetch failed, using the week table "
+                      f"from {(time.time() - stored['fetched_at']) / 3600:.0f}h ago")
+                table = {**stored, "retry_at": time.time() + CALENDAR_RETRY_S}
+
+        table["end_dates"] = [datetime.datetime.strptime(w["end"], ESPN_DATE_FORMAT) for w in table["weeks"]]
+        _tables[key] = table
+        return table
+
+
+def get_current_week(sport_league: ESPNSportLeagueTypes, date: datetime.datetime = None,
+                     offline: bool = False) -> Optional[int]:
+    """
+    Week of the current season that ``date`` (default now, UTC) falls in: the first week
+    whose end is still ahead. Any postseason week, and the time after the season, count as week 18.
+
+    Args:
+        sport_league (ESPNSportLeagueTypes): Sport/league.
+        date (datetime.datetime): Naive UTC datetime (default is now).
+        offline (bool): Answer from the cached calendar only, without requests.
+
+    Returns:
+        Optional[int]: Week number; None when ``offline`` and the season's calendar is not cached.
+    """
+    today = datetime.datetime.utcnow() if date is None else date
+    table = _load_table(sport_league, find_year_for_season(sport_league, today), offline=offline)
+    if table is None:
+        return None
+    i = bisect.bisect_right(table["end_dates"], today)
+    if i == len(table["weeks"]):
+        return POSTSEASON_WEEK
+    week = table["weeks"][i]
+    return POSTSEASON_WEEK if week["season_type"] == 3 else week["week"]
+
+
+def get_regular_season_weeks(sport_league: ESPNSportLeagueTypes, season: int, offline: bool = False) -> int:
+    """
+    Number of regular-season weeks in a season (17 before the NFL's 2021 expansion, 18 since).
+
+    Args:
+        sport_league (ESPNSportLeagueTypes): Sport/league.
+        season (int): Season year.
+        offline (bool): Answer from the cached calendar only; without one, the 17/18 rule decides.
+
+    Returns:
+        int: Regular-season week count.
+    """
+    table = _load_table(sport_league, season, offline=offline)
+    if table is None:
+        return 17 if season < NFL_EXPANSION_SEASON else 18
+    return max((w["week"] for w in table["weeks"] if w["season_type"] == 2), default=POSTSEASON_WEEK)
@@ -0,0 +1,182 @@
+import json
+import mmap
+import os
+from typing import List, Optional, Union
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+from .utils import frame_to_records, put_json_file
+
+SNAPSHOT_NAME = "players"
+
+# Raw weekly snapshot formats, in the order a reader looks for them
+SNAPSHOT_NDJSON_ZST = "ndjson.zst"
+SNAPSHOT_ARROW = "arrow"
+SNAPSHOT_JSON = "json"
+SNAPSHOT_FORMATS = (SNAPSHOT_NDJSON_ZST, SNAPSHOT_ARROW, SNAPSHOT_JSON)
+DEFAULT_SNAPSHOT_FORMAT = SNAPSHOT_NDJSON_ZST
+
+# One row per line compresses ~14x at level 19; weeks are written once, so the slow level is affordable
+ZSTD_LEVEL = 19
+
+
+def _zstandard():
+    try:
+        import zstandard
+    except ImportError as e:
+        raise ImportError(
+            f"The {SNAPSHOT_NDJSON_ZST} snapshot format needs the 'zstandard' package; "
+            f"install it or use format='{SNAPSHOT_ARROW}'"
+        ) from e
+    return zstandard
+
+
+def get_snapshot_path(week_path: str, fmt: str = DEFAULT_SNAPSHOT_FORMAT) -> str:
+    """
+    Path of a week's raw snapshot in the given format.
+
+    Args:
+        week_path (str): Directory of the week (e.g. ./raw/football/nfl/projections/2024/5/).
+        fmt (str): One of SNAPSHOT_FORMATS.
+
+    Returns:
+        str: Snapshot file path.
+    """
+    if fmt not in SNAPSHOT_FORMATS:
+        raise ValueError(f"Unknown snapshot format {fmt!r}; expected one of {SNAPSHOT_FORMATS}")
+    return f"{week_path.rstrip('/')}/{SNAPSHOT_NAME}.{fmt}"
+
+
+def find_snapshot(week_path: str) -> Optional[str]:
+    """
+    Locate the raw snapshot of a week in whichever format it was written.
+
+    Args:
+        week_path (str): Directory of the week.
+
+    Returns:
+        Optional[str]: Snapshot file path, or None if the week has no snapshot.
+    """
+    for fmt in SNAPSHOT_FORMATS:
+        path = get_snapshot_path(week_path, fmt)
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def _snapshot_format(path: str) -> str:
+    for fmt in SNAPSHOT_FORMATS:
+        if path.endswith(f".{fmt}"):
+            return fmt
+    raise ValueError(f"Not a snapshot file: {path}")
+
+
+def put_snapshot(week_path: str, rows: Union[pd.DataFrame, List[dict]], fmt: str = DEFAULT_SNAPSHOT_FORMAT) -> str:
+    """
+    Write a week's flattened player rows as a raw snapshot, replacing the week's
+    snapshot in any other format.
+
+    ndjson.zst keeps the sparse row dicts of players.json (null cells omitted), one per
+    line; arrow stores the frame columnar with zstd buffers so it can be memory-mapped.
+
+    Args:
+        week_path (str): Directory of the week.
+        rows (Union[pd.DataFrame, List[dict]]): Flattened player rows for the week.
+        fmt (str): One of SNAPSHOT_FORMATS.
+
+    Returns:
+        str: Path of the written snapshot.
+    """
+    os.makedirs(week_path, exist_ok=True)
+    path = get_snapshot_path(week_path, fmt)
+    tmp_path = f"{path}.tmp"
+    if fmt == SNAPSHOT_ARROW:
+        df = rows if isinstance(rows, pd.DataFrame) else pd.DataFrame(rows)
+        table = pa.Table.from_pandas(df, preserve_index=False).replace_schema_metadata(None)
+        feather.write_feather(table, tmp_path, compression="zstd", compression_level=ZSTD_LEVEL)
+    elif fmt == SNAPSHOT_NDJSON_ZST:
+        records = frame_to_records(rows) if isinstance(rows, pd.DataFrame) else rows
+        lines = "".join(json.dumps(row, separators=(",", ":")) + "\n" for row in records)
+        with open(tmp_path, "wb") as file:
+            file.write(_zstandard().ZstdCompressor(level=ZSTD_LEVEL).compress(lines.encode()))
+    else:
+        put_json_file(tmp_path, frame_to_records(rows) if isinstance(rows, pd.DataFrame) else rows)
+    os.replace(tmp_path, path)
+
+    for other in SNAPSHOT_FORMATS:
+        other_path = get_snapshot_path(week_path, other)
+        if other != fmt and os.path.exists(other_path):
+            os.remove(other_path)
+    return path
+
+
+def get_snapshot_records(path: str) -> List[dict]:
+    """
+    Read a raw snapshot file back into the row dicts it was written from.
+
+    Args:
+        path (str): Snapshot file path (see find_snapshot).
+
+    Returns:
+        List[dict]: One dict per player row.
+    """
+    fmt = _snapshot_format(path)
+    if fmt == SNAPSHOT_ARROW:
+        return frame_to_records(get_snapshot(path))
+    with open(path, "rb") as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return []
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            if fmt == SNAPSHOT_JSON:
+                return json.loads(buffer[:])
+            with _zstandard().ZstdDecompressor().stream_reader(buffer) as reader:
+                data = reader.read().rstrip(b"\n")
+    # newlines inside values are escaped, so the lines join into one array for a single parse
+    return json.loads(b"[" + data.replace(b"\n", b",") + b"]") if data else []
+
+
+def get_snapshot(path: str) -> pd.DataFrame:
+    """
+    Read a raw snapshot file into a DataFrame. Arrow snapshots are memory-mapped
+    rather than read into Python buffers.
+
+    Args:
+        path (str): Snapshot file path (see find_snapshot).
+
+    Returns:
+        pd.DataFrame: Flattened player rows for the week.
+    """
+    if _snapshot_format(path) == SNAPSHOT_ARROW:
+        with pa.memory_map(path, "r") as source:
+            return pa.ipc.open_file(source).read_all().to_pandas()
+    return pd.DataFrame(get_snapshot_records(path))
+
+
+def migrate_snapshots(root: str, fmt: str = DEFAULT_SNAPSHOT_FORMAT) -> dict:
+    """
+    One-shot conversion of every week snapshot under ``root``
+    ({season}/{week}/players.*) into ``fmt``; the old files are removed.
+
+    Args:
+        root (str): Raw projections root, e.g. ./raw/football/nfl/projections/.
+        fmt (str): Target format.
+
+    Returns:
+        dict: Number of weeks migrated and bytes before/after.
+    """
+    stats = {"weeks": 0, "bytes_before": 0, "bytes_after": 0}
+    for dirpath, _, file_names in sorted(os.walk(root)):
+        path = find_snapshot(dirpath) if any(f.startswith(f"{SNAPSHOT_NAME}.") for f in file_names) else None
+        if path is None:
+            continue
+        size = os.path.getsize(path)
+        if _snapshot_format(path) != fmt:
+            new_path = put_snapshot(dirpath, get_snapshot_records(path), fmt)
+            stats["weeks"] += 1
+        else:
+            new_path = path
+        stats["bytes_before"] += size
+        stats["bytes_after"] += os.path.getsize(new_path)
+    return stats
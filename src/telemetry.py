@@ -0,0 +1,247 @@
+import bisect
+import contextlib
+import datetime
+import functools
+import json
+import os
+import platform
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+from urllib.parse import urlsplit
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Upper bounds (ms) of the request latency histogram; latencies include the transport's waits and retries
+LATENCY_BUCKETS_MS = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000)
+
+
+def _peak_rss_mb() -> Optional[float]:
+    if resource is None:
+        return None
+    # ru_maxrss is KiB on Linux
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+
+class Histogram:
+    """Fixed-bucket histogram; quantiles are reported as the upper bound of the bucket they fall in"""
+
+    def __init__(self, bounds=LATENCY_BUCKETS_MS):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)  # last bucket is > bounds[-1]
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def quantile(self, q: float) -> Optional[float]:
+        if self.count == 0:
+            return None
+        rank, seen = q * self.count, 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank and n:
+                return self.bounds[i] if i < len(self.bounds) else round(self.max, 1)
+        return round(self.max, 1)
+
+    def to_dict(self) -> dict:
+        labels = [f"le_{b}" for b in self.bounds] + [f"gt_{self.bounds[-1]}"]
+        return {
+            "count": self.count,
+            "mean": round(self.total / self.count, 1) if self.count else None,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "max": round(self.max, 1),
+            "buckets": {label: n for label, n in zip(labels, self.counts) if n},
+        }
+
+
+class _Span:
+    """Handed out by ``Telemetry.stage``; set ``rows`` to what the call produced"""
+
+    def __init__(self):
+        self.rows = None
+
+
+class Telemetry:
+    """
+    Process-wide run metrics: per-stage call counts, wall and CPU time and rows produced,
+    per-host request counts, status codes, bytes and latency, and free-form counters.
+    Everything is thread-safe; stages may nest (each is timed on its own) and CPU time
+    is that of the thread running the stage. A stage's ``wall_s`` sums its calls, so
+    concurrent calls (weeks, Watson players) can add up to more than the run's wall time.
+    """
+
+    def __init__(self):
+        self.started_at = datetime.datetime.now(datetime.timezone.utc)
+        self._wall = time.perf_counter()
+        self._cpu = time.process_time()
+        self.stages: Dict[str, dict] = {}
+        self.requests: Dict[str, dict] = {}
+        self.counters: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def stage(self, name: str):
+        span = _Span()
+        wall, cpu = time.perf_counter(), time.thread_time()
+        error = False
+        try:
+            yield span
+        except BaseException:
+            error = True
+            raise
+        finally:
+            wall, cpu = time.perf_counter() - wall, time.thread_time() - cpu
+            with self._lock:
+                stats = self.stages.setdefault(name, {"calls": 0, "errors": 0, "wall_s": 0.0, "cpu_s": 0.0, "max_wall_s": 0.0, "rows": 0})
+                stats["calls"] += 1
+                stats["errors"] += error
+                stats["wall_s"] += wall
+                stats["cpu_s"] += cpu
+                stats["max_wall_s"] = max(stats["max_wall_s"], wall)
+                stats["rows"] += span.rows or 0
+
+    def count(self, name: str, n: int = 1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def record_request(self, url: str, status: Optional[int], seconds: float = 0.0, nbytes: int = 0, cached: bool = False):
+        """
+        One GET: ``status`` None means it raised (timeout, connection error, retries
+        exhausted). Cached responses are counted but add no latency or downloaded bytes.
+        """
+        host = urlsplit(url).netloc or url
+        with self._lock:
+            stats = self.requests.get(host)
+            if stats is None:
+                stats = self.requests[host] = {"requests": 0, "cached": 0, "bytes": 0, "status": {}, "latency_ms": Histogram()}
+            key = "error" if status is None else str(status)
+            stats["status"][key] = stats["status"].get(key, 0) + 1
+            if cached:
+                stats["cached"] += 1
+                return
+            stats["requests"] += 1
+            stats["bytes"] += nbytes
+            stats["latency_ms"].observe(seconds * 1000)
+
+    def report(self, **extra) -> dict:
+        """Snapshot of everything recorded so far; ``extra`` is added as is (e.g. transport or cache stats)"""
+        with self._lock:
+            stages = {
+                name: dict(s, wall_s=round(s["wall_s"], 3), cpu_s=round(s["cpu_s"], 3), max_wall_s=round(s["max_wall_s"], 3))
+                for name, s in sorted(self.stages.items())
+            }
+            requests = {host: dict(s, status=dict(sorted(s["status"].items())), latency_ms=s["latency_ms"].to_dict())
+                        for host, s in sorted(self.requests.items())}
+            counters = dict(sorted(self.counters.items()))
+        return {
+            "started_at": self.started_at.isoformat(timespec="seconds"),
+            "finished_at": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+            "wall_s": round(time.perf_counter() - self._wall, 3),
+            "cpu_s": round(time.process_time() - self._cpu, 3),
+            "peak_rss_mb": _peak_rss_mb(),
+            "python": platform.python_version(),
+            "stages": stages,
+            "requests": requests,
+            "counters": counters,
+            **extra,
+        }
+
+
+_current = Telemetry()
+
+
+def get_telemetry() -> Telemetry:
+    return _current
+
+
+def reset_telemetry() -> Telemetry:
+    """Start a fresh recording (at the start of a run)"""
+    global _current
+    _current = Telemetry()
+    return _current
+
+
+def stage(name: str):
+    """
+    Time a block under ``name`` in the current recording.
+
+        with stage("espn.process_week_data") as span:
+            ...
+            span.rows = len(week_df)
+    """
+    return _current.stage(name)
+
+
+def timed(name: str, rows: Callable[[Any], int] = len):
+    """Decorator form of ``stage``; ``rows`` maps the return value to the rows it holds (None to skip)"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with _current.stage(name) as span:
+                result = func(*args, **kwargs)
+                if rows is not None:
+                    span.rows = rows(result)
+            return result
+        return wrapper
+    return decorator
+
+
+def count(name: str, n: int = 1):
+    _current.count(name, n)
+
+
+def record_request(url: str, status: Optional[int], seconds: float = 0.0, nbytes: int = 0, cached: bool = False):
+    _current.record_request(url, status, seconds, nbytes, cached)
+
+
+def get_report_path(sport_league, name: str, root_path: str = "./processed") -> str:
+    """
+    Location of a runner's report, next to its processed data, e.g.
+    ./processed/football/nfl/reports/projections.json. It is overwritten every run,
+    so the daily commit's history doubles as the run history.
+    """
+    sport_str, league_str = sport_league.value.split("/")
+    return f"{root_path}/{sport_str}/{league_str}/reports/{name}.json"
+
+
+def write_report(path: str, **extra) -> dict:
+    """
+    Write the current recording as JSON.
+
+    Args:
+        path (str): Report file; parent directories are created.
+        **extra: Run-level fields added to the report (runner name, transport/cache stats, ...).
+
+    Returns:
+        dict: The report written.
+    """
+    report = _current.report(**extra)
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as file:
+        json.dump(report, file, indent=2, default=str)
+        file.write("\n")
+    os.replace(tmp_path, path)
+    return report
+
+
+def summarize(report: dict) -> str:
+    """One log line for the end of a run"""
+    requests = sum(s["requests"] for s in report["requests"].values())
+    cached = sum(s["cached"] for s in report["requests"].values())
+    errors = sum(s["status"].get("error", 0) for s in report["requests"].values())
+    mb = sum(s["bytes"] for s in report["requests"].values()) / 1024 ** 2
+    slowest = sorted(report["stages"].items(), key=lambda kv: kv[1]["wall_s"], reverse=True)[:3]
+    stages = ", ".join(f"{name}={s['wall_s']:.1f}s" for name, s in slowest)
+    return (f"wall={report['wall_s']:.1f}s cpu={report['cpu_s']:.1f}s peak_rss={report['peak_rss_mb']}MB "
+            f"requests={requests} (+{cached} cached, {errors} errors, {mb:.1f}MB) stages: {stages}")
@@ -0,0 +1,233 @@
+import random
+import threading
+import time
+from typing import Dict
+from urllib.parse import urlsplit
+
+import requests
+
+# Statuses that mean "slow down / try again" rather than "this resource is bad"
+THROTTLE_STATUS = {429, 503}
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+
+class TransportError(requests.RequestException):
+    """A request that still failed after retries, or was refused because its host's circuit is open"""
+
+
+class TokenBucket:
+    """
+    Token-bucket rate limiter whose rate adapts to the upstream: a throttle
+    response halves the rate, every success adds ``increase`` to it (so at steady
+    state the rate grows by that fraction per second). Throttles within ``cooldown``
+    seconds of a decrease are one overload event, since every request in flight at
+    that moment sees it, and do not halve the rate again.
+    """
+
+    def __init__(self, rate: float, burst: int, min_rate: float = 1.0, max_rate: float = None, increase: float = 0.25,
+                 cooldown: float = 1.0):
+        self.rate = rate
+        self.burst = burst
+        self.min_rate = min_rate
+        self.max_rate = max_rate or rate * 4
+        self.increase = increase
+        self.cooldown = cooldown
+        self._decreased_at = float("-inf")
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+    def on_success(self):
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.increase)
+
+    def on_throttle(self):
+        with self._lock:
+            now = time.monotonic()
+            if now - self._decreased_at < self.cooldown:
+                return
+            self._decreased_at = now
+            self.rate = max(self.min_rate, self.rate / 2)
+            self._tokens = min(self._tokens, 0.0)
+
+
+class CircuitBreaker:
+    """
+    Opens after ``failure_threshold`` consecutive failures; while open, callers wait
+    out ``reset_timeout`` instead of sending requests. Then one trial request goes
+    through (half-open): success closes the circuit, failure re-opens it.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self.trips = 0
+        self._trial = False
+        self._lock = threading.Lock()
+
+    def wait_time(self) -> float:
+        """Seconds to wait before the next request may go out (0 means go now)"""
+        with self._lock:
+            if self.opened_at is None:
+                return 0.0
+            remaining = self.opened_at + self.reset_timeout - time.monotonic()
+            if remaining > 0:
+                return remaining
+            if self._trial:
+                return min(1.0, self.reset_timeout)
+            self._trial = True
+            return 0.0
+
+    def on_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial = False
+
+    def on_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self._trial or self.failures >= self.failure_threshold:
+                if self.opened_at is None or self._trial:
+                    self.trips += 1
+                self.opened_at = time.monotonic()
+                self._trial = False
+
+
+class RetryBudget:
+    """Caps retries at ``min_retries`` plus ``ratio`` of all requests, so a failing upstream is not hammered"""
+
+    def __init__(self, ratio: float = 0.2, min_retries: int = 20):
+        self.ratio = ratio
+        self.min_retries = min_retries
+        self.requests = 0
+        self.retries = 0
+        self._lock = threading.Lock()
+
+    def on_request(self):
+        with self._lock:
+            self.requests += 1
+
+    def try_spend(self) -> bool:
+        with self._lock:
+            if self.retries >= self.min_retries + self.ratio * self.requests:
+                return False
+            self.retries += 1
+            return True
+
+
+class _Host:
+    def __init__(self, rate, burst, failure_threshold, reset_timeout):
+        self.bucket = TokenBucket(rate, burst)
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout)
+
+
+class Transport:
+    """
+    Drop-in for ``requests.Session.get`` shared by the ESPN and Watson fetchers.
+
+    Every request waits for its host's circuit and rate limiter, carries a
+    (connect, read) timeout, and is retried with jittered exponential backoff on
+    connection errors and 429/5xx responses while the retry budget allows.
+    ``Retry-After`` is honored. Any other response (including 404) is returned
+    as is; a request that cannot succeed raises ``TransportError`` rather than
+    looking like an empty result.
+    """
+
+    def __init__(self, session: requests.Session, *, rate: float = 20.0, burst: int = 20, timeout=(5, 30),
+                 max_retries: int = 4, backoff_base: float = 0.5, backoff_max: float = 30.0,
+                 failure_threshold: int = 5, reset_timeout: float = 30.0, retry_budget: RetryBudget = None):
+        self.session = session
+        self.rate = rate
+        self.burst = burst
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.retry_budget = retry_budget or RetryBudget()
+        self.counters = {"requests": 0, "retries": 0, "throttled": 0, "errors": 0, "failed": 0}
+        self._hosts: Dict[str, _Host] = {}
+        self._lock = threading.Lock()
+
+    def _host(self, url: str) -> _Host:
+        host = urlsplit(url).netloc
+        with self._lock:
+            if host not in self._hosts:
+                self._hosts[host] = _Host(self.rate, self.burst, self.failure_threshold, self.reset_timeout)
+            return self._hosts[host]
+
+    def _count(self, name: str):
+        with self._lock:
+            self.counters[name] += 1
+
+    def _backoff(self, attempt: int, resp=None) -> float:
+        retry_after = resp.headers.get("Retry-After") if resp is not None else None
+        if retry_after is not None:
+            try:
+                return min(self.backoff_max, float(retry_after))
+            except ValueError:
+                pass
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    def get(self, url: str, params: dict = None, headers: dict = None, cookies=None, timeout=None) -> requests.Response:
+        host = self._host(url)
+        self.retry_budget.on_request()
+        attempt = 0
+        while True:
+            wait = host.breaker.wait_time()
+            while wait > 0:
+                time.sleep(wait)
+                wait = host.breaker.wait_time()
+            host.bucket.acquire()
+            self._count("requests")
+
+            resp, error = None, None
+            try:
+                resp = self.session.get(url, params=params, headers=headers, cookies=cookies, timeout=timeout or self.timeout)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                error = e
+
+            if error is None and resp.status_code not in RETRY_STATUS:
+                host.breaker.on_success()
+                host.bucket.on_success()
+                return resp
+
+            if resp is not None and resp.status_code in THROTTLE_STATUS:
+                # the host is up but overloaded: slow down rather than trip the circuit
+                host.bucket.on_throttle()
+                self._count("throttled")
+            else:
+                host.breaker.on_failure()
+                self._count("errors")
+
+            if attempt >= self.max_retries or not self.retry_budget.try_spend():
+                self._count("failed")
+                reason = f"HTTP {resp.status_code}" if resp is not None else repr(error)
+                raise TransportError(f"GET {url} failed after {attempt + 1} attempts: {reason}")
+            self._count("retries")
+            time.sleep(self._backoff(attempt, resp))
+            attempt += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            hosts = {name: {"rate": round(h.bucket.rate, 2), "circuit_trips": h.breaker.trips} for name, h in self._hosts.items()}
+            return dict(self.counters, hosts=hosts)
+
+    def close(self):
+        self.session.close()
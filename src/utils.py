@@ -1,14 +1,28 @@
 import json
 import re
+import numpy as np
 import pandas as pd
 from espn_api_orm.consts import ESPNSportLeagueTypes, ESPNSportSeasonTypes
-from espn_api_orm.calendar.api import ESPNCalendarAPI
 
-from src.consts import SEASON_START_MONTH, START_SEASONS
+from src.layout import (  # re-exported: these only look at file names and stay importable from here
+    DATASET_PARTITION_COLS,
+    HIVE_NULL_PARTITION,
+    _dataset_files,
+    find_year_for_season,
+    get_dataset_partitions,
+    get_latest_week_for_season,
+    get_seasons_to_update,
+)
+from src.schemas import PROJECTIONS_TABLE, WATSON_TABLE, apply_schema, arrow_schema, to_arrow
+from src.telemetry import stage, timed
 import datetime
 import os
+import shutil
+import uuid
 from typing import List
 import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
 
 
 
@@ -24,32 +38,28 @@ def put_json_file(path, data):
     with open(path, 'w') as file:
         json.dump(data, file, indent=4)
 
-def get_seasons_to_update(root_path, sport, suffix="projections"):
+def frame_to_records(df: pd.DataFrame) -> List[dict]:
     """
-    Get a list of seasons to update based on the root path and sport.
+    Convert a DataFrame to a list of row dicts, dropping null cells so sparse
+    stat columns are omitted from a row the way a hand-built dict would omit them.
 
     Args:
-        root_path (str): Root path for the sport data.
-        sport (ESPNSportTypes): Type of sport.
+        df (pd.DataFrame): DataFrame to convert.
 
     Returns:
-        List: List of seasons to update.
-    """
-    current_season = find_year_for_season(sport)
-    if os.path.exists(f'{root_path}/{sport.value}'):
-        seasons = os.listdir(f'{root_path}/{sport.value}/{suffix}')
-        fs_season = -1
-        for season_week in seasons:
-            season = season_week.split('/')[0]
-            temp = int(season.split('.')[0])
-            if temp > fs_season:
-                fs_season = temp
-        if fs_season == -1:
-            fs_season = START_SEASONS[sport]
-    else:
-        fs_season = START_SEASONS[sport]
-    return list(range(fs_season, current_season + 1))
-
+        List[dict]: One dict per row.
+    """
+    columns = list(df.columns)
+    notnull = df.notna().to_numpy()
+    # float32 cells go out as their shortest repr (0.1, not 0.10000000149011612)
+    float32 = [c for c in columns if df[c].dtype in (np.float32, pd.Float32Dtype())]
+    if float32:
+        df = df.assign(**{c: df[c].to_numpy(dtype=np.float32, na_value=np.nan).astype(str).astype(np.float64) for c in float32})
+    values = df.astype(object).to_numpy()
+    return [
+        {c: (v.item() if hasattr(v, 'item') else v) for c, v, ok in zip(columns, row, mask) if ok}
+        for row, mask in zip(values, notnull)
+    ]
 
 def clean_string(s):
     if isinstance(s, str):
@@ -84,6 +94,7 @@ def name_filter(s):
         return s
 
 
+@timed("io.get_dataframe")
 def get_dataframe(path: str, columns: List = None):
     """
     Read a DataFrame from a parquet file.
@@ -118,10 +129,216 @@ def put_dataframe(df: pd.DataFrame, path: str, schema: dict = None):
     if file_name.split('.')[1] != 'parquet':
         raise Exception("Invalid Filetype for Storage (Supported: 'parquet')")
     os.makedirs(key, exist_ok=True)
-    if schema:
-        for column, dtype in schema.items():
-            df[column] = df[column].astype(dtype)
-    df.to_parquet(f"{key}/{file_name}", schema=pa.Schema.from_pandas(df))
+    with stage("io.put_dataframe") as span:
+        if schema:
+            for column, dtype in schema.items():
+                df[column] = df[column].astype(dtype)
+        # temp file + rename: a crash mid-write never leaves a truncated season file behind
+        df.to_parquet(f"{key}/{file_name}.tmp", schema=pa.Schema.from_pandas(df))
+        os.replace(f"{key}/{file_name}.tmp", f"{key}/{file_name}")
+        span.rows = len(df)
+
+
+# Rows per parquet row group. A week partition (~1,100 ESPN players, ~400 Watson rows) stays one group:
+# smaller groups repeat every column chunk's header and statistics (+60% on disk at 512 rows) and
+# save nothing on read, where opening the footer dominates. So a player lookup prunes by partition
+# (see ``src.query.PlayerIndex``), not by row group within a week; larger partitions split.
+DATASET_ROW_GROUP_ROWS = 4096
+
+# pyarrow -> pandas numpy_nullable dtypes, matching get_dataframe's dtype_backend
+_NULLABLE_TYPES = {
+    pa.int8(): pd.Int8Dtype(),
+    pa.int16(): pd.Int16Dtype(),
+    pa.int32(): pd.Int32Dtype(),
+    pa.int64(): pd.Int64Dtype(),
+    pa.uint8(): pd.UInt8Dtype(),
+    pa.uint16(): pd.UInt16Dtype(),
+    pa.uint32(): pd.UInt32Dtype(),
+    pa.uint64(): pd.UInt64Dtype(),
+    pa.bool_(): pd.BooleanDtype(),
+    pa.float32(): pd.Float32Dtype(),
+    pa.float64(): pd.Float64Dtype(),
+    pa.string(): pd.StringDtype(),
+    pa.large_string(): pd.StringDtype(),
+}
+
+
+def _dataset_partitioning(partition_cols):
+    return ds.partitioning(pa.schema([(c, pa.int64()) for c in partition_cols]), flavor="hive")
+
+
+@timed("io.get_dataset")
+def get_dataset(root: str, columns: List = None, filters=None, partition_cols=DATASET_PARTITION_COLS, table: str = None):
+    """
+    Read a hive-partitioned parquet dataset (``season=/week=``) into a DataFrame.
+
+    Partition filters prune directories before any file is opened, remaining
+    filters and the column projection are pushed down into the parquet scan.
+    Partitions may carry different stat columns; their schemas are unified so
+    no column is dropped. With a registry ``table`` every partition is scanned
+    as the registry types, so partitions written before the registry read the same.
+
+    Args:
+        root (str): Dataset root directory.
+        columns (List): List of columns to select (default is None).
+        filters: pyarrow Expression or DNF filter list, e.g. [("season", "=", 2024), ("week", "in", [1, 2])].
+        table (str): Schema registry table (see ``src.schemas``) to read as.
+
+    Returns:
+        pd.DataFrame: Read DataFrame (empty if nothing matches).
+    """
+    files = _dataset_files(root, partition_cols)
+    if not files:
+        return pd.DataFrame()
+    partitioning = _dataset_partitioning(partition_cols)
+    expression = pq.filters_to_expression(filters) if isinstance(filters, list) else filters
+    dataset = ds.dataset(files, format="parquet", partitioning=partitioning, partition_base_dir=root.rstrip('/'))
+    fragments = list(dataset.get_fragments(filter=expression)) if expression is not None else list(dataset.get_fragments())
+    if not fragments:
+        return pd.DataFrame()
+
+    if table is None:
+        schema = pa.unify_schemas([partitioning.schema] + [f.physical_schema for f in fragments], promote_options="permissive")
+    else:
+        # registry order and types; partition columns keep the types their directory names parse as
+        registry = arrow_schema(table, list(partitioning.schema) + [field for f in fragments for field in f.physical_schema])
+        schema = pa.schema([partitioning.schema.field(f.name) if f.name in partition_cols else f for f in registry])
+    # registry string columns are decoded straight into dictionary arrays
+    dictionary_columns = [f.name for f in schema if pa.types.is_dictionary(f.type)]
+    file_format = ds.ParquetFileFormat(read_options=ds.ParquetReadOptions(dictionary_columns=dictionary_columns))
+    dataset = ds.dataset(
+        [f.path for f in fragments], schema=schema, format=file_format, partitioning=partitioning, partition_base_dir=root.rstrip('/')
+    )
+    if columns is not None:
+        columns = [c for c in columns if c in schema.names]
+    df = dataset.to_table(columns=columns, filter=expression).to_pandas(types_mapper=_NULLABLE_TYPES.get)
+    return df if table is None else apply_schema(df, table)
+
+
+def put_dataset(df: pd.DataFrame, root: str, partition_cols=DATASET_PARTITION_COLS, schema: dict = None, table: str = None):
+    """
+    Write a DataFrame into a hive-partitioned parquet dataset.
+
+    Only partitions present in ``df`` are replaced; every other partition on
+    disk is left untouched. With a registry ``table`` rows are stored in the
+    table's sort order (player_id), so a partition's file depends only on its rows.
+    Files are written into a staging directory and renamed into place, so a
+    crash mid-write leaves each partition either as it was or fully replaced.
+
+    Args:
+        df (pd.DataFrame): DataFrame to write (must contain the partition columns).
+        root (str): Dataset root directory.
+        schema (dict): Schema dictionary.
+        table (str): Schema registry table (see ``src.schemas``) to store the columns as.
+
+    Returns:
+        None
+    """
+    if df.shape[0] == 0:
+        return
+    os.makedirs(root, exist_ok=True)
+    with stage("io.put_dataset") as span:
+        if schema:
+            for column, dtype in schema.items():
+                df[column] = df[column].astype(dtype)
+        if table is not None:
+            arrow_table = to_arrow(df, table)
+        else:
+            # pandas metadata repeats every column per file; dtypes are restored from arrow types on read
+            arrow_table = pa.Table.from_pandas(df, preserve_index=False).replace_schema_metadata(None)
+        # hidden from readers: they only list {root}/{partition}=*/ directories
+        staging = f"{root.rstrip('/')}/.staging-{uuid.uuid4().hex}"
+        try:
+            ds.write_dataset(
+                arrow_table,
+                staging,
+                format="parquet",
+                partitioning=list(partition_cols),
+                partitioning_flavor="hive",
+                basename_template="part-{i}.parquet",
+                file_options=ds.ParquetFileFormat().make_write_options(compression="zstd"),
+                min_rows_per_group=DATASET_ROW_GROUP_ROWS,
+                max_rows_per_group=DATASET_ROW_GROUP_ROWS,
+                # a threaded write may interleave batches and lose the sort order
+                use_threads=table is None,
+            )
+            for staged in _dataset_files(staging, partition_cols):
+                target = os.path.join(root, os.path.relpath(staged, staging))
+                target_dir = os.path.dirname(target)
+                os.makedirs(target_dir, exist_ok=True)
+                # a partition holds only the files of its latest write
+                for name in os.listdir(target_dir):
+                    if name.endswith(".parquet") and name != os.path.basename(target):
+                        os.remove(os.path.join(target_dir, name))
+                os.replace(staged, target)
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+        span.rows = len(df)
+
+
+def drop_dataset_partition(root: str, partition: dict):
+    """
+    Remove one partition directory (e.g. {"season": 2024, "week": 18}) from a dataset.
+
+    Args:
+        root (str): Dataset root directory.
+        partition (dict): Partition column -> value, in partition order.
+
+    Returns:
+        None
+    """
+    path = f"{root.rstrip('/')}/" + "/".join(
+        f"{c}={HIVE_NULL_PARTITION if v is None else v}" for c, v in partition.items()
+    )
+    if os.path.isdir(path):
+        shutil.rmtree(path)
+
+
+def migrate_parquet_to_dataset(root: str, partition_cols=DATASET_PARTITION_COLS, table: str = None):
+    """
+    One-shot conversion of legacy ``{root}/{season}.parquet`` files into the
+    partitioned layout under the same root; each legacy file is removed once written.
+
+    Args:
+        root (str): Directory holding the legacy season files.
+        table (str): Schema registry table to store the columns as.
+
+    Returns:
+        int: Legacy files migrated.
+    """
+    if not os.path.isdir(root):
+        return 0
+    migrated = 0
+    for file_name in sorted(os.listdir(root)):
+        if not file_name.endswith('.parquet') or not file_name.split('.')[0].isdigit():
+            continue
+        df = get_dataframe(f"{root.rstrip('/')}/{file_name}")
+        if df.shape[0] != 0:
+            put_dataset(df, root, partition_cols, table=table)
+        os.remove(f"{root.rstrip('/')}/{file_name}")
+        migrated += 1
+        print(f"[Dataset] Migrated {root.rstrip('/')}/{file_name} → {root.rstrip('/')}/season={file_name.split('.')[0]}/")
+    return migrated
+
+
+def migrate_processed_tables(sport_league: ESPNSportLeagueTypes, processed_root: str = "./processed") -> int:
+    """
+    Convert the processed tables (projections, Watson) of a sport/league still holding legacy
+    ``{season}.parquet`` files into the partitioned layout. Idempotent: once migrated there is
+    nothing left to convert and only the table directories are listed.
+
+    Args:
+        sport_league (ESPNSportLeagueTypes): Sport/league whose tables to migrate.
+        processed_root (str): Processed dataset root.
+
+    Returns:
+        int: Legacy files migrated.
+    """
+    sport_str, league_str = sport_league.value.split("/")
+    return sum(
+        migrate_parquet_to_dataset(f"{processed_root}/{sport_str}/{league_str}/{table}/", table=table)
+        for table in (PROJECTIONS_TABLE, WATSON_TABLE)
+    )
 
 
 def create_dataframe(obj, schema: dict):
@@ -189,58 +406,20 @@ def is_pandas_none(val):
 
 
 def get_current_week(sport_league: ESPNSportLeagueTypes, date: datetime.datetime = None):
-    if date is None:
-        today = datetime.datetime.utcnow()
-    else:
-        today = date
-    sport, league = sport_league.value.split('/')
-    season = find_year_for_season(sport_league)
-    calendar_api = ESPNCalendarAPI(sport, league, season=season)
-    for season_type in [2,3]:
-        for week in calendar_api.get_weeks(season_type):
-            res = calendar_api.api_request(calendar_api._core_url + f"/{calendar_api.sport.value}/leagues/{calendar_api.league}/seasons/{calendar_api.season}/types/{season_type}/weeks/{week}")
-            if today < datetime.datetime.strptime(res['endDate'], "%Y-%m-%dT%H:%MZ"):
-                return 18 if season_type == 3 else week
-    return 18
-
-
-def find_year_for_season(league: ESPNSportLeagueTypes, date: datetime.datetime = None):
     """
-    Find the year for a specific season based on the league and date.
+    Current week of the season (postseason counts as week 18), answered from the
+    cached season calendar instead of one HTTP call per week.
 
     Args:
-        league (ESPNSportTypes): Type of sport.
-        date (datetime.datetime): Date for the sport (default is None).
+        sport_league (ESPNSportLeagueTypes): Sport/league.
+        date (datetime.datetime): Date to resolve (default is now, UTC).
 
     Returns:
-        int: Year for the season.
+        int: Week number.
     """
-    if date is None:
-        today = datetime.datetime.utcnow()
-    else:
-        today = date
-    if league not in SEASON_START_MONTH:
-        raise ValueError(f'"{league}" league cannot be found!')
-    start = SEASON_START_MONTH[league]['start']
-    wrap = SEASON_START_MONTH[league]['wrap']
-    if wrap and start - 1 <= today.month <= 12:
-        return today.year + 1
-    elif not wrap and start == 1 and today.month == 12:
-        return today.year + 1
-    elif not wrap and not start - 1 <= today.month <= 12:
-        return today.year - 1
-    else:
-        return today.year
+    from src.season_calendar import get_current_week as calendar_current_week
 
-def get_latest_week_for_season(season_path: str) -> int:
-    """Get the latest week that has been processed for a season"""
-    try:
-        df = get_dataframe(f"{season_path}.parquet")
-        if df.empty:
-            return 0
-        return df['week'].max()
-    except:
-        return 0
+    return calendar_current_week(sport_league, date)
 
 
 def camel_to_snake(s: str) -> str:
@@ -1,66 +1,202 @@
+import functools
+import hashlib
+import json
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
 import requests
+from requests.adapters import HTTPAdapter
+import numpy as np
 import pandas as pd
 
-def _parse_ts(x):
-    # Robust timestamp parsing, normalized to UTC
-    return pd.to_datetime(x, errors="coerce", utc=True)
+from .http_cache import ResponseCache, TTL_IMMUTABLE, cached_get
+from .manifest import load_manifest, save_manifest
+from .telemetry import count, timed
+from .transport import Transport, TransportError
 
-def _closest_by_ts(items, set_end_ts, *, model_type=None, tolerance=None, prefer_past=True):
-    """
-    Return the item whose DATA_TIMESTAMP is closest to set_end_ts.
-    - model_type: filter for classifiers (e.g., 'breakout_classifier')
-    - tolerance: e.g. '7D' or '36H' to drop matches that are too far away; None = no limit
-    - prefer_past: if two are equally close, prefer the one <= set_end_ts
-    """
-    best = None
-    best_delta = None
 
-    for it in items or []:
-        if model_type and it.get("MODEL_TYPE") != model_type:
-            continue
-        ts = _parse_ts(it.get("DATA_TIMESTAMP"))
-        if pd.isna(ts):
-            continue
+def _meta_time(m):
+    """The time a meta row is matched at: its SET_END, else its DATA_TIMESTAMP"""
+    return m.get("SET_END") or m.get("DATA_TIMESTAMP")
 
-        delta = abs(ts - set_end_ts)
-        if best is None or delta < best_delta or (prefer_past and delta == best_delta and ts <= set_end_ts):
-            best = it
-            best_delta = delta
 
-    if best is None:
-        return None
+# Row key of the projection's score distribution when flattening with distributions=True
+DISTRIBUTION_COLUMN = "projection_score_distribution"
 
-    if tolerance is not None and best_delta > pd.to_timedelta(tolerance):
-        return None
+CLASSIFIER_MODEL_TYPES = {
+    "breakout_classifier": "breakout_likelihood",
+    "bust_classifier": "bust_likelihood",
+    "play_with_injury_classifier": "play_with_injury_likelihood",
+    "play_without_injury_classifier": "play_without_injury_likelihood",
+}
 
-    return best
 
-def flatten_watson_triplet(player_id, proj, clf, meta, *, tolerance="7D", prefer_past=True):
+def _parse_ts_array(values) -> pd.Series:
     """
-    Flatten the triplet so that projections/classifiers are chosen by
-    the closest DATA_TIMESTAMP to each meta SET_END (or meta DATA_TIMESTAMP).
+    Timestamps parsed to UTC (NaT if unparseable) in one go. ISO8601 covers Watson's
+    timestamps in one pass; anything it rejects is re-parsed in mixed formats, as
+    ``pd.to_datetime`` would parse it on its own.
     """
-    flattened_triplets = []
+    raw = pd.Series(values, dtype=object)
+    parsed = pd.to_datetime(raw, errors="coerce", utc=True, format="ISO8601")
+    retry = parsed.isna() & raw.notna()
+    if retry.any():
+        parsed[retry] = pd.to_datetime(raw[retry], errors="coerce", utc=True, format="mixed")
+    return parsed
+
+
+@functools.lru_cache(maxsize=4096)
+def _date_str(value):
+    return pd.to_datetime(value, errors="coerce").strftime("%Y-%m-%d")
+
+
+def _items_frame(item_lists) -> pd.DataFrame:
+    """
+    Long frame of (key, idx, ts, model_type) for every timestamped item, where key is the
+    position of the owning triplet and idx the item's position in its list.
+    """
+    lengths = np.asarray([len(items or []) for items in item_lists], dtype="int64")
+    flat = [it for items in item_lists for it in items or []]
+    keys = np.repeat(np.arange(len(lengths), dtype="int64"), lengths)
+    idxs = np.arange(len(flat), dtype="int64") - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    ts = _parse_ts_array([it.get("DATA_TIMESTAMP") for it in flat])
+    frame = pd.DataFrame({"key": keys, "idx": idxs, "ts": ts,
+                          "model_type": pd.Series([it.get("MODEL_TYPE") for it in flat], dtype=object)})
+    frame = frame.loc[frame["ts"].notna()]
+    frame["ts"] = frame["ts"].astype("int64")
+    return frame
+
+
+def _within_reach(items: pd.DataFrame, queries: pd.DataFrame, n_keys: int, tolerance) -> pd.DataFrame:
+    """
+    Items that can be some query's match: an item more than ``tolerance`` before its key's
+    earliest query is out of tolerance for all of them, and so is every item before it.
+    """
+    if tolerance is None or items.empty:
+        return items
+    earliest = np.full(n_keys, np.iinfo("int64").max, dtype="int64")
+    np.minimum.at(earliest, queries["key"].to_numpy(), queries["t"].to_numpy())
+    return items.loc[items["ts"].to_numpy() >= earliest[items["key"].to_numpy()] - tolerance.value]
 
-    for m in meta or []:
-        # Choose SET_END if present, else fall back to meta's DATA_TIMESTAMP
-        set_end_ts = _parse_ts(m.get("SET_END") or m.get("DATA_TIMESTAMP"))
-        if pd.isna(set_end_ts):
-            continue
 
-        set_end_str = set_end_ts.tz_convert(None).strftime("%Y-%m-%d") if set_end_ts.tzinfo else set_end_ts.strftime("%Y-%m-%d")
+def _nearest_by_ts(queries: pd.DataFrame, items: pd.DataFrame, *, tolerance=None, prefer_past=True) -> np.ndarray:
+    """
+    For every query (key, t) return the idx of the item under the same key whose
+    ts is closest to t, or -1 (none, or the closest is more than ``tolerance`` away).
 
-        closest_proj   = _closest_by_ts(proj, set_end_ts, tolerance=tolerance, prefer_past=prefer_past)
-        closest_break  = _closest_by_ts(clf,  set_end_ts, model_type="breakout_classifier",           tolerance=tolerance, prefer_past=prefer_past)
-        closest_bust   = _closest_by_ts(clf,  set_end_ts, model_type="bust_classifier",               tolerance=tolerance, prefer_past=prefer_past)
-        closest_pwi    = _closest_by_ts(clf,  set_end_ts, model_type="play_with_injury_classifier",   tolerance=tolerance, prefer_past=prefer_past)
-        closest_pwoi   = _closest_by_ts(clf,  set_end_ts, model_type="play_without_injury_classifier",tolerance=tolerance, prefer_past=prefer_past)
+    Two as-of lookups give the nearest item at or before t and the nearest
+    strictly after t. Ties are resolved the way a scan of each item list in
+    order would (tests/test_watson_flatten.py keeps that scan as the reference):
+    with prefer_past the last past item wins, otherwise the first in list order.
+    """
+    out = np.full(len(queries), -1, dtype="int64")
+    if queries.empty or items.empty:
+        return out
+
+    items = items.sort_values(["ts", "idx"], kind="mergesort")
+    past_side = items.drop_duplicates(["key", "ts"], keep="last" if prefer_past else "first")
+    future_side = items.drop_duplicates(["key", "ts"], keep="first")
+
+    left = queries.assign(pos=np.arange(len(queries))).sort_values("t", kind="mergesort")
+    past = pd.merge_asof(
+        left, past_side.rename(columns={"ts": "t_past", "idx": "idx_past"}),
+        left_on="t", right_on="t_past", by="key", direction="backward",
+    )
+    future = pd.merge_asof(
+        left, future_side.rename(columns={"ts": "t_future", "idx": "idx_future"}),
+        left_on="t", right_on="t_future", by="key", direction="forward", allow_exact_matches=False,
+    )
+
+    t = left["t"].to_numpy(dtype="float64")
+    has_past = past["t_past"].notna().to_numpy()
+    has_future = future["t_future"].notna().to_numpy()
+    d_past = t - past["t_past"].to_numpy(dtype="float64")
+    d_future = future["t_future"].to_numpy(dtype="float64") - t
+    idx_past = past["idx_past"].to_numpy(dtype="float64")
+    idx_future = future["idx_future"].to_numpy(dtype="float64")
+
+    tie_to_past = True if prefer_past else (idx_past < idx_future)
+    take_past = has_past & (~has_future | (d_past < d_future) | ((d_past == d_future) & tie_to_past))
+    take_future = has_future & ~take_past
+    best_delta = np.where(take_past, d_past, d_future)
+    chosen = np.where(take_past, idx_past, np.where(take_future, idx_future, -1))
+
+    if tolerance is not None:
+        chosen = np.where(best_delta > pd.to_timedelta(tolerance).value, -1, chosen)
+
+    out[left["pos"].to_numpy()] = chosen.astype("int64")
+    return out
+
+
+@timed("watson.flatten_triplets")
+def flatten_watson_triplets(triplets, *, tolerance="7D", prefer_past=True, distributions=False, since=None):
+    """
+    Flatten many (player_id, proj, clf, meta) triplets at once, e.g. a whole season.
+
+    Timestamps are parsed once per item, classifiers are partitioned by
+    MODEL_TYPE and the closest projection/classifier for every meta row is
+    found with a sorted as-of join instead of a linear scan per row. Rows are
+    identical, and in the same order, to calling ``flatten_watson_triplet``
+    on each triplet in turn.
+
+    With ``distributions`` every row also carries the chosen projection's raw
+    ``SCORE_DISTRIBUTION`` under ``DISTRIBUTION_COLUMN``; it is not a Watson table
+    column, the caller moves it to the distribution store (src/distributions.py).
+
+    ``since`` (one cutoff per triplet, epoch ns or None, see ``WatsonWatermarks``) limits a
+    triplet to the weeks with a meta row after its cutoff; every meta row of those weeks is
+    flattened, against the full projection/classifier lists, so the rows are the full
+    flatten's rows of those weeks.
+    """
+    triplets = list(triplets)
+    if tolerance is not None:
+        tolerance = pd.to_timedelta(tolerance)
+    metas = [meta or [] for _, _, _, meta in triplets]
+
+    # one query per meta row with a usable SET_END / DATA_TIMESTAMP
+    q_keys, q_rows = [], []
+    for key, meta in enumerate(metas):
+        for m in meta:
+            q_keys.append(key)
+            q_rows.append(m)
+    set_end = _parse_ts_array([_meta_time(m) for m in q_rows])
+    valid = set_end.notna().to_numpy()
+    if since is not None and valid.any():
+        cutoffs = np.asarray([np.iinfo("int64").min if cutoff is None else cutoff for cutoff in since], dtype="int64")
+        t = np.full(len(q_rows), np.iinfo("int64").min, dtype="int64")
+        t[valid] = set_end[valid].astype("int64").to_numpy()
+        after = valid & (t > cutoffs[np.asarray(q_keys, dtype="int64")])
+        weeks = {(q_keys[i], q_rows[i].get("EVENT_WEEK")) for i in np.flatnonzero(after)}
+        valid &= np.fromiter(((key, m.get("EVENT_WEEK")) in weeks for key, m in zip(q_keys, q_rows)), dtype=bool, count=len(q_rows))
+    q_keys = np.asarray(q_keys, dtype="int64")[valid]
+    q_rows = [m for m, ok in zip(q_rows, valid) if ok]
+    set_end = set_end[valid]
+    set_end_strs = set_end.dt.tz_convert(None).dt.strftime("%Y-%m-%d").tolist()
+    queries = pd.DataFrame({"key": q_keys, "t": set_end.astype("int64").to_numpy()})
+
+    projs = [proj for _, proj, _, _ in triplets]
+    clfs = [clf for _, _, clf, _ in triplets]
+    # one pass over each item kind, classifiers split by MODEL_TYPE after
+    proj_items = _within_reach(_items_frame(projs), queries, len(triplets), tolerance)
+    clf_items = _within_reach(_items_frame(clfs), queries, len(triplets), tolerance)
+    proj_pick = _nearest_by_ts(queries, proj_items[["key", "idx", "ts"]], tolerance=tolerance, prefer_past=prefer_past)
+    clf_picks = {
+        column: _nearest_by_ts(queries, clf_items.loc[clf_items["model_type"] == model_type, ["key", "idx", "ts"]],
+                               tolerance=tolerance, prefer_past=prefer_past)
+        for model_type, column in CLASSIFIER_MODEL_TYPES.items()
+    }
+
+    flattened_triplets = []
+    for i, m in enumerate(q_rows):
+        key = q_keys[i]
+        player_id = triplets[key][0]
+        closest_proj = projs[key][proj_pick[i]] if proj_pick[i] >= 0 else None
 
         flattened = {
             "actual_points": m.get("ACTUAL"),
-            "set_end": set_end_str,
+            "set_end": set_end_strs[i],
             "data_timestamp": m.get("DATA_TIMESTAMP"),
             "week": m.get("EVENT_WEEK"),
             "opponent_name": m.get("OPPONENT_NAME"),
@@ -73,51 +209,427 @@ def flatten_watson_triplet(player_id, proj, clf, meta, *, tolerance="7D", prefer
             "is_on_bye": m.get("IS_ON_BYE"),
             "is_free_agent": m.get("IS_FREE_AGENT"),
             "current_rank": m.get("CURRENT_RANK"),
-            "injury_status_date": pd.to_datetime(m.get("INJURY_STATUS_DATE"), errors="coerce").strftime("%Y-%m-%d") if m.get("INJURY_STATUS_DATE") else None,
+            "injury_status_date": _date_str(m.get("INJURY_STATUS_DATE")) if m.get("INJURY_STATUS_DATE") else None,
 
             # Projection fields (closest to set_end)
             "projection_model_type":          closest_proj.get("MODEL_TYPE") if closest_proj else None,
             "projection_score":               closest_proj.get("SCORE_PROJECTION") if closest_proj else None,
-            #"projection_score_distribution":  closest_proj.get("SCORE_DISTRIBUTION") if closest_proj else None, too massive and just not needed
             "projection_distribution_name":   closest_proj.get("DISTRIBUTION_NAME") if closest_proj else None,
             "projection_low_score":           closest_proj.get("LOW_SCORE") if closest_proj else None,
             "projection_high_score":          closest_proj.get("HIGH_SCORE") if closest_proj else None,
             "projection_simulation_projection": closest_proj.get("SIMULATION_PROJECTION") if closest_proj else None,
-
-            # Classifiers (closest to set_end)
-            "breakout_likelihood":            closest_break.get("NORMALIZED_RESULT") if closest_break else None,
-            "bust_likelihood":                closest_bust.get("NORMALIZED_RESULT") if closest_bust else None,
-            "play_with_injury_likelihood":    closest_pwi.get("NORMALIZED_RESULT") if closest_pwi else None,
-            "play_without_injury_likelihood": closest_pwoi.get("NORMALIZED_RESULT") if closest_pwoi else None,
         }
 
+        # Classifiers (closest to set_end)
+        for column, pick in clf_picks.items():
+            closest = clfs[key][pick[i]] if pick[i] >= 0 else None
+            flattened[column] = closest.get("NORMALIZED_RESULT") if closest else None
+
+        # too massive for the main table; only kept when asked for, in its own store
+        if distributions:
+            flattened[DISTRIBUTION_COLUMN] = closest_proj.get("SCORE_DISTRIBUTION") if closest_proj else None
+
         flattened_triplets.append(flattened)
 
     return flattened_triplets
 
 
+def flatten_watson_triplet(player_id, proj, clf, meta, *, tolerance="7D", prefer_past=True, distributions=False):
+    """
+    Flatten the triplet so that projections/classifiers are chosen by
+    the closest DATA_TIMESTAMP to each meta SET_END (or meta DATA_TIMESTAMP).
+    """
+    return flatten_watson_triplets([(player_id, proj, clf, meta)], tolerance=tolerance, prefer_past=prefer_past,
+                                   distributions=distributions)
+
+
 
 
 
 BASE_WATSON = "https://watsonfantasyfootball.espn.com/espnpartner/dallas"
-def _get_json(url: str, session: requests.Session | None = None):
+WATSON_TIMEOUT = (5, 30)  # (connect, read) seconds
+WATSON_MAX_WORKERS = 16
+
+
+WATSON_RATE = 40.0  # starting requests/second per host; the transport adapts it to throttling
+WATSON_MISSING_STATUS = {403, 404}  # no Watson file for this player/season
+
+
+WATSON_ENDPOINTS = ("players", "projections", "classifiers")  # players first: without it a triplet yields no rows
+
+# How long a known-missing / known-empty file is skipped in the current season; past seasons never expire
+MISS_TTL_CURRENT_SEASON = 7 * 24 * 60 * 60
+EMPTY_TTL_CURRENT_SEASON = 24 * 60 * 60
+
+
+class WatsonMissIndex:
+    """
+    Per-season record of Watson files known to be missing (403/404) or empty, keyed by
+    espn_id and endpoint, so later runs skip them instead of re-requesting.
+
+    Entries for past seasons never expire. In the current season a missing file is
+    probed again after a week and an empty one after a day, since Watson picks up
+    players as they emerge. A file that turns up with data is dropped from the index.
+    """
+
+    def __init__(self, path: str, season: int, current_season: int):
+        self.path = path
+        self.season = season
+        self.immutable = season < current_season
+        self.entries = load_manifest(path)  # {espn_id: {endpoint: [status, checked_at]}}
+        self.skipped = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def is_miss(self, espn_id, endpoint: str) -> bool:
+        entry = self.entries.get(str(espn_id), {}).get(endpoint)
+        if entry is None:
+            return False
+        status, checked_at = entry
+        ttl = MISS_TTL_CURRENT_SEASON if status == "missing" else EMPTY_TTL_CURRENT_SEASON
+        return self.immutable or time.time() - checked_at < ttl
+
+    def skip(self, espn_id, endpoint: str) -> bool:
+        """``is_miss``, counting the request it saves"""
+        if not self.is_miss(espn_id, endpoint):
+            return False
+        with self._lock:
+            self.skipped += 1
+        return True
+
+    def record(self, espn_id, endpoint: str, status: Optional[str]):
+        """Store a "missing" or "empty" outcome; ``None`` (the file had data) clears the entry"""
+        key = str(espn_id)
+        with self._lock:
+            if status is not None:
+                self.entries.setdefault(key, {})[endpoint] = [status, time.time()]
+            elif endpoint in self.entries.get(key, {}):
+                del self.entries[key][endpoint]
+                if not self.entries[key]:
+                    del self.entries[key]
+
+    def save(self):
+        with self._lock:
+            save_manifest(self.path, self.entries)
+
+
+# bump when what a watermark vouches for changes: every player is flattened in full on the next run
+WATERMARKS_VERSION = 1
+
+
+def _digest(content: Optional[bytes]) -> Optional[str]:
+    return None if content is None else hashlib.sha256(content).hexdigest()
+
+
+_NAT = np.iinfo("int64").min  # a missing/unparseable time, as epoch ns
+
+
+def _times_per_list(item_lists, stamp) -> List[np.ndarray]:
+    """``stamp(item)`` of every item as epoch ns (``_NAT`` if unusable), one array per list, parsed in one go"""
+    item_lists = [items or [] for items in item_lists]
+    parsed = _parse_ts_array([stamp(it) for items in item_lists for it in items])
+    values = parsed.dt.tz_convert(None).to_numpy(dtype="datetime64[ns]").view("int64") if len(parsed) else np.empty(0, dtype="int64")
+    return np.split(values, np.cumsum([len(items) for items in item_lists])[:-1])
+
+
+def _meta_digest(meta: list) -> str:
+    # rows as parsed (keys in file order): a file re-serialized with other key order only costs a full flatten
+    return hashlib.sha256(repr(meta).encode()).hexdigest()
+
+
+class WatsonWatermarks:
+    """
+    Per-season record of how much of each player's Watson files is already in the Watson
+    table, so a refresh only redoes what is new. For every player it keeps:
+      - a digest of each file body as last flattened: a player whose three files are unchanged
+        (typically just revalidated by the HTTP cache) is neither parsed nor flattened again;
+      - a cutoff time and a digest of the meta rows up to it: only the weeks with a meta row
+        after the cutoff are flattened again (see ``flatten_watson_triplets(since=...)``).
+
+    Watson appends rows, so the cutoff is the latest meta row time (SET_END, else DATA_TIMESTAMP)
+    flattened, pulled back ``tolerance`` from the latest projection/classifier DATA_TIMESTAMP
+    seen: a newer item can only be the nearest match of a meta row after that. A meta row
+    edited in place at or before the cutoff (or one inserted there) changes the digest and the
+    player is flattened in full.
+
+    Digests are noted as files are fetched and cutoffs as triplets are flattened (``advance``);
+    neither counts until ``commit``, once the rows they stand for are stored. Entries kept with
+    other flattening options (``distributions``) are discarded.
+    """
+
+    def __init__(self, path: str, distributions: bool = False, tolerance="7D", reset: bool = False):
+        self.path = path
+        self.distributions = distributions
+        self.tolerance = None if tolerance is None else pd.to_timedelta(tolerance).value
+        manifest = {} if reset else load_manifest(path)
+        current = manifest.get("version") == WATERMARKS_VERSION and manifest.get("distributions") == distributions
+        self.entries = manifest.get("players", {}) if current else {}  # {espn_id: {"files", "cutoff", "meta"}}
+        self.pending = {}
+        self.unchanged_ids = set()
+        self._fetched = {}  # {espn_id: {endpoint: digest}} of this run's bodies
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def retain(self, player_ids: Iterable):
+        """Forget players without stored rows (e.g. after a manual delete): their watermark vouches for nothing"""
+        keep = {str(int(player_id)) for player_id in player_ids}
+        self.entries = {key: entry for key, entry in self.entries.items() if key in keep}
+
+    def unchanged(self, espn_id, contents: Dict[str, Optional[bytes]]) -> bool:
+        """Whether every file body (None: no file) is the one last flattened; the digests are kept for ``advance``"""
+        digests = {endpoint: _digest(content) for endpoint, content in contents.items()}
+        key = str(espn_id)
+        with self._lock:
+            self._fetched[key] = digests
+            if self.entries.get(key, {}).get("files") != digests:
+                return False
+            self.unchanged_ids.add(key)
+        return True
+
+    def since(self, triplets) -> List[Optional[int]]:
+        """Cutoff (epoch ns) to flatten each (player_id, proj, clf, meta) after, or None to flatten it in full"""
+        triplets = list(triplets)
+        meta_times = _times_per_list([meta for _, _, _, meta in triplets], _meta_time)
+        cutoffs = []
+        for (player_id, _, _, meta), times in zip(triplets, meta_times):
+            entry = self.entries.get(str(player_id))
+            if not entry or entry.get("cutoff") is None:
+                cutoffs.append(None)
+                continue
+            cutoff = pd.Timestamp(entry["cutoff"]).value
+            before = [m for m, t in zip(meta or [], times) if t != _NAT and t <= cutoff]
+            cutoffs.append(cutoff if _meta_digest(before) == entry.get("meta") else None)
+        return cutoffs
+
+    def advance(self, triplets):
+        """Note the cutoff of each (player_id, proj, clf, meta) just flattened, to hold once committed"""
+        triplets = list(triplets)
+        meta_times = _times_per_list([meta for _, _, _, meta in triplets], _meta_time)
+        item_times = _times_per_list([(proj or []) + (clf or []) for _, proj, clf, _ in triplets], lambda it: it.get("DATA_TIMESTAMP"))
+        marks = {}
+        for (player_id, _, _, meta), times, items in zip(triplets, meta_times, item_times):
+            times_ok, items_ok = times[times != _NAT], items[items != _NAT]
+            cutoff = None
+            # with nothing to bound where new items can land, the player is flattened in full next time
+            if self.tolerance is not None and len(times_ok) and len(items_ok):
+                cutoff = int(min(times_ok.max(), items_ok.max() - self.tolerance))
+            before = [m for m, t in zip(meta or [], times) if cutoff is not None and t != _NAT and t <= cutoff]
+            marks[str(player_id)] = {
+                "cutoff": None if cutoff is None else pd.Timestamp(cutoff, tz="UTC").isoformat(),
+                "meta": _meta_digest(before),
+            }
+        with self._lock:
+            for key, mark in marks.items():
+                self.pending[key] = {"files": self._fetched.get(key), **mark}
+
+    def marks(self, player_ids: Iterable) -> Dict[str, dict]:
+        """Pending entries of ``player_ids`` (e.g. to checkpoint them with the rows they stand for)"""
+        return {str(player_id): self.pending[str(player_id)] for player_id in player_ids if str(player_id) in self.pending}
+
+    def restore(self, marks: Dict[str, dict]):
+        """Take back pending entries saved with ``marks``"""
+        with self._lock:
+            self.pending.update(marks)
+
+    def commit(self):
+        """The stored rows now match: pending entries hold, unchanged players keep theirs, everyone else is dropped"""
+        with self._lock:
+            self.entries = {
+                **{key: self.entries[key] for key in self.unchanged_ids if key in self.entries},
+                **self.pending,
+            }
+            self.pending = {}
+
+    def save(self):
+        with self._lock:
+            save_manifest(self.path, {"version": WATERMARKS_VERSION, "distributions": self.distributions, "players": self.entries})
+
+
+def _is_json_body(content: bytes) -> bool:
+    """Whether a Watson body looks like whole JSON: bracketed at both ends, and parsed outright when short"""
+    body = content.strip() if content[:1].isspace() or content[-1:].isspace() else content  # no copy of a clean body
+    if body[:1] + body[-1:] not in (b"[]", b"{}"):
+        return False
+    if len(body) <= 16:
+        try:
+            json.loads(body)
+        except ValueError:
+            return False
+    return True
+
+
+def _parse_watson(url: str, content: bytes):
     try:
-        s = session or requests.Session()
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/58.0.3029.110 Safari/537.36'
-        }
-        resp = s.get(url=url, headers=headers)
-        return resp.json()
-    except:
-        return []
-def fetch_watson_triplet(season: int, espn_id, session: requests.Session | None = None):
-    proj_url = f"{BASE_WATSON}/projections/projections_{espn_id}_ESPNFantasyFootball_{season}.json"
-    clf_url = f"{BASE_WATSON}/classifiers/classifiers_{espn_id}_ESPNFantasyFootball_{season}.json"
-    meta_url = f"{BASE_WATSON}/players/players_{espn_id}_ESPNFantasyFootball_{season}.json"
-    proj = _get_json(proj_url, session=session) or []
-    clf  = _get_json(clf_url, session=session) or []
-    meta = _get_json(meta_url, session=session) or []
-    return proj, clf, meta
+        return json.loads(content)
+    except ValueError as e:
+        raise TransportError(f"GET {url}: body is not JSON ({e})") from e
+
+
+def _get_watson_content(url: str, session: requests.Session | Transport | None = None, timeout=WATSON_TIMEOUT,
+                        cache: ResponseCache | None = None, ttl=TTL_IMMUTABLE) -> Tuple[Optional[str], bytes]:
+    """
+    Watson file body as (miss status, bytes), unparsed: ("missing", b"") for 403/404,
+    ("empty", body) for a file without rows, else (None, body). Throttling, timeouts, a
+    body that is not JSON and other errors raise ``TransportError`` so they are never
+    mistaken for "no Watson data"; a body that is not JSON is not cached either.
+    """
+    s = session or requests.Session()
+    headers = {
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/58.0.3029.110 Safari/537.36'
+    }
+    resp = cached_get(s, url, headers=headers, timeout=timeout, cache=cache, ttl=ttl, valid=_is_json_body)
+    if resp.status_code in WATSON_MISSING_STATUS:
+        count("watson.files.missing")
+        return "missing", b""
+    if resp.status_code != 200:
+        raise TransportError(f"GET {url}: HTTP {resp.status_code}")
+    if not _is_json_body(resp.content):
+        raise TransportError(f"GET {url}: HTTP 200 with a body that is not JSON ({len(resp.content)} bytes)")
+    # a file with rows is never this short; a short body is parsed to tell "[]" from data
+    if len(resp.content) <= 16 and not json.loads(resp.content):
+        count("watson.files.empty")
+        return "empty", resp.content
+    count("watson.files.ok")
+    return None, resp.content
+
+
+def _get_watson_file(url: str, session: requests.Session | Transport | None = None, timeout=WATSON_TIMEOUT,
+                     cache: ResponseCache | None = None, ttl=TTL_IMMUTABLE) -> Tuple[Optional[str], list]:
+    """
+    Watson file as (miss status, JSON): ("missing", []) for 403/404, ("empty", []) for a
+    file without rows, else (None, rows). See ``_get_watson_content``.
+    """
+    status, content = _get_watson_content(url, session=session, timeout=timeout, cache=cache, ttl=ttl)
+    return (status, []) if status is not None else (None, _parse_watson(url, content))
+
+
+def _get_json(url: str, session: requests.Session | Transport | None = None, timeout=WATSON_TIMEOUT, cache: ResponseCache | None = None, ttl=TTL_IMMUTABLE):
+    """Watson file as JSON; a missing file is an empty list"""
+    return _get_watson_file(url, session=session, timeout=timeout, cache=cache, ttl=ttl)[1]
+
+
+@timed("watson.fetch_triplet", rows=lambda triplet: len(triplet[2]) if triplet is not None else 0)
+def fetch_watson_triplet(season: int, espn_id, session: requests.Session | Transport | None = None, *, base_url: str = BASE_WATSON, timeout=WATSON_TIMEOUT,
+                         cache: ResponseCache | None = None, ttl=TTL_IMMUTABLE, misses: WatsonMissIndex | None = None,
+                         watermarks: WatsonWatermarks | None = None):
+    """
+    (proj, clf, meta) for one player. Files ``misses`` knows to be missing or empty are
+    not requested, and when the player file has nothing the other two are skipped too
+    (there are no meta rows to join them to). Outcomes are recorded in ``misses``.
+    With ``watermarks``, a player whose file bodies are all the ones last flattened is
+    None instead: nothing is parsed.
+    """
+    contents, urls = {}, {}
+    for endpoint in WATSON_ENDPOINTS:
+        url = urls[endpoint] = f"{base_url}/{endpoint}/{endpoint}_{espn_id}_ESPNFantasyFootball_{season}.json"
+        if misses is not None and misses.skip(espn_id, endpoint):
+            count("watson.files.skipped")
+            status, content = "known", b""
+        else:
+            status, content = _get_watson_content(url, session=session, timeout=timeout, cache=cache, ttl=ttl)
+            if misses is not None:
+                misses.record(espn_id, endpoint, status)
+        contents[endpoint] = content if status is None else None
+        if endpoint == "players" and status is not None:
+            return [], [], []
+    if watermarks is not None and watermarks.unchanged(espn_id, contents):
+        count("watson.players.unchanged")
+        return None
+    files = {endpoint: [] if content is None else _parse_watson(urls[endpoint], content) for endpoint, content in contents.items()}
+    return files["projections"], files["classifiers"], files["players"]
+
+
+def build_watson_session(max_workers: int = WATSON_MAX_WORKERS) -> requests.Session:
+    """
+    Build a requests Session whose per-host connection pool is large enough
+    for ``max_workers`` concurrent fetches (the default pool keeps only 10).
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=max_workers)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def build_watson_transport(max_workers: int = WATSON_MAX_WORKERS) -> Transport:
+    """Rate-limited, retrying transport over a ``build_watson_session`` pool"""
+    return Transport(build_watson_session(max_workers), rate=WATSON_RATE, burst=max_workers, timeout=WATSON_TIMEOUT)
+
+
+def fetch_watson_triplets(
+    pairs: Iterable[Tuple[int, int]],
+    session: requests.Session | Transport | None = None,
+    *,
+    max_workers: int = WATSON_MAX_WORKERS,
+    base_url: str = BASE_WATSON,
+    timeout=WATSON_TIMEOUT,
+    cache: ResponseCache | None = None,
+    ttl=TTL_IMMUTABLE,
+    misses: WatsonMissIndex | None = None,
+    watermarks: WatsonWatermarks | None = None,
+) -> Iterator[Tuple[int, int, Optional[tuple]]]:
+    """
+    Fetch Watson triplets for many (season, espn_id) pairs concurrently.
+
+    At most ``max_workers`` players are in flight at once; pairs are consumed
+    lazily so arbitrarily long inputs do not queue up futures up front.
+
+    Yields:
+        (season, espn_id, (proj, clf, meta)) in completion order. The triplet is
+        exactly what ``fetch_watson_triplet`` returns, so it can be fed straight
+        into ``flatten_watson_triplet``. A player whose fetch fails is logged and
+        not yielded, so callers can tell it apart from one without Watson data.
+        ``misses`` (the pairs' season's index) is consulted and updated per file; with
+        ``watermarks`` (the same season's) an unchanged player's triplet is None.
+    """
+    own_session = session is None
+    session = session or build_watson_transport(max_workers)
+    pairs = iter(pairs)
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            in_flight = {}
+
+            def _submit_next() -> bool:
+                try:
+                    season, espn_id = next(pairs)
+                except StopIteration:
+                    return False
+                future = pool.submit(fetch_watson_triplet, season, espn_id, session, base_url=base_url, timeout=timeout, cache=cache, ttl=ttl,
+                                     misses=misses, watermarks=watermarks)
+                in_flight[future] = (season, espn_id)
+                return True
+
+            for _ in range(max_workers):
+                if not _submit_next():
+                    break
+
+            while in_flight:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    season, espn_id = in_flight.pop(future)
+                    _submit_next()
+                    try:
+                        triplet = future.result()
+                    except Exception as e:
+                        count("watson.players.failed")
+                        print(f"[Watson] season={season} player_id={espn_id} fetch error: {e}")
+                        continue
+                    yield season, espn_id, triplet
+    finally:
+        if own_session:
+            session.close()
+
+# Projection columns select_watson_player_ids can use; read only these from the projections dataset
+WATSON_SELECTION_COLUMNS = [
+    "week", "player_id", "position",
+    "ppr_draft_rank", "PPR_draft_rank", "ppr_rank_consensus",
+    "std_draft_rank", "STANDARD_draft_rank", "current_rank", "rank",
+]
+
 
 def _pick_col(df: pd.DataFrame, candidates):
     """Pick the first existing column from candidates."""
@@ -134,17 +646,23 @@ def _norm_pos(p):
         return "DST"
     return p
 
-def select_watson_player_ids(proj_df: pd.DataFrame) -> pd.Index:
+def select_watson_player_ids(proj_df: pd.DataFrame, misses: WatsonMissIndex | None = None) -> pd.Index:
     """
     Build the Watson fetch set:
-      - Top 100 RB, 100 WR, 32 QB, 32 TE, 32 DST, 32 K
-      - Plus top 250 overall draft rank (STANDARD preferred) not already included
+      - Top 128 RB, 128 WR, 48 QB, 48 TE, 32 DST, 32 K
+      - Plus top 400 overall draft rank (STANDARD preferred) not already included
+    With a ``misses`` index the quotas only set the order: the rest of the projections
+    population follows, and players whose Watson file is a confirmed miss are dropped,
+    so everyone is probed once and only players with Watson data are fetched again.
     Returns a pandas Index of unique player_ids (dtype: int64 where possible).
     """
 
     if proj_df is None or proj_df.empty:
         return pd.Index([], dtype="int64")
 
+    if "week" in proj_df.columns:
+        # each player's earliest week supplies the ranks, however the rows were gathered (disk or memory)
+        proj_df = proj_df.sort_values(["week", "player_id"], kind="mergesort")
     df = proj_df.loc[proj_df["player_id"].notnull()].copy().drop_duplicates(['player_id'])
     df["position_norm"] = df["position"].map(_norm_pos)
 
@@ -164,7 +682,8 @@ def select_watson_player_ids(proj_df: pd.DataFrame) -> pd.Index:
 
     if pos_rank_col is None and overall_rank_col is None:
         # No usable ranking columns
-        return pd.Index(df["player_id"].drop_duplicates().astype("int64", errors="ignore"))
+        picked = pd.Index(df["player_id"].drop_duplicates().astype("int64", errors="ignore"))
+        return picked if misses is None else picked[[not misses.is_miss(player_id, "players") for player_id in picked]]
 
     # Coerce to numeric for sorting
     if pos_rank_col is not None:
@@ -204,5 +723,10 @@ def select_watson_player_ids(proj_df: pd.DataFrame) -> pd.Index:
         extras = top350_ids[~top350_ids.isin(picked)]
         picked = pd.Index(pd.concat([pd.Series(picked), extras], ignore_index=True).drop_duplicates())
 
+    if misses is not None:
+        rest = df.sort_values(overall_rank_col, ascending=True, kind="mergesort", na_position="last")["player_id"] if overall_rank_col else df["player_id"]
+        picked = pd.Index(pd.concat([pd.Series(picked), rest[~rest.isin(picked)]], ignore_index=True))
+        picked = picked[[not misses.is_miss(int(player_id), "players") for player_id in picked]]
+
     # Return as int64 where possible (ESPN ids are ints)
     return picked.astype("int64")
\ No newline at end of file
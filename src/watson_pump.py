@@ -0,0 +1,323 @@
+import os
+from typing import List, Optional
+
+import pandas as pd
+from espn_api_orm.consts import ESPNSportLeagueTypes
+from espn_api_orm.league.api import ESPNLeagueAPI
+
+from .changelog import Changelog
+from .checkpoint import CHECKPOINT_DIR, Checkpoint
+from .distributions import DISTRIBUTIONS_DIR, distribution_table, distribution_values, put_week_distributions
+from .http_cache import ResponseCache, cache_ttl
+from .manifest import get_manifest_path, partition_changes, upsert_partition
+from .plan import watson_kept_through_week
+from .schemas import PROJECTIONS_TABLE, WATSON_TABLE, apply_schema
+from .telemetry import count
+from .utils import (
+    drop_dataset_partition,
+    find_year_for_season,
+    get_dataset,
+    get_dataset_partitions,
+    get_seasons_to_update,
+    put_dataset,
+)
+from .watson_fantasy import (
+    BASE_WATSON,
+    DISTRIBUTION_COLUMN,
+    WATSON_MAX_WORKERS,
+    WATSON_SELECTION_COLUMNS,
+    WatsonMissIndex,
+    WatsonWatermarks,
+    build_watson_transport,
+    fetch_watson_triplets,
+    flatten_watson_triplets,
+    select_watson_player_ids,
+)
+
+FLATTEN_BATCH = 64  # triplets flattened per as-of join (and checkpointed); bounds how many raw payloads are held at once
+
+
+def _week_rows(df: pd.DataFrame, week: Optional[int]) -> pd.DataFrame:
+    if df.shape[0] == 0:
+        return df
+    return df[df.week.isna() if week is None else (df.week == week).fillna(False)]
+
+
+class _SeasonRefresh:
+    """
+    One season's refresh in flight: the rows flattened so far by player, triplets waiting to be
+    flattened, and the players whose stored rows stand beyond the kept weeks (unchanged, or
+    flattened from a watermark). Triplets arrive in completion order; rows are put back in
+    selection order when the season is written.
+    """
+
+    def __init__(self, season: int, misses: WatsonMissIndex, watermarks: WatsonWatermarks, checkpoint: Optional[Checkpoint]):
+        self.season = season
+        self.misses = misses
+        self.watermarks = watermarks
+        self.checkpoint = checkpoint
+        self.rows_by_player = {}
+        self.pending = []
+        self.incremental = set()
+
+    def finish(self):
+        """The season is stored: only now do the watermarks stand for stored rows, and a rerun starts from scratch"""
+        self.watermarks.commit()
+        self.watermarks.save()
+        if self.checkpoint is not None:
+            self.checkpoint.clear()
+
+
+class WatsonPump:
+    """
+    Watson projections/classifiers for one sport/league, a season at a time, for the
+    players picked from that season's ESPN projections. With ``keep_distributions`` the
+    projections' score distributions are also kept, in a side store next to the Watson table.
+    Row changes of every partition written are recorded in ``changelog`` when one is given.
+    Every flattened batch of players is checkpointed under ``checkpoint_root`` (None: not at all),
+    so a run that dies mid-season resumes after the last batch. Per-player watermarks (see
+    ``WatsonWatermarks``) keep a refresh to the files and weeks that changed since the last run.
+    ``resume=False`` starts over: no checkpoint, no watermarks.
+    """
+
+    def __init__(self, sport_league: ESPNSportLeagueTypes, processed_root: str = "./processed",
+                 response_cache: ResponseCache = None, keep_distributions: bool = False, changelog: Changelog = None,
+                 checkpoint_root: Optional[str] = CHECKPOINT_DIR, resume: bool = True, base_url: str = BASE_WATSON):
+        self.sport_league = sport_league
+        sport_str, league_str = sport_league.value.split("/")
+        self.processed_root = processed_root
+        self.processed_proj_path = f"{processed_root}/{sport_str}/{league_str}/projections/"
+        self.processed_watson_path = f"{processed_root}/{sport_str}/{league_str}/watson/"
+        self.keep_distributions = keep_distributions
+        self.distributions_path = f"{processed_root}/{sport_str}/{league_str}/{DISTRIBUTIONS_DIR}/"
+        os.makedirs(self.processed_watson_path, exist_ok=True)
+
+        league_api = ESPNLeagueAPI(sport_str, league_str)
+        if not league_api.is_active():
+            print("Running in OffSeason (Watson)")
+
+        self.session = build_watson_transport(WATSON_MAX_WORKERS)
+        self.current_season = find_year_for_season(sport_league)
+        self.response_cache = response_cache or ResponseCache()
+        self.changelog = changelog
+        self.checkpoint_root = checkpoint_root
+        self.resume = resume
+        self.base_url = base_url  # Watson file host
+
+    def seasons(self) -> List[int]:
+        update_seasons = get_seasons_to_update(self.processed_root, self.sport_league, suffix='watson')
+        print(f"Running Watson Pump for: {self.sport_league.value} from {min(update_seasons)}-{max(update_seasons)}")
+        return update_seasons
+
+    def run_season(self, update_season: int, proj_df: pd.DataFrame = None):
+        """
+        Refresh one season's Watson rows.
+
+        Args:
+            update_season (int): Season to refresh.
+            proj_df (pd.DataFrame): The season's projections (at least ``WATSON_SELECTION_COLUMNS``) when the
+                caller already holds them; read from the processed projections otherwise.
+        """
+        sport_league = self.sport_league
+        processed_proj_path = self.processed_proj_path
+        processed_watson_path = self.processed_watson_path
+
+        # load already-processed watson partitions for the season (may be empty)
+        stored_watson_df = get_dataset(processed_watson_path, filters=[("season", "=", update_season)], table=WATSON_TABLE)
+
+        # projections for this season are the source of truth for which players to fetch; only the ranking columns are read
+        if proj_df is None:
+            proj_df = get_dataset(processed_proj_path, columns=WATSON_SELECTION_COLUMNS, filters=[("season", "=", update_season)], table=PROJECTIONS_TABLE)
+
+        if proj_df.shape[0] == 0:
+            print(f"[Watson] {sport_league.value} {update_season}: No projections found at {processed_proj_path}season={update_season}/, skipping.")
+            return
+
+        ##### Watson only covers part of the population; players with known-missing files are skipped instead of re-probed
+        misses = WatsonMissIndex(get_manifest_path(sport_league, f"watson_misses/{update_season}"), update_season, self.current_season)
+        unique_players_for_watson = select_watson_player_ids(proj_df, misses=misses)
+        count("watson.players.selected", len(unique_players_for_watson))
+        print(f"[Watson] {update_season}: {len(unique_players_for_watson)} players selected from projections;  from population {len(proj_df.player_id.unique())}.")
+
+        # only what changed since the watermarks is parsed and flattened; players without stored rows start over
+        watermarks = WatsonWatermarks(get_manifest_path(sport_league, f"watson_watermarks/{update_season}"),
+                                      distributions=self.keep_distributions, reset=not self.resume)
+        watermarks.retain(stored_watson_df.player_id.unique() if stored_watson_df.shape[0] != 0 else [])
+
+        checkpoint = None
+        if self.checkpoint_root is not None:
+            checkpoint = Checkpoint(sport_league, WATSON_TABLE, update_season, self.checkpoint_root,
+                                    fingerprint={"distributions": self.keep_distributions}, resume=self.resume)
+        refresh = _SeasonRefresh(update_season, misses, watermarks, checkpoint)
+        self._restore(refresh)
+
+        fetched = self._fetch(refresh, unique_players_for_watson)
+        misses.save()
+        print(f"[Watson] {update_season}: {misses.skipped} known-missing files skipped; {len(misses)} players in the miss index.")
+        unchanged = len(watermarks.unchanged_ids)
+        count("watson.players.incremental", len(refresh.incremental) - unchanged)
+        print(f"[Watson] {update_season}: {unchanged} players unchanged, {len(refresh.incremental) - unchanged} flattened from their watermark.")
+
+        failed = set(unique_players_for_watson) - fetched
+        if failed:
+            print(f"[Watson] {update_season}: {len(failed)} players failed to fetch; their stored rows are kept.")
+        processed_watson_df = self._trim(stored_watson_df, update_season, refresh.incremental, failed)
+        watson_rows = [row for player_id in unique_players_for_watson for row in refresh.rows_by_player.get(player_id, [])]
+        # distributions never reach the Watson table; the last row of a (week, player) wins, as below
+        distributions = {}
+        for row in watson_rows:
+            values = distribution_values(row.pop(DISTRIBUTION_COLUMN, None))
+            if values is not None:
+                week = None if pd.isna(row["week"]) else int(row["week"])
+                distributions[(week, row["player_id"])] = values
+
+        if len(watson_rows) == 0 and processed_watson_df.shape[0] == 0:
+            print(f"[Watson] {sport_league.value} {update_season}: Nothing new to write.")
+            refresh.finish()
+            return
+
+        season_watson_df = pd.DataFrame(watson_rows)
+        if season_watson_df.shape[0] != 0:
+            season_watson_df["season"] = update_season
+            season_watson_df = apply_schema(season_watson_df, WATSON_TABLE)
+
+        watson_combined = pd.concat([processed_watson_df, season_watson_df], ignore_index=True).drop_duplicates(
+            subset=["season", "week", "player_id"],
+            keep="last",
+        )
+
+        # rewrite only the week partitions whose rows moved; weeks trimmed above and not refetched are dropped
+        written = 0
+        stored_weeks = {p["week"] for p in get_dataset_partitions(processed_watson_path) if p["season"] == update_season}
+        for week, week_df in watson_combined.groupby("week", dropna=False, sort=True):
+            week = None if pd.isna(week) else int(week)
+            stored_weeks.discard(week)
+            written += self._write_week(update_season, week, week_df.reset_index(drop=True), _week_rows(stored_watson_df, week))
+        for week in stored_weeks:
+            drop_dataset_partition(processed_watson_path, {"season": update_season, "week": week})
+            self._record_changes(_week_rows(stored_watson_df, week), stored_watson_df.iloc[0:0])
+            drop_dataset_partition(self.distributions_path, {"season": update_season, "week": week})
+        count("watson.partitions.written", written)
+        print(f"[Watson] Wrote {written} processed week partitions for {update_season} → {processed_watson_path}season={update_season}/")
+
+        if self.keep_distributions:
+            self._put_distributions(update_season, distributions)
+        refresh.finish()
+
+    def _restore(self, refresh: "_SeasonRefresh"):
+        """Take the players a killed run already flattened from its checkpoint, so they are not refetched"""
+        checkpoint = refresh.checkpoint
+        if checkpoint is None:
+            return
+        for row in checkpoint.rows():
+            refresh.rows_by_player.setdefault(row["player_id"], []).append(row)
+        refresh.watermarks.restore(checkpoint.state.get("watermarks", {}))
+        refresh.incremental.update(checkpoint.state.get("incremental", []))
+        if checkpoint.resumed:
+            count("watson.players.resumed", len(checkpoint))
+            print(f"[Watson] {refresh.season}: resuming, {len(checkpoint)} players restored from {checkpoint.path}/")
+
+    def _fetch(self, refresh: "_SeasonRefresh", player_ids) -> set:
+        """
+        Fetch and flatten ``player_ids`` (less those restored), ``FLATTEN_BATCH`` at a time.
+
+        Returns:
+            set: Players fetched (or restored); the rest failed.
+        """
+        done = refresh.checkpoint.done if refresh.checkpoint is not None else set()
+        pairs = [(refresh.season, player_id) for player_id in player_ids if player_id not in done]
+        fetched = set(done)
+        for _, player_id, triplet in fetch_watson_triplets(
+            pairs, self.session, max_workers=WATSON_MAX_WORKERS, base_url=self.base_url, cache=self.response_cache,
+            ttl=cache_ttl(refresh.season, self.current_season), misses=refresh.misses, watermarks=refresh.watermarks,
+        ):
+            fetched.add(player_id)
+            if triplet is None:
+                # same files as last flattened: the stored rows already are what they would give
+                refresh.incremental.add(player_id)
+                continue
+            refresh.pending.append((player_id, *triplet))
+            if len(refresh.pending) >= FLATTEN_BATCH:
+                self._flush(refresh)
+        if refresh.pending:
+            self._flush(refresh)
+        return fetched
+
+    def _flush(self, refresh: "_SeasonRefresh"):
+        """Flatten the pending triplets from their watermarks and checkpoint the batch"""
+        pending, watermarks, checkpoint = refresh.pending, refresh.watermarks, refresh.checkpoint
+        since = watermarks.since(pending)
+        try:
+            rows = flatten_watson_triplets(pending, distributions=self.keep_distributions, since=since)
+            flattened = list(pending)
+        except Exception:
+            # a malformed payload fails the whole batch; redo it per player to isolate the bad one
+            rows, flattened = [], []
+            for triplet, cutoff in zip(pending, since):
+                try:
+                    rows.extend(flatten_watson_triplets([triplet], distributions=self.keep_distributions, since=[cutoff]))
+                    flattened.append(triplet)
+                except Exception as e:
+                    # Keep going; log and continue
+                    print(f"[Watson] season={refresh.season} player_id={triplet[0]} error: {e}")
+        for row in rows:
+            refresh.rows_by_player.setdefault(row["player_id"], []).append(row)
+        watermarks.advance(flattened)
+        batch_incremental = [triplet[0] for triplet, cutoff in zip(pending, since) if cutoff is not None]
+        refresh.incremental.update(batch_incremental)
+        if checkpoint is not None:
+            # misses found so far go with the batch, so a resumed run does not probe them again
+            refresh.misses.save()
+            checkpoint.save([triplet[0] for triplet in pending], rows, state={
+                "watermarks": {**checkpoint.state.get("watermarks", {}), **watermarks.marks(t[0] for t in flattened)},
+                "incremental": sorted(set(checkpoint.state.get("incremental", [])) | set(batch_incremental)),
+            })
+        pending.clear()
+
+    def _trim(self, stored_df: pd.DataFrame, update_season: int, incremental: set, failed: set) -> pd.DataFrame:
+        """
+        Stored rows of the season that stand as they are: in the current season, weeks after the kept ones are
+        rebuilt from the fetched files, except where a watermark vouches for a player's rows; a player that failed
+        to fetch keeps all of theirs.
+        """
+        keep_through_week = watson_kept_through_week(self.sport_league, update_season, self.current_season)
+        if keep_through_week is None or stored_df.shape[0] == 0:
+            return stored_df
+        kept = (stored_df.week <= keep_through_week) | stored_df.player_id.isin(incremental | failed)
+        return stored_df[kept.fillna(False)].copy()
+
+    def _write_week(self, update_season: int, week: Optional[int], week_df: pd.DataFrame, stored_week_df: pd.DataFrame) -> bool:
+        """Upsert one week partition; False when its rows are the stored ones"""
+        upserted = upsert_partition(stored_week_df, week_df, {"season": update_season, "week": week}, keys=["season", "week", "player_id"])
+        if upserted is stored_week_df and not stored_week_df.empty:
+            return False
+        put_dataset(upserted, self.processed_watson_path, table=WATSON_TABLE)
+        self._record_changes(stored_week_df, upserted)
+        return True
+
+    def _record_changes(self, stored_df: pd.DataFrame, written_df: pd.DataFrame):
+        # compared as stored: the written rows are cast to the registry types like the stored ones were
+        if self.changelog is not None:
+            written_df = apply_schema(written_df, WATSON_TABLE)
+            self.changelog.record(WATSON_TABLE, partition_changes(stored_df, written_df, keys=["season", "week", "player_id"]))
+
+    def _put_distributions(self, update_season: int, distributions: dict):
+        """Upsert the season's fetched score distributions, one store file per week"""
+        by_week = {}
+        for (week, player_id), values in distributions.items():
+            by_week.setdefault(week, {})[player_id] = values
+        written = 0
+        for week, players in by_week.items():
+            written += put_week_distributions(
+                self.distributions_path, update_season, week, distribution_table(players.keys(), players.values())
+            )
+        count("watson.distributions.written", written)
+        print(f"[Watson] {update_season}: {len(distributions)} score distributions, {written} weeks written → {self.distributions_path}season={update_season}/")
+
+    def stats(self) -> dict:
+        return {"http_cache": self.response_cache.stats(), "transport": self.session.stats()}
+
+    def close(self):
+        print(f"[Watson] HTTP cache: {self.response_cache.stats()}")
+        print(f"[Watson] Transport: {self.session.stats()}")
+        self.session.close()
@@ -0,0 +1,66 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+
+class ScriptedServer:
+    """
+    Local HTTP server answering each path from a script: a list of (status, headers, body)
+    responses served in turn, the last one repeated; "drop" closes the connection instead.
+    Unscripted paths are 404s. Every request is logged as (monotonic time, path).
+    """
+
+    def __init__(self):
+        self.scripts = {}
+        self.requests = []
+        self._lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                server._serve(self)
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.httpd.daemon_threads = True
+        threading.Thread(target=self.httpd.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True).start()
+        self.base_url = f"http://127.0.0.1:{self.httpd.server_port}"
+
+    def script(self, path: str, *responses):
+        self.scripts[path] = list(responses)
+
+    def hits(self, path: str) -> list:
+        return [t for t, p in self.requests if p == path]
+
+    def _serve(self, handler):
+        path = handler.path.split("?", 1)[0]
+        with self._lock:
+            self.requests.append((time.monotonic(), path))
+            script = self.scripts.get(path)
+            response = (script.pop(0) if len(script) > 1 else script[0]) if script else (404, {}, b"")
+        if response == "drop":
+            handler.close_connection = True
+            handler.connection.close()
+            return
+        status, headers, body = response
+        handler.send_response(status)
+        for key, value in headers.items():
+            handler.send_header(key, value)
+        handler.send_header("Content-Length", str(len(body)))
+        handler.end_headers()
+        handler.wfile.write(body)
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@pytest.fixture
+def server():
+    scripted = ScriptedServer()
+    yield scripted
+    scripted.close()
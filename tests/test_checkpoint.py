@@ -0,0 +1,46 @@
+import time
+
+from espn_api_orm.consts import ESPNSportLeagueTypes
+
+from src import checkpoint as checkpoint_module
+from src.checkpoint import Checkpoint
+
+NFL = ESPNSportLeagueTypes.FOOTBALL_NFL
+DAY_S = 24 * 60 * 60
+
+
+def _saved(root, monkeypatch, at: float) -> Checkpoint:
+    monkeypatch.setattr(checkpoint_module.time, "time", lambda: at)
+    checkpoint = Checkpoint(NFL, "watson", 2024, str(root))
+    checkpoint.save([1, 2], [{"player_id": 1}, {"player_id": 2}])
+    return checkpoint
+
+
+def test_next_daily_run_resumes(tmp_path, monkeypatch):
+    now = time.time()
+    # killed after 5.5h of a job that started a day earlier
+    _saved(tmp_path, monkeypatch, now - DAY_S + 5.5 * 60 * 60)
+    monkeypatch.setattr(checkpoint_module.time, "time", lambda: now)
+    resumed = Checkpoint(NFL, "watson", 2024, str(tmp_path))
+    assert resumed.resumed
+    assert resumed.done == {1, 2}
+    assert [row["player_id"] for row in resumed.rows()] == [1, 2]
+
+
+def test_age_counts_from_last_save(tmp_path, monkeypatch):
+    now = time.time()
+    checkpoint = _saved(tmp_path, monkeypatch, now - 3 * DAY_S)
+    # resumed and killed again by yesterday's run
+    monkeypatch.setattr(checkpoint_module.time, "time", lambda: now - DAY_S)
+    checkpoint.save([3], [{"player_id": 3}])
+    monkeypatch.setattr(checkpoint_module.time, "time", lambda: now)
+    assert Checkpoint(NFL, "watson", 2024, str(tmp_path)).done == {1, 2, 3}
+
+
+def test_abandoned_checkpoint_is_dropped(tmp_path, monkeypatch):
+    now = time.time()
+    _saved(tmp_path, monkeypatch, now - 3 * DAY_S)
+    monkeypatch.setattr(checkpoint_module.time, "time", lambda: now)
+    stale = Checkpoint(NFL, "watson", 2024, str(tmp_path))
+    assert not stale.resumed and not stale.done
+    assert list(stale.rows()) == []
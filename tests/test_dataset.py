@@ -0,0 +1,30 @@
+import pandas as pd
+from espn_api_orm.consts import ESPNSportLeagueTypes
+
+from src.layout import get_legacy_seasons
+from src.schemas import PROJECTIONS_TABLE, WATSON_TABLE
+from src.utils import get_dataset, migrate_processed_tables
+
+NFL = ESPNSportLeagueTypes.FOOTBALL_NFL
+
+
+def _legacy(root, table: str, season: int) -> pd.DataFrame:
+    df = pd.DataFrame({"season": season, "week": [1, 1, 2], "player_id": [3, 1, 2], "projected_points": [1.5, 2.5, 3.5]})
+    path = root / "football" / "nfl" / table
+    path.mkdir(parents=True, exist_ok=True)
+    df.to_parquet(path / f"{season}.parquet")
+    return df
+
+
+def test_migrate_processed_tables_is_idempotent(tmp_path):
+    _legacy(tmp_path, PROJECTIONS_TABLE, 2023)
+    _legacy(tmp_path, PROJECTIONS_TABLE, 2024)
+    _legacy(tmp_path, WATSON_TABLE, 2024)
+    assert migrate_processed_tables(NFL, str(tmp_path)) == 3
+    for table in (PROJECTIONS_TABLE, WATSON_TABLE):
+        assert get_legacy_seasons(str(tmp_path / "football" / "nfl" / table)) == []
+    stored = get_dataset(str(tmp_path / "football" / "nfl" / PROJECTIONS_TABLE), table=PROJECTIONS_TABLE)
+    assert stored.groupby(["season", "week"]).size().to_dict() == {(2023, 1): 2, (2023, 2): 1, (2024, 1): 2, (2024, 2): 1}
+
+    assert migrate_processed_tables(NFL, str(tmp_path)) == 0
+    assert len(get_dataset(str(tmp_path / "football" / "nfl" / PROJECTIONS_TABLE), table=PROJECTIONS_TABLE)) == 6
@@ -0,0 +1,22 @@
+from src.layout import load_manifest
+from src.manifest import advance_input_keys, load_input_keys
+
+
+def test_input_keys_round_trip(tmp_path):
+    path = str(tmp_path / "joined.json")
+    assert load_input_keys(path, 1) == {}
+
+    keys = {"projections": {"season=2024/week=2/part-0.parquet": "b", "season=2024/week=1/part-0.parquet": "a"},
+            "watson": {}}
+    advance_input_keys(path, 1, keys)
+    assert load_manifest(path)["version"] == 1
+    assert load_input_keys(path, 1) == keys
+    assert list(load_input_keys(path, 1)["projections"]) == sorted(keys["projections"])
+
+
+def test_input_keys_reset_on_version_or_full(tmp_path):
+    path = str(tmp_path / "features.json")
+    advance_input_keys(path, 1, {"files": {"season=2024/week=1/part-0.parquet": "a"}})
+
+    assert load_input_keys(path, 2) == {}
+    assert load_input_keys(path, 1, full=True) == {}
@@ -0,0 +1,59 @@
+import datetime
+
+import pytest
+from espn_api_orm.consts import ESPNSportLeagueTypes
+
+from src import season_calendar
+from src.layout import find_year_for_season
+from src.plan import PROJECTIONS_STAGE, WATSON_STAGE, plan_run
+from src.season_calendar import ESPN_DATE_FORMAT, get_regular_season_weeks
+
+NFL = ESPNSportLeagueTypes.FOOTBALL_NFL
+
+
+@pytest.fixture
+def roots(tmp_path, monkeypatch):
+    """A clone with the current season stored and no season calendar cached; any request fails the test"""
+    def fetch(sport_league, season):
+        raise AssertionError(f"requested the {season} calendar")
+    monkeypatch.setattr(season_calendar, "fetch_week_table", fetch)
+    monkeypatch.setattr(season_calendar, "_tables", {})
+    season = find_year_for_season(NFL)
+    for table in ("projections", "watson"):
+        week = tmp_path / "processed" / "football" / "nfl" / table / f"season={season}" / "week=1"
+        week.mkdir(parents=True)
+        (week / "part-0.parquet").touch()  # partitions are listed, never opened
+    (tmp_path / "raw" / "football" / "nfl" / "projections" / str(season)).mkdir(parents=True)
+    return str(tmp_path / "raw"), str(tmp_path / "processed"), season
+
+
+def _cache(season: int, current_week: int):
+    """Current season's calendar in memory, ``current_week`` in progress"""
+    now = datetime.datetime.utcnow()
+    weeks = [{"season_type": 2, "week": w, "start": "",
+              "end": (now + datetime.timedelta(days=7 * (w - current_week) + 1)).strftime(ESPN_DATE_FORMAT)}
+             for w in range(1, 19)]
+    season_calendar._tables[(NFL.value, season)] = {
+        "season": season, "fetched_at": 0, "immutable": False, "weeks": weeks,
+        "end_dates": [datetime.datetime.strptime(w["end"], ESPN_DATE_FORMAT) for w in weeks],
+    }
+
+
+def test_season_length_without_a_calendar(roots):
+    assert get_regular_season_weeks(NFL, 2020, offline=True) == 17
+    assert get_regular_season_weeks(NFL, 2024, offline=True) == 18
+
+
+def test_dry_run_without_a_calendar_makes_no_request(roots):
+    raw_root, processed_root, season = roots
+    plans = plan_run(NFL, raw_root=raw_root, processed_root=processed_root)
+    assert plans[PROJECTIONS_STAGE] == {season: {"weeks": [], "unknown": True}}
+    assert plans[WATSON_STAGE] == {season: {"keep_through_week": None, "unknown": True}}
+
+
+def test_dry_run_with_a_cached_calendar(roots):
+    raw_root, processed_root, season = roots
+    _cache(season, current_week=6)
+    plans = plan_run(NFL, raw_root=raw_root, processed_root=processed_root)
+    assert plans[PROJECTIONS_STAGE] == {season: {"weeks": list(range(5, 19)), "unknown": False}}
+    assert plans[WATSON_STAGE] == {season: {"keep_through_week": 5, "unknown": False}}
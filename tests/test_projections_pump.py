@@ -0,0 +1,127 @@
+import shutil
+
+import pandas as pd
+import pytest
+from espn_api_orm.consts import ESPNSportLeagueTypes
+
+from src import projections_pump
+from src.manifest import upsert_partition
+from src.projections_pump import ProjectionsPump
+from src.query import partition_file_key
+from src.schemas import PROJECTIONS_TABLE
+from src.snapshots import find_snapshot, get_snapshot
+from src.utils import get_dataset
+
+SEASON = 2023
+
+
+def _week(week: int, n: int = 3) -> pd.DataFrame:
+    return pd.DataFrame({
+        "season": SEASON,
+        "week": week,
+        "player_id": list(range(1, n + 1)),
+        "name": [f"Player {i}" for i in range(1, n + 1)],
+        "projected_points": [10.5 + i for i in range(n)],
+    })
+
+
+class _OfflineLeague:
+    def __init__(self, *args):
+        pass
+
+    def is_active(self):
+        return True
+
+
+def _pump(root, monkeypatch, weeks=(1, 2), checkpoint_root=None) -> ProjectionsPump:
+    # manifests and the HTTP cache live under the working directory
+    monkeypatch.chdir(root)
+    monkeypatch.setattr(projections_pump, "ESPNLeagueAPI", _OfflineLeague)
+    monkeypatch.setattr(projections_pump, "find_year_for_season", lambda sport_league: SEASON + 1)
+    monkeypatch.setattr(projections_pump, "projection_update_weeks", lambda *args: list(weeks))
+    return ProjectionsPump(ESPNSportLeagueTypes.FOOTBALL_NFL, raw_root="./raw", processed_root="./processed",
+                           checkpoint_root=checkpoint_root)
+
+
+@pytest.fixture
+def pump(tmp_path, monkeypatch):
+    return _pump(tmp_path, monkeypatch)
+
+
+class _Killed(Exception):
+    pass
+
+
+def _fetch(monkeypatch, weeks: dict, kill_after: int = None) -> list:
+    fetched = []
+
+    def process_season_data(league_id, season, fetch_weeks, **kwargs):
+        for week in fetch_weeks:
+            if kill_after is not None and len(fetched) == kill_after:
+                raise _Killed()
+            fetched.append(week)
+            yield week, weeks[week]
+    monkeypatch.setattr(projections_pump, "process_season_data", process_season_data)
+    return fetched
+
+
+def test_empty_fetch_keeps_stored_week(pump, monkeypatch):
+    _fetch(monkeypatch, {1: _week(1), 2: _week(2)})
+    pump.run_season(SEASON)
+    week_path = f"{pump.raw_proj_path}{SEASON}/1/"
+    snapshot = find_snapshot(week_path)
+    key = partition_file_key(pump.processed_proj_path, {"season": SEASON, "week": 1})
+    digest = pump.week_manifest[str(SEASON)]["1"]
+    assert key is not None and digest is not None
+
+    # week 1 comes back empty (ESPN outage): nothing about it may move
+    _fetch(monkeypatch, {1: _week(1).iloc[0:0], 2: _week(2, n=4)})
+    pump.run_season(SEASON)
+    assert find_snapshot(week_path) == snapshot
+    assert len(get_snapshot(snapshot)) == 3
+    assert partition_file_key(pump.processed_proj_path, {"season": SEASON, "week": 1}) == key
+    assert pump.week_manifest[str(SEASON)]["1"] == digest
+    stored = get_dataset(pump.processed_proj_path, filters=[("season", "=", SEASON)], table=PROJECTIONS_TABLE)
+    assert stored.groupby("week").size().to_dict() == {1: 3, 2: 4}
+
+
+def test_upsert_partition_empty_updates():
+    base = _week(1)
+    partition = {"season": SEASON, "week": 1}
+    keys = ["season", "week", "player_id"]
+    assert upsert_partition(base, base.iloc[0:0], partition, keys) is base
+    assert upsert_partition(base, base.iloc[0:0], partition, keys, drop_empty=True).empty
+    # rows gone upstream from a non-empty fetch are still dropped
+    assert upsert_partition(base, base.iloc[:2], partition, keys)["player_id"].tolist() == [1, 2]
+
+
+def _next_job(job, tmp_path, committed: bool):
+    # a CI job: the repository as last committed plus the restored .cache (HTTP responses, checkpoints)
+    next_job = tmp_path / "next"
+    (next_job / "raw").mkdir(parents=True)
+    if committed:
+        for tracked in ("raw", "processed", "manifests"):
+            shutil.copytree(job / tracked, next_job / tracked, dirs_exist_ok=True)
+    shutil.copytree(job / ".cache", next_job / ".cache")
+    return next_job
+
+
+@pytest.mark.parametrize("committed", [True, False])
+def test_killed_season_resumes(tmp_path, monkeypatch, committed):
+    weeks = {week: _week(week) for week in range(1, 5)}
+    job = tmp_path / "job"
+    job.mkdir()
+    _fetch(monkeypatch, weeks, kill_after=2)
+    with pytest.raises(_Killed):
+        _pump(job, monkeypatch, weeks=weeks, checkpoint_root="./.cache/checkpoints").run_season(SEASON)
+
+    next_job = _next_job(job, tmp_path, committed)
+    fetched = _fetch(monkeypatch, weeks)
+    resumed = _pump(next_job, monkeypatch, weeks=weeks, checkpoint_root="./.cache/checkpoints")
+    resumed.run_season(SEASON)
+    # weeks the killed job wrote are trusted only when its partitions were committed
+    assert fetched == ([3, 4] if committed else [1, 2, 3, 4])
+    stored = get_dataset(resumed.processed_proj_path, filters=[("season", "=", SEASON)], table=PROJECTIONS_TABLE)
+    assert stored.groupby("week").size().to_dict() == {1: 3, 2: 3, 3: 3, 4: 3}
+    assert sorted(resumed.week_manifest[str(SEASON)]) == ["1", "2", "3", "4"]
+    assert not (next_job / ".cache" / "checkpoints" / "football" / "nfl" / PROJECTIONS_TABLE / str(SEASON)).exists()
@@ -0,0 +1,28 @@
+import os
+
+import pandas as pd
+
+from src.query import PlayerIndex, ProcessedQuery
+from src.schemas import PROJECTIONS_TABLE
+from src.utils import put_dataset
+
+
+def _week(season: int, week: int, player_ids) -> pd.DataFrame:
+    return pd.DataFrame({"season": season, "week": week, "player_id": player_ids,
+                         "projected_points": [float(p + week) for p in player_ids]})
+
+
+def test_player_index_lives_outside_the_dataset(tmp_path):
+    root, index_dir = str(tmp_path / "projections"), str(tmp_path / "index")
+    put_dataset(pd.concat([_week(2024, 1, [3, 1, 2]), _week(2024, 2, [2, 4])]), root, table=PROJECTIONS_TABLE)
+
+    query = ProcessedQuery(root, PROJECTIONS_TABLE, index_dir=index_dir)
+    assert os.path.dirname(query.index.path) == index_dir and os.path.exists(query.index.path)
+    assert not [name for _, _, names in os.walk(root) for name in names if not name.startswith("part-")]
+    assert query.player_history(2)[["week", "projected_points"]].values.tolist() == [[1, 3.0], [2, 4.0]]
+
+    put_dataset(_week(2024, 2, [2]), root, table=PROJECTIONS_TABLE)
+    index = PlayerIndex(root, index_dir=index_dir)
+    assert index.refresh()
+    assert index.lookup([4]).empty
+    assert not index.refresh()
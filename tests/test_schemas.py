@@ -0,0 +1,33 @@
+import numpy as np
+import pandas as pd
+
+from src.schemas import PROJECTIONS_TABLE, WATSON_TABLE, apply_schema
+
+
+def test_int32_columns_round_fractional_values():
+    df = pd.DataFrame({
+        "season": [2024, 2024, 2024, 2024],
+        "week": [5.0, "6", None, 7.0],
+        "player_id": [1, 2, 3, 4],
+        "current_rank": [3.4, np.inf, "2.6", None],
+    })
+    out = apply_schema(df, WATSON_TABLE)
+
+    assert all(out[c].dtype == pd.Int32Dtype() for c in ("season", "week", "player_id", "current_rank"))
+    assert out["week"].tolist() == [5, 6, pd.NA, 7]
+    assert out["current_rank"].tolist() == [3, pd.NA, 3, pd.NA]
+
+
+def test_int32_columns_keep_typed_and_integral_values():
+    df = pd.DataFrame({
+        "season": pd.Series([2024, 2024], dtype=pd.Int32Dtype()),
+        "week": pd.Series([1, 2], dtype="int64"),
+        "player_id": [10.0, 11.0],
+        "PPR_draft_rank": pd.Series([1.0, None], dtype=pd.Float32Dtype()),
+    })
+    out = apply_schema(df, PROJECTIONS_TABLE)
+
+    assert out["season"].tolist() == [2024, 2024]
+    assert out["week"].tolist() == [1, 2]
+    assert out["player_id"].tolist() == [10, 11]
+    assert out["PPR_draft_rank"].tolist() == [1, pd.NA]
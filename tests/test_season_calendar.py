@@ -0,0 +1,55 @@
+import json
+import time
+
+import pytest
+from espn_api_orm.consts import ESPNSportLeagueTypes
+
+from src import season_calendar
+from src.layout import find_year_for_season
+
+NFL = ESPNSportLeagueTypes.FOOTBALL_NFL
+WEEKS = [{"season_type": 2, "week": w, "start": f"2026-09-{w:02d}T07:00Z", "end": f"2026-09-{w + 1:02d}T06:59Z"}
+         for w in range(1, 19)]
+
+
+@pytest.fixture
+def calendar(tmp_path, monkeypatch):
+    """Current season's stale table on disk and a counter of ESPN fetches, which fail unless given weeks"""
+    season = find_year_for_season(NFL)
+    monkeypatch.setattr(season_calendar, "_tables", {})
+    path = season_calendar.get_calendar_path(NFL, season, str(tmp_path))
+    fetched_at = time.time() - 2 * season_calendar.CALENDAR_TTL
+    (tmp_path / "football" / "nfl").mkdir(parents=True)
+    with open(path, "w") as file:
+        json.dump({"season": season, "fetched_at": fetched_at, "immutable": False, "weeks": WEEKS[:17]}, file)
+    state = {"calls": 0, "weeks": [], "season": season, "path": path, "fetched_at": fetched_at}
+
+    def fetch(sport_league, season):
+        state["calls"] += 1
+        return state["weeks"]
+    monkeypatch.setattr(season_calendar, "fetch_week_table", fetch)
+    return state
+
+
+def _load(calendar, tmp_path):
+    return season_calendar._load_table(NFL, calendar["season"], str(tmp_path))
+
+
+def test_failed_refetch_keeps_the_table_stale(calendar, tmp_path):
+    assert len(_load(calendar, tmp_path)["weeks"]) == 17
+    with open(calendar["path"]) as file:
+        assert json.load(file)["fetched_at"] == calendar["fetched_at"]
+
+    # backed off in memory: no new request until the retry interval has passed
+    _load(calendar, tmp_path)
+    assert calendar["calls"] == 1
+
+
+def test_failed_refetch_is_retried(calendar, tmp_path, monkeypatch):
+    monkeypatch.setattr(season_calendar, "CALENDAR_RETRY_S", 0)
+    _load(calendar, tmp_path)
+    calendar["weeks"] = WEEKS
+    assert len(_load(calendar, tmp_path)["weeks"]) == 18
+    assert calendar["calls"] == 2
+    with open(calendar["path"]) as file:
+        assert json.load(file)["fetched_at"] > calendar["fetched_at"]
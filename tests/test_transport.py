@@ -0,0 +1,99 @@
+import json
+import time
+
+import pytest
+import requests
+
+from src.transport import Transport, TransportError
+
+OK = (200, {}, b"[]")
+ERROR = (500, {}, b"")
+
+
+def _transport(**options) -> Transport:
+    options = {"rate": 1000.0, "burst": 100, "timeout": (1, 2), "backoff_base": 0.01, **options}
+    return Transport(requests.Session(), **options)
+
+
+def test_retries_errors_then_succeeds(server):
+    server.script("/file", ERROR, "drop", (502, {}, b""), (200, {}, b"[1]"))
+    transport = _transport()
+    resp = transport.get(f"{server.base_url}/file")
+    assert resp.status_code == 200 and resp.json() == [1]
+    assert len(server.hits("/file")) == 4
+    assert transport.stats()["retries"] == 3 and transport.stats()["errors"] == 3
+
+
+def test_not_found_is_returned_without_retry(server):
+    transport = _transport()
+    assert transport.get(f"{server.base_url}/missing").status_code == 404
+    assert len(server.hits("/missing")) == 1 and transport.stats()["retries"] == 0
+
+
+def test_gives_up_after_max_retries(server):
+    server.script("/file", ERROR)
+    transport = _transport(max_retries=2)
+    with pytest.raises(TransportError, match="after 3 attempts: HTTP 500"):
+        transport.get(f"{server.base_url}/file")
+    assert len(server.hits("/file")) == 3 and transport.stats()["failed"] == 1
+
+
+def test_retry_after_is_honored(server):
+    server.script("/file", (429, {"Retry-After": "0.3"}, b""), OK)
+    transport = _transport()
+    resp = transport.get(f"{server.base_url}/file")
+    first, second = server.hits("/file")
+    assert resp.status_code == 200
+    assert second - first >= 0.3
+    stats = transport.stats()
+    assert stats["throttled"] == 1
+    # throttling slows the host down (rate halved, then one success) and never trips its circuit
+    host = stats["hosts"][server.base_url.split("//")[1]]
+    assert host["rate"] == 500.25 and host["circuit_trips"] == 0
+
+
+def test_throttled_request_raises(server):
+    server.script("/file", (429, {"Retry-After": "0"}, b""))
+    transport = _transport(max_retries=1)
+    with pytest.raises(TransportError, match="HTTP 429"):
+        transport.get(f"{server.base_url}/file")
+    assert len(server.hits("/file")) == 2
+
+
+def test_circuit_opens_then_half_opens(server):
+    server.script("/file", ERROR)
+    transport = _transport(max_retries=0, failure_threshold=2, reset_timeout=0.4)
+    url = f"{server.base_url}/file"
+    for _ in range(2):
+        with pytest.raises(TransportError):
+            transport.get(url)
+    host = transport._host(url)
+    assert host.breaker.opened_at is not None and host.breaker.trips == 1
+
+    # open: the next request waits out the reset timeout, then goes through alone as the trial; it fails
+    with pytest.raises(TransportError):
+        transport.get(url)
+    hits = server.hits("/file")
+    assert len(hits) == 3 and hits[2] - hits[1] >= 0.4
+    assert host.breaker.trips == 2
+
+    # the trial after the next wait succeeds and closes the circuit
+    server.script("/file", OK)
+    assert transport.get(url).status_code == 200
+    hits = server.hits("/file")
+    assert len(hits) == 4 and hits[3] - hits[2] >= 0.4
+    assert host.breaker.opened_at is None and host.breaker.failures == 0
+    start = time.monotonic()
+    transport.get(url)
+    assert time.monotonic() - start < 0.4
+
+
+def test_circuit_is_per_host(server):
+    server.script("/file", ERROR)
+    transport = _transport(max_retries=0, failure_threshold=1, reset_timeout=30)
+    with pytest.raises(TransportError):
+        transport.get(f"{server.base_url}/file")
+    server.script("/other", (200, {}, json.dumps([2]).encode()))
+    # same server under another host name: its own circuit, still closed
+    other = server.base_url.replace("127.0.0.1", "localhost")
+    assert transport.get(f"{other}/other").json() == [2]
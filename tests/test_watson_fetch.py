@@ -0,0 +1,103 @@
+import json
+
+import pytest
+import requests
+
+from src.http_cache import ResponseCache
+from src.transport import Transport, TransportError
+from src.watson_fantasy import WATSON_ENDPOINTS, WatsonMissIndex, fetch_watson_triplet, fetch_watson_triplets
+
+SEASON = 2024
+
+
+def _path(endpoint: str, player_id: int) -> str:
+    return f"/{endpoint}/{endpoint}_{player_id}_ESPNFantasyFootball_{SEASON}.json"
+
+
+def _files(server, player_id: int):
+    rows = {
+        "players": [{"SET_END": "2024-09-10T00:00:00Z", "EVENT_WEEK": 1, "PLAYER_ID": player_id}],
+        "projections": [{"DATA_TIMESTAMP": "2024-09-09T00:00:00Z", "SCORE_PROJECTION": 12.5}],
+        "classifiers": [{"DATA_TIMESTAMP": "2024-09-09T00:00:00Z", "MODEL_TYPE": "bust_classifier", "NORMALIZED_RESULT": 0.1}],
+    }
+    for endpoint in WATSON_ENDPOINTS:
+        server.script(_path(endpoint, player_id), (200, {"Content-Type": "application/json"}, json.dumps(rows[endpoint]).encode()))
+    return rows["projections"], rows["classifiers"], rows["players"]
+
+
+def _transport() -> Transport:
+    return Transport(requests.Session(), rate=1000.0, burst=100, timeout=(1, 2), max_retries=2, backoff_base=0.01)
+
+
+@pytest.fixture
+def misses(tmp_path):
+    return WatsonMissIndex(str(tmp_path / "misses.json"), SEASON, SEASON)
+
+
+def test_fetch_retries_to_a_triplet(server, misses):
+    expected = _files(server, 1)
+    server.script(_path("projections", 1), (500, {}, b""), (503, {"Retry-After": "0"}, b""),
+                  (200, {}, json.dumps(expected[0]).encode()))
+    assert fetch_watson_triplet(SEASON, 1, _transport(), base_url=server.base_url, misses=misses) == expected
+    assert len(server.hits(_path("projections", 1))) == 3
+    assert len(misses) == 0
+
+
+def test_missing_player_file_is_no_watson_data(server, misses):
+    assert fetch_watson_triplet(SEASON, 2, _transport(), base_url=server.base_url, misses=misses) == ([], [], [])
+    # without meta rows the other two files are not requested
+    assert [path for _, path in server.requests] == [_path("players", 2)]
+    assert misses.is_miss(2, "players")
+
+
+def test_throttled_player_raises(server, misses):
+    server.script(_path("players", 3), (429, {"Retry-After": "0"}, b""))
+    with pytest.raises(TransportError, match="HTTP 429"):
+        fetch_watson_triplet(SEASON, 3, _transport(), base_url=server.base_url, misses=misses)
+    assert not misses.is_miss(3, "players") and len(misses) == 0
+
+
+def test_pooled_fetch_tells_failures_from_misses(server, misses, tmp_path, capsys):
+    cache = ResponseCache(str(tmp_path / "http"))
+    expected = {player_id: _files(server, player_id) for player_id in (1, 4)}
+    server.script(_path("players", 3), (429, {"Retry-After": "0"}, b""))  # throttled throughout
+    server.script(_path("classifiers", 4), "drop", (200, {}, json.dumps(expected[4][1]).encode()))
+    pairs = [(SEASON, player_id) for player_id in (1, 2, 3, 4)]
+
+    fetched = {player_id: triplet for _, player_id, triplet in fetch_watson_triplets(
+        pairs, _transport(), max_workers=2, base_url=server.base_url, cache=cache, misses=misses)}
+    # player 2 has no Watson data; player 3 failed and is not mistaken for that
+    assert fetched == {1: expected[1], 2: ([], [], []), 4: expected[4]}
+    assert "player_id=3 fetch error" in capsys.readouterr().out
+    assert len(server.hits(_path("players", 3))) == 3
+    assert misses.is_miss(2, "players") and not misses.is_miss(3, "players")
+
+    # the throttled response was never cached: once the host recovers the player comes through
+    expected[3] = _files(server, 3)
+    assert list(fetch_watson_triplets([(SEASON, 3)], _transport(), base_url=server.base_url, cache=cache,
+                                      misses=misses)) == [(SEASON, 3, expected[3])]
+
+
+@pytest.mark.parametrize("body", [b"<html></html>", b"<html><body>Service Unavailable</body></html>", b'[{"SET_END": '])
+def test_body_that_is_not_json_raises_and_is_not_cached(server, misses, tmp_path, body):
+    cache = ResponseCache(str(tmp_path / "http"))
+    expected = _files(server, 5)
+    server.script(_path("players", 5), (200, {"Content-Type": "text/html"}, body),
+                  (200, {}, json.dumps(expected[2]).encode()))
+    with pytest.raises(TransportError, match="not JSON"):
+        fetch_watson_triplet(SEASON, 5, _transport(), base_url=server.base_url, cache=cache, misses=misses)
+    assert len(misses) == 0
+
+    # the next run asks again instead of failing on the cached stub forever
+    assert fetch_watson_triplet(SEASON, 5, _transport(), base_url=server.base_url, cache=cache, misses=misses) == expected
+    assert len(server.hits(_path("players", 5))) == 2
+
+
+def test_cached_body_that_is_not_json_is_refetched(server, misses, tmp_path):
+    cache = ResponseCache(str(tmp_path / "http"))
+    expected = _files(server, 6)
+    url = f"{server.base_url}{_path('players', 6)}"
+    cache.put(cache.request_key(url), url, 200, b"<html/>", {}, None)  # stored before bodies were checked
+
+    assert fetch_watson_triplet(SEASON, 6, _transport(), base_url=server.base_url, cache=cache, misses=misses) == expected
+    assert len(server.hits(_path("players", 6))) == 1
@@ -0,0 +1,170 @@
+import random
+
+import pandas as pd
+import pytest
+
+from src.watson_fantasy import CLASSIFIER_MODEL_TYPES, flatten_watson_triplets
+
+# The per-item reference the batched flatten replaced: a linear scan per meta row and item kind
+
+
+def _parse_ts(x):
+    return pd.to_datetime(x, errors="coerce", utc=True)
+
+
+def _closest_by_ts(items, set_end_ts, *, model_type=None, tolerance=None, prefer_past=True):
+    best = None
+    best_delta = None
+    for it in items or []:
+        if model_type and it.get("MODEL_TYPE") != model_type:
+            continue
+        ts = _parse_ts(it.get("DATA_TIMESTAMP"))
+        if pd.isna(ts):
+            continue
+        delta = abs(ts - set_end_ts)
+        if best is None or delta < best_delta or (prefer_past and delta == best_delta and ts <= set_end_ts):
+            best = it
+            best_delta = delta
+    if best is None:
+        return None
+    if tolerance is not None and best_delta > pd.to_timedelta(tolerance):
+        return None
+    return best
+
+
+def _flatten_per_item(player_id, proj, clf, meta, *, tolerance="7D", prefer_past=True):
+    rows = []
+    for m in meta or []:
+        set_end_ts = _parse_ts(m.get("SET_END") or m.get("DATA_TIMESTAMP"))
+        if pd.isna(set_end_ts):
+            continue
+        closest_proj = _closest_by_ts(proj, set_end_ts, tolerance=tolerance, prefer_past=prefer_past)
+        row = {
+            "actual_points": m.get("ACTUAL"),
+            "set_end": set_end_ts.tz_convert(None).strftime("%Y-%m-%d"),
+            "data_timestamp": m.get("DATA_TIMESTAMP"),
+            "week": m.get("EVENT_WEEK"),
+            "opponent_name": m.get("OPPONENT_NAME"),
+            "opposition_rank": m.get("OPPOSITION_RANK"),
+            "player_id": player_id,
+            "full_name": m.get("FULL_NAME"),
+            "position": m.get("POSITION"),
+            "is_on_injured_reserve": m.get("IS_ON_INJURED_RESERVE"),
+            "is_suspended": m.get("IS_SUSPENDED"),
+            "is_on_bye": m.get("IS_ON_BYE"),
+            "is_free_agent": m.get("IS_FREE_AGENT"),
+            "current_rank": m.get("CURRENT_RANK"),
+            "injury_status_date": pd.to_datetime(m.get("INJURY_STATUS_DATE"), errors="coerce").strftime("%Y-%m-%d")
+            if m.get("INJURY_STATUS_DATE") else None,
+            "projection_model_type": closest_proj.get("MODEL_TYPE") if closest_proj else None,
+            "projection_score": closest_proj.get("SCORE_PROJECTION") if closest_proj else None,
+            "projection_distribution_name": closest_proj.get("DISTRIBUTION_NAME") if closest_proj else None,
+            "projection_low_score": closest_proj.get("LOW_SCORE") if closest_proj else None,
+            "projection_high_score": closest_proj.get("HIGH_SCORE") if closest_proj else None,
+            "projection_simulation_projection": closest_proj.get("SIMULATION_PROJECTION") if closest_proj else None,
+        }
+        for model_type, column in CLASSIFIER_MODEL_TYPES.items():
+            closest = _closest_by_ts(clf, set_end_ts, model_type=model_type, tolerance=tolerance, prefer_past=prefer_past)
+            row[column] = closest.get("NORMALIZED_RESULT") if closest else None
+        rows.append(row)
+    return rows
+
+
+def _reference(triplets, **options):
+    return [row for triplet in triplets for row in _flatten_per_item(*triplet, **options)]
+
+
+def _meta(set_end, week=1, **fields):
+    return {"SET_END": set_end, "DATA_TIMESTAMP": fields.pop("DATA_TIMESTAMP", set_end), "EVENT_WEEK": week,
+            "FULL_NAME": "Player", "POSITION": "RB", "CURRENT_RANK": 7, **fields}
+
+
+def _proj(ts, score):
+    return {"DATA_TIMESTAMP": ts, "MODEL_TYPE": "projection", "SCORE_PROJECTION": score, "LOW_SCORE": score - 5,
+            "HIGH_SCORE": score + 5, "DISTRIBUTION_NAME": "normal", "SIMULATION_PROJECTION": score}
+
+
+def _clf(ts, model_type, result):
+    return {"DATA_TIMESTAMP": ts, "MODEL_TYPE": model_type, "NORMALIZED_RESULT": result}
+
+
+OPTIONS = [{"tolerance": tolerance, "prefer_past": prefer_past}
+           for tolerance in ("7D", "36h", "0s", None) for prefer_past in (True, False)]
+SET_END = "2024-09-10T00:00:00Z"
+
+
+@pytest.mark.parametrize("options", OPTIONS)
+def test_tolerance_edges(options):
+    # one item exactly at each tolerance, one just beyond; on both sides of the meta row
+    triplets = [(1, [_proj("2024-09-03T00:00:00Z", 1.0)], [], [_meta(SET_END)]),
+                (2, [_proj("2024-09-02T23:59:59Z", 2.0)], [], [_meta(SET_END)]),
+                (3, [_proj("2024-09-11T12:00:00Z", 3.0)], [], [_meta(SET_END)]),
+                (4, [_proj("2024-09-11T12:00:01Z", 4.0)], [], [_meta(SET_END)]),
+                (5, [_proj(SET_END, 5.0)], [], [_meta(SET_END)])]
+    rows = flatten_watson_triplets(triplets, **options)
+    assert rows == _reference(triplets, **options)
+    if options["tolerance"] == "7D":
+        assert [row["projection_score"] for row in rows] == [1.0, None, 3.0, 4.0, 5.0]
+
+
+@pytest.mark.parametrize("options", OPTIONS)
+def test_exact_ties(options):
+    past, future = _proj("2024-09-09T00:00:00Z", 1.0), _proj("2024-09-11T00:00:00Z", 2.0)
+    same_past = [_proj("2024-09-09T00:00:00Z", 3.0), _proj("2024-09-09T00:00:00Z", 4.0)]
+    same_future = [_proj("2024-09-11T00:00:00Z", 5.0), _proj("2024-09-11T00:00:00Z", 6.0)]
+    triplets = [(1, [past, future], [], [_meta(SET_END)]),
+                (2, [future, past], [], [_meta(SET_END)]),
+                (3, same_past + same_future, [], [_meta(SET_END)]),
+                (4, same_future + same_past, [], [_meta(SET_END)]),
+                (5, [future, *same_past, past], [], [_meta(SET_END)])]
+    rows = flatten_watson_triplets(triplets, **options)
+    assert rows == _reference(triplets, **options)
+    if options["tolerance"] == "7D":
+        scores = [row["projection_score"] for row in rows]
+        # prefer_past takes the (last) past item; otherwise the first of the tied items in list order
+        assert scores == ([1.0, 1.0, 4.0, 4.0, 1.0] if options["prefer_past"] else [1.0, 2.0, 3.0, 5.0, 2.0])
+
+
+@pytest.mark.parametrize("options", OPTIONS)
+def test_missing_model_types(options):
+    clf = [_clf("2024-09-09T00:00:00Z", "breakout_classifier", 0.4),
+           _clf("2024-09-10T00:00:00Z", None, 0.9),
+           {"DATA_TIMESTAMP": "2024-09-10T00:00:00Z", "NORMALIZED_RESULT": 0.8},
+           _clf("2024-09-10T06:00:00Z", "unknown_classifier", 0.7)]
+    triplets = [(1, [], clf, [_meta(SET_END)]),
+                (2, None, None, [_meta(SET_END)]),
+                (3, [_proj(SET_END, 1.0)], [_clf(SET_END, "bust_classifier", 0.2)], [_meta(SET_END)])]
+    rows = flatten_watson_triplets(triplets, **options)
+    assert rows == _reference(triplets, **options)
+    assert rows[0]["breakout_likelihood"] == (0.4 if options["tolerance"] in ("7D", "36h", None) else None)
+    assert rows[0]["bust_likelihood"] is None and rows[0]["play_with_injury_likelihood"] is None
+    assert rows[2]["bust_likelihood"] == 0.2 and rows[2]["breakout_likelihood"] is None
+
+
+@pytest.mark.parametrize("options", OPTIONS)
+def test_meta_rows_and_timestamps(options):
+    meta = [_meta(None, week=1, DATA_TIMESTAMP="2024-09-10T12:00:00Z"),  # no SET_END: matched at DATA_TIMESTAMP
+            _meta(None, week=2, DATA_TIMESTAMP=None),  # no time at all: no row
+            _meta("not a date", week=3, DATA_TIMESTAMP="2024-09-17"),
+            _meta("2024-09-17T04:00:00-04:00", week=3, INJURY_STATUS_DATE="2024-09-12T15:00:00Z")]
+    proj = [_proj("2024-09-10 08:00:00", 1.0), _proj("garbage", 2.0), _proj(None, 3.0), _proj("2024-09-17T08:00:00+00:00", 4.0)]
+    triplets = [(1, proj, [_clf("2024-09-16", "bust_classifier", 0.5)], meta), (2, proj, [], [])]
+    assert flatten_watson_triplets(triplets, **options) == _reference(triplets, **options)
+
+
+@pytest.mark.parametrize("options", OPTIONS)
+def test_random_triplets(options):
+    rng = random.Random(7)
+    start = pd.Timestamp("2024-09-01", tz="UTC")
+
+    def stamp():
+        # a coarse 6h grid so equal distances and duplicate timestamps are common
+        return (start + pd.Timedelta(hours=6 * rng.randrange(120))).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+    triplets = []
+    for player_id in range(40):
+        proj = [_proj(stamp(), float(i)) for i in range(rng.randrange(0, 12))]
+        clf = [_clf(stamp(), rng.choice([*CLASSIFIER_MODEL_TYPES, None]), i / 10) for i in range(rng.randrange(0, 16))]
+        meta = [_meta(stamp(), week=rng.randrange(1, 18), ACTUAL=i) for i in range(rng.randrange(0, 8))]
+        triplets.append((player_id, proj, clf, meta))
+    assert flatten_watson_triplets(triplets, **options) == _reference(triplets, **options)
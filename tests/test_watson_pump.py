@@ -0,0 +1,140 @@
+import json
+
+import pandas as pd
+import pytest
+from espn_api_orm.consts import ESPNSportLeagueTypes
+
+from src import watson_pump
+from src.http_cache import ResponseCache
+from src.query import partition_file_key
+from src.schemas import WATSON_TABLE
+from src.utils import get_dataset
+from src.watson_fantasy import WatsonWatermarks, fetch_watson_triplet, flatten_watson_triplets
+from src.watson_pump import WatsonPump
+
+SEASON = 2024
+PLAYERS = [101, 102, 103]
+WEEKS = 4
+
+
+def _stamp(week: int, day: int) -> str:
+    return (pd.Timestamp("2024-09-03") + pd.Timedelta(days=7 * (week - 1) + day)).strftime("%Y-%m-%d %H:%M:%S.%f")
+
+
+def _triplet(player_id: int, weeks: int = WEEKS, score: float = 10.0):
+    proj = [{"DATA_TIMESTAMP": _stamp(w, 2), "MODEL_TYPE": "point_projection", "SCORE_PROJECTION": score + w} for w in range(1, weeks + 1)]
+    clf = [{"DATA_TIMESTAMP": _stamp(w, 2), "MODEL_TYPE": "bust_classifier", "NORMALIZED_RESULT": w / 10} for w in range(1, weeks + 1)]
+    meta = [{"SET_END": _stamp(w, 6), "DATA_TIMESTAMP": _stamp(w, 5), "EVENT_WEEK": w, "FULL_NAME": f"Player {player_id}",
+             "POSITION": "RB", "CURRENT_RANK": player_id - 100, "ACTUAL": float(w)} for w in range(1, weeks + 1)]
+    return proj, clf, meta
+
+
+def _serve(server, player_id: int, triplet):
+    for endpoint, rows in zip(("projections", "classifiers", "players"), triplet):
+        server.script(f"/{endpoint}/{endpoint}_{player_id}_ESPNFantasyFootball_{SEASON}.json", (200, {}, json.dumps(rows).encode()))
+
+
+class _OfflineLeague:
+    def __init__(self, *args):
+        pass
+
+    def is_active(self):
+        return True
+
+
+@pytest.fixture
+def flattened(monkeypatch):
+    """Player ids handed to the batched flatten, per call"""
+    calls = []
+
+    def flatten(triplets, **kwargs):
+        calls.append([triplet[0] for triplet in triplets])
+        return flatten_watson_triplets(triplets, **kwargs)
+    monkeypatch.setattr(watson_pump, "flatten_watson_triplets", flatten)
+    return calls
+
+
+@pytest.fixture
+def pump_factory(tmp_path, monkeypatch, server):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(watson_pump, "ESPNLeagueAPI", _OfflineLeague)
+    monkeypatch.setattr(watson_pump, "find_year_for_season", lambda sport_league: SEASON)
+    # current season in week 3: stored weeks after 2 are refreshed
+    monkeypatch.setattr(watson_pump, "watson_kept_through_week", lambda *args: 2)
+    # every run sees the server's current files (the HTTP cache revalidates instead of serving its copy)
+    monkeypatch.setattr(watson_pump, "cache_ttl", lambda *args: 0)
+
+    def factory() -> WatsonPump:
+        return WatsonPump(ESPNSportLeagueTypes.FOOTBALL_NFL, processed_root="./processed",
+                          response_cache=ResponseCache(str(tmp_path / "http")), base_url=server.base_url)
+    return factory
+
+
+PROJ_DF = pd.DataFrame({"player_id": PLAYERS, "position": "RB", "ppr_draft_rank": [1, 2, 3], "week": 1})
+
+
+def _stored(pump) -> pd.DataFrame:
+    df = get_dataset(pump.processed_watson_path, filters=[("season", "=", SEASON)], table=WATSON_TABLE)
+    return df.sort_values(["week", "player_id"]).reset_index(drop=True)
+
+
+def _keys(pump) -> dict:
+    return {week: partition_file_key(pump.processed_watson_path, {"season": SEASON, "week": week}) for week in range(1, WEEKS + 2)}
+
+
+def test_unchanged_players_are_not_flattened_and_keep_their_rows(server, pump_factory, flattened):
+    for player_id in PLAYERS:
+        _serve(server, player_id, _triplet(player_id))
+    pump = pump_factory()
+    pump.run_season(SEASON, PROJ_DF)
+    first, keys = _stored(pump), _keys(pump)
+    assert len(first) == len(PLAYERS) * WEEKS and sorted(sum(flattened, [])) == PLAYERS
+
+    # same files: every triplet comes back None, nothing is flattened and the weeks after 2 are kept, not dropped
+    flattened.clear()
+    pump = pump_factory()
+    pump.run_season(SEASON, PROJ_DF)
+    assert flattened == []
+    assert _keys(pump) == keys
+    pd.testing.assert_frame_equal(_stored(pump), first)
+
+
+def test_changed_player_is_flattened_from_its_watermark(server, pump_factory, flattened, tmp_path):
+    for player_id in PLAYERS:
+        _serve(server, player_id, _triplet(player_id))
+    pump = pump_factory()
+    pump.run_season(SEASON, PROJ_DF)
+    keys = _keys(pump)
+
+    # player 102 gets a fifth week; the others are unchanged
+    _serve(server, 102, _triplet(102, weeks=WEEKS + 1))
+    flattened.clear()
+    pump = pump_factory()
+    pump.run_season(SEASON, PROJ_DF)
+    assert flattened == [[102]]
+    stored = _stored(pump)
+    assert stored.groupby("week").size().to_dict() == {1: 3, 2: 3, 3: 3, 4: 3, 5: 1}
+    # only the partitions that moved are written: week 5, and week 4, whose row now matches the newer projection
+    now = _keys(pump)
+    assert {week for week in now if now[week] != keys[week]} == {4, 5}
+
+    # the same as a first run over the new files
+    fresh = WatsonPump(ESPNSportLeagueTypes.FOOTBALL_NFL, processed_root=str(tmp_path / "fresh"),
+                       response_cache=ResponseCache(str(tmp_path / "http-fresh")), base_url=server.base_url,
+                       checkpoint_root=None, resume=False)
+    fresh.run_season(SEASON, PROJ_DF)
+    pd.testing.assert_frame_equal(_stored(fresh), stored)
+
+
+def test_fetch_returns_none_for_unchanged_files(server, tmp_path):
+    _serve(server, 101, _triplet(101))
+    watermarks = WatsonWatermarks(str(tmp_path / "watermarks.json"))
+    triplet = fetch_watson_triplet(SEASON, 101, base_url=server.base_url, watermarks=watermarks)
+    watermarks.advance([(101, *triplet)])
+    watermarks.commit()
+    assert fetch_watson_triplet(SEASON, 101, base_url=server.base_url, watermarks=watermarks) is None
+    assert "101" in watermarks.unchanged_ids
+
+    _serve(server, 101, _triplet(101, score=20.0))
+    assert fetch_watson_triplet(SEASON, 101, base_url=server.base_url, watermarks=watermarks) == _triplet(101, score=20.0)
+    assert len([path for _, path in server.requests if path.startswith("/players/")]) == 3